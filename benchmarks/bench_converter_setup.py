@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-render converter setup cost.
+
+Compares building a fresh markdown.Markdown instance for every render (the
+old MarkdownRenderer.render() behaviour) against borrowing a pooled
+converter that is reset() between documents.
+
+Usage:
+    python benchmarks/bench_converter_setup.py [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import markdown
+
+from benchmarks.corpus import synthetic_markdown
+from viewer.markdown_renderer import MarkdownRenderer
+
+
+def _time(func, repeat):
+    """Return the best wall-clock time of ``repeat`` calls, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def bench_document(name, text, repeat):
+    renderer = MarkdownRenderer()
+
+    def fresh_setup():
+        markdown.Markdown(
+            extensions=renderer.extensions,
+            extension_configs=renderer.extension_configs,
+        )
+
+    def pooled_setup():
+        with renderer._converters.converter():
+            pass
+
+    def fresh_render():
+        md = markdown.Markdown(
+            extensions=renderer.extensions,
+            extension_configs=renderer.extension_configs,
+        )
+        md.convert(text)
+
+    def pooled_render():
+        with renderer._converters.converter() as md:
+            md.convert(text)
+
+    setup_before = _time(fresh_setup, repeat)
+    setup_after = _time(pooled_setup, repeat)
+    render_before = _time(fresh_render, repeat)
+    render_after = _time(pooled_render, repeat)
+
+    print(f"{name} ({len(text):,} bytes)")
+    print(f"  setup   per render: {setup_before:9.3f} ms -> {setup_after:9.3f} ms")
+    print(f"  convert per render: {render_before:9.3f} ms -> {render_after:9.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement")
+    args = parser.parse_args()
+
+    testfile = os.path.join(os.path.dirname(__file__), "..", "tests", "testfile.md")
+    with open(testfile, "r", encoding="utf-8") as f:
+        small = f.read()
+
+    bench_document("tests/testfile.md", small, max(args.repeat, 50))
+    bench_document("synthetic 5 MB", synthetic_markdown(5 * 1024 * 1024), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Find in Files benchmark: index build, reload and query times on a docs tree.
+
+Generates a tree of small markdown files (20,000 by default, spread over
+nested directories, with headings and paragraphs drawn from a fixed
+vocabulary so that words have realistic frequencies), then times:
+
+- the first full index build and the size of the stored index,
+- loading the stored index as a new session would,
+- a refresh with nothing changed (stat only) and one with 1% of the files
+  edited,
+- queries of each kind: common and rare words, several words, phrases and
+  prefixes, each run several times against the loaded index.
+
+Usage:
+    python benchmarks/bench_file_search.py [--files N] [--runs N]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from viewer.file_index import FileIndex, search_indexes  # noqa: E402
+
+COMMON = ("the of and to in is for that with as on by this be are from it or at an "
+          "which can use when if not all will you your file files document "
+          "render renderer view viewer page theme value settings").split()
+QUERIES = [
+    ("common word", "the"),
+    ("rare word", "zebrafish"),
+    ("two words", "renderer settings"),
+    ("phrase", '"the renderer"'),
+    ("rare phrase", '"zebrafish migration"'),
+    ("prefix", "rend*"),
+    ("phrase + prefix", '"document vie*"'),
+]
+
+
+def _vocabulary(rng, size=6000):
+    syllables = "ka ri to mo la ne su pa vi de go ra ze lu fi an or el".split()
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def generate_tree(root, count, seed=1):
+    """Write count markdown files below root; return their paths."""
+    rng = random.Random(seed)
+    vocabulary = _vocabulary(rng)
+
+    def sentence(n):
+        return " ".join(
+            rng.choice(COMMON) if rng.random() < 0.45 else rng.choice(vocabulary)
+            for _ in range(n)
+        ).capitalize() + "."
+
+    paths = []
+    for i in range(count):
+        directory = os.path.join(root, f"area{i % 20:02d}", f"topic{i % 200:03d}")
+        os.makedirs(directory, exist_ok=True)
+        parts = [f"# {sentence(4)[:-1]}\n\n{sentence(20)}\n\n"]
+        for _ in range(rng.randint(2, 5)):
+            parts.append(f"## {sentence(3)[:-1]}\n\n")
+            parts.append(" ".join(sentence(rng.randint(8, 20)) for _ in range(4)) + "\n\n")
+            parts.append(f"- {sentence(6)}\n- {sentence(6)}\n\n")
+        if i % 500 == 0:
+            parts.append("## Zebrafish notes\n\nZebrafish migration is documented here.\n")
+        path = os.path.join(directory, f"page{i:05d}.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("".join(parts))
+        paths.append(path)
+    return paths
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=20000, help="number of markdown files")
+    parser.add_argument("--runs", type=int, default=5, help="runs per query")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        docs = os.path.join(tmp, "docs")
+        cache = os.path.join(tmp, "index")
+        paths, ms = timed(generate_tree, docs, args.files)
+        size = sum(os.path.getsize(path) for path in paths)
+        print(f"{args.files} files, {size / 1024 / 1024:.1f} MB of markdown "
+              f"(generated in {ms / 1000:.1f} s)")
+
+        index = FileIndex(docs, directory=cache)
+        _, ms = timed(index.refresh)
+        print(f"  first build        {ms:9.1f} ms")
+        _, ms = timed(index.save)
+        print(f"  save               {ms:9.1f} ms  ({os.path.getsize(index.path) / 1024 / 1024:.1f} MB on disk)")
+
+        index = FileIndex(docs, directory=cache)
+        _, ms = timed(index.load)
+        print(f"  load               {ms:9.1f} ms")
+        _, ms = timed(index.refresh)
+        print(f"  refresh, no change {ms:9.1f} ms")
+        for path in paths[::100]:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write("\nAppended line about the renderer.\n")
+        changed, ms = timed(index.refresh)
+        print(f"  refresh, 1% edited {ms:9.1f} ms")
+
+        print("queries (median of %d runs):" % args.runs)
+        for label, query in QUERIES:
+            times = []
+            for _ in range(args.runs):
+                (hits, matched), ms = timed(search_indexes, [index], query)
+                times.append(ms)
+            top = f"{os.path.basename(hits[0].path)}#{hits[0].anchor}" if hits else "-"
+            print(f"  {label:16} {query!r:24} {statistics.median(times):7.1f} ms  "
+                  f"{matched:6d} files  top {top}")
+
+
+if __name__ == "__main__":
+    main()
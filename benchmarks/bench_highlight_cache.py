@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: re-rendering a code-heavy document with the highlight cache.
+
+Renders a runbook-style document made mostly of fenced code blocks three
+ways: with an empty highlight cache (first open), with a warm cache (theme
+switch or reload of an unchanged file), and the same document with the code
+fences removed, as the plain-text baseline.
+
+Usage:
+    python benchmarks/bench_highlight_cache.py [--blocks N] [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from viewer.markdown_renderer import MarkdownRenderer
+
+_LANGS = ["python", "bash", "yaml", "json", "sql", ""]
+
+
+def runbook_markdown(blocks, fenced=True):
+    """Return a document of ``blocks`` short steps, each with a code sample."""
+    parts = ["# Runbook\n\n"]
+    for n in range(blocks):
+        lang = _LANGS[n % len(_LANGS)]
+        code = f"step_{n} = run('service-{n}', retries={n % 5})\nprint(step_{n})"
+        parts.append(f"Step {n}: run the command below.\n\n")
+        if fenced:
+            parts.append(f"```{lang}\n{code}\n```\n\n")
+        else:
+            parts.append(code.replace("\n", "\n\n") + "\n\n")
+    return "".join(parts)
+
+
+def _time(func, repeat):
+    """Return the best wall-clock time of ``repeat`` calls, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--blocks", type=int, default=2000, help="code blocks in the document")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement")
+    args = parser.parse_args()
+
+    code_doc = runbook_markdown(args.blocks)
+    plain_doc = runbook_markdown(args.blocks, fenced=False)
+    renderer = MarkdownRenderer()
+
+    def cold():
+        renderer.highlight_cache.clear()
+        renderer.render_document(code_doc)
+
+    cold_ms = _time(cold, args.repeat)
+    renderer.render_document(code_doc)
+    warm_ms = _time(lambda: renderer.render_document(code_doc), args.repeat)
+    plain_ms = _time(lambda: renderer.render_document(plain_doc), args.repeat)
+
+    print(f"{args.blocks:,} code blocks ({len(code_doc):,} bytes)")
+    print(f"  cold highlight cache: {cold_ms:9.1f} ms")
+    print(f"  warm highlight cache: {warm_ms:9.1f} ms"
+          f"  ({renderer.highlight_cache.total_bytes / 1024:.0f} KiB cached)")
+    print(f"  plain-text baseline:  {plain_ms:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Image loading benchmark: time until a page full of screenshots is shown.
+
+Writes a document with N large PNG screenshots (noisy, so decoding is real
+work) and, in an offscreen QTextBrowser, times setHtml() plus layout -- the
+time the GUI thread is blocked before the page can be painted:
+
+- plain QTextBrowser, which reads and decodes every image synchronously,
+- ImageTextBrowser with an empty image cache, which lays out placeholders
+  and decodes on a thread pool (the time until every image has been swapped
+  in is reported too),
+- ImageTextBrowser again on a fresh document, as when reopening the file or
+  switching theme, with every image in the decoded-image cache.
+
+Usage:
+    python benchmarks/bench_image_loading.py [--images N] [--size WxH]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QUrl  # noqa: E402
+from PyQt6.QtGui import QImage, QTextDocument  # noqa: E402
+from PyQt6.QtWidgets import QApplication, QTextBrowser  # noqa: E402
+
+from viewer.image_loader import ImageLoader, ImageTextBrowser  # noqa: E402
+
+
+def write_images(directory, count, width, height):
+    """Write count noisy PNG screenshots; return their paths."""
+    noise = os.urandom(width * height * 4)
+    paths = []
+    for i in range(count):
+        image = QImage(noise, width, height, QImage.Format.Format_RGB32).copy()
+        path = os.path.join(directory, f"screenshot-{i:03d}.png")
+        image.save(path)
+        paths.append(path)
+    return paths
+
+
+def page_html(paths):
+    parts = ["<h1>Screenshots</h1>"]
+    for i, path in enumerate(paths):
+        parts.append(f"<h2>Step {i}</h2><p>Some text about step {i}.</p>"
+                     f'<p><img src="{QUrl.fromLocalFile(path).toString()}"></p>')
+    return "\n".join(parts)
+
+
+def show(app, browser, html):
+    """Return ms spent in setHtml plus layout on a fresh document."""
+    browser.setDocument(QTextDocument(browser))
+    start = time.perf_counter()
+    browser.setHtml(html)
+    browser.document().documentLayout().documentSize()
+    browser.viewport().repaint()
+    elapsed = (time.perf_counter() - start) * 1000
+    app.processEvents()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--images", type=int, default=40, help="number of screenshots")
+    parser.add_argument("--size", default="1600x1000", help="screenshot size, WxH")
+    args = parser.parse_args()
+    width, height = (int(n) for n in args.size.split("x"))
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_images(directory, args.images, width, height)
+        html = page_html(paths)
+        total_mb = sum(os.path.getsize(p) for p in paths) / 1024 / 1024
+        print(f"{args.images} screenshots of {width}x{height} ({total_mb:.0f} MB of PNG)")
+
+        plain = QTextBrowser()
+        plain.resize(1000, 800)
+        plain.show()
+        print(f"  QTextBrowser (sync decode)      {show(app, plain, html):8.1f} ms blocked")
+
+        browser = ImageTextBrowser(ImageLoader())
+        browser.resize(1000, 800)
+        browser.show()
+        decoded = []
+        browser.image_loader.image_decoded.connect(lambda key, image: decoded.append(key))
+        start = time.perf_counter()
+        blocked = show(app, browser, html)
+        while len(decoded) < args.images:
+            app.processEvents()
+            time.sleep(0.001)
+        all_in = (time.perf_counter() - start) * 1000
+        print(f"  ImageTextBrowser, cold cache    {blocked:8.1f} ms blocked, "
+              f"all images in after {all_in:.0f} ms")
+        print(f"  ImageTextBrowser, warm cache    {show(app, browser, html):8.1f} ms blocked")
+        browser.image_loader.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Image fitting benchmark: memory and time for a page of large photos.
+
+Writes a document with N large PNG photos and shows it in an offscreen
+ImageTextBrowser of a typical window width, reporting the time until every
+image has been swapped in and the memory the decoded images take:
+
+- at full size (View > Full-Size Images), the original pixels,
+- fitted to the page: decoded with QImageReader.setScaledSize() at the
+  width the page needs, and written to the on-disk image cache,
+- fitted again in a new session (empty memory cache), where the downscaled
+  images are read back from the disk cache.
+
+Usage:
+    python benchmarks/bench_image_thumbnails.py [--images N] [--size WxH] [--width PX]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QUrl, Qt  # noqa: E402
+from PyQt6.QtGui import QImage, QTextDocument  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from viewer.image_loader import DiskImageCache, ImageLoader, ImageTextBrowser  # noqa: E402
+
+
+def write_photos(directory, count, width, height):
+    """Write count smooth, photo-like PNGs; return their paths."""
+    paths = []
+    for i in range(count):
+        # Upscaled noise: smooth like a photo, but every pixel is different
+        tile = QImage(os.urandom(64 * 48 * 4), 64, 48, QImage.Format.Format_RGB32).copy()
+        image = tile.scaled(width, height, transformMode=Qt.TransformationMode.SmoothTransformation)
+        path = os.path.join(directory, f"photo-{i:03d}.png")
+        image.save(path)
+        paths.append(path)
+    return paths
+
+
+def page_html(paths):
+    parts = ["<h1>Photos</h1>"]
+    for i, path in enumerate(paths):
+        parts.append(f"<h2>Photo {i}</h2>"
+                     f'<p><img src="{QUrl.fromLocalFile(path).toString()}"></p>')
+    return "\n".join(parts)
+
+
+def show_all(app, browser, html, count):
+    """Show html on a fresh document; return (ms until all images are in, MB decoded)."""
+    decoded = []
+    browser.image_loader.image_decoded.connect(lambda key, image: decoded.append(image))
+    browser.setDocument(QTextDocument(browser))
+    start = time.perf_counter()
+    browser.setHtml(html)
+    browser.document().documentLayout().documentSize()
+    while len(decoded) < count:
+        app.processEvents()
+        time.sleep(0.001)
+    elapsed = (time.perf_counter() - start) * 1000
+    browser.image_loader.shutdown()
+    return elapsed, sum(image.sizeInBytes() for image in decoded) / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--images", type=int, default=4, help="number of photos")
+    parser.add_argument("--size", default="6000x4000", help="photo size, WxH")
+    parser.add_argument("--width", type=int, default=1000, help="window width")
+    args = parser.parse_args()
+    width, height = (int(n) for n in args.size.split("x"))
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_photos(directory, args.images, width, height)
+        html = page_html(paths)
+        total_mb = sum(os.path.getsize(p) for p in paths) / 1024 / 1024
+        print(f"{args.images} photos of {width}x{height} ({total_mb:.0f} MB of PNG), "
+              f"{args.width} px wide window")
+        disk_cache = DiskImageCache(os.path.join(directory, "images"))
+
+        def browser(full_size):
+            view = ImageTextBrowser(ImageLoader(disk_cache=disk_cache))
+            view.full_size_images = full_size
+            view.resize(args.width, 800)
+            view.show()
+            return view
+
+        for label, full_size in (("full size", True), ("fitted, cold", False),
+                                 ("fitted, disk cache", False)):
+            elapsed, megabytes = show_all(app, browser(full_size), html, args.images)
+            print(f"  {label:20} all images in after {elapsed:7.0f} ms, "
+                  f"{megabytes:7.1f} MB decoded")
+        print(f"  disk cache           {disk_cache.total_bytes / 1024 / 1024:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: paragraph-mark insertion on a 100k-paragraph document.
+
+Compares the old post-processing pass (split the HTML into lines and run
+several regexes per line) against the ParagraphMarkProcessor treeprocessor,
+which marks elements while the document is still a tree. The old pass is
+reproduced here so the numbers stay comparable.
+
+Usage:
+    python benchmarks/bench_paragraph_marks.py [--paragraphs N] [--repeat N]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmarks.corpus import paragraph_markdown
+from viewer.markdown_renderer import MarkdownRenderer
+
+_MARK = "<span class='paragraph-mark'>.</span>"
+
+
+def _legacy_should_mark(line):
+    stripped = line.strip()
+    if not stripped:
+        return False
+    if (
+        stripped.startswith("<")
+        and stripped.endswith(">")
+        and not any(tag in stripped for tag in ["<h", "<p>", "<div", "<ul", "<ol", "<li"])
+    ):
+        return False
+    return any(
+        re.search(pattern, line)
+        for pattern in (r"<h[1-6][^>]*>", r"<p[^>]*>", r"<li[^>]*>", r"<blockquote[^>]*>")
+    )
+
+
+def _legacy_add_period(line):
+    for pattern in (
+        r"(<h[1-6][^>]*>)(.*?)(</h[1-6]>)",
+        r"(<p[^>]*>)(.*?)(</p>)",
+        r"(<li[^>]*>)(.*?)(</li>)",
+        r"(<blockquote[^>]*>)(.*?)(</blockquote>)",
+    ):
+        match = re.search(pattern, line)
+        if match:
+            return f"{match.group(1)}{match.group(2)}{_MARK}{match.group(3)}"
+    return line
+
+
+def legacy_add_paragraph_marks(html):
+    """The line-by-line regex pass MarkdownRenderer used before the treeprocessor."""
+    out = []
+    in_code_block = False
+    for line in html.split("\n"):
+        if "<pre" in line:
+            in_code_block = True
+        elif "</pre>" in line:
+            in_code_block = False
+        if not in_code_block and _legacy_should_mark(line):
+            line = _legacy_add_period(line)
+        out.append(line)
+    return "\n".join(out)
+
+
+def _time(func, repeat):
+    """Return the best wall-clock time of ``repeat`` calls, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--paragraphs", type=int, default=100_000, help="paragraph count")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement")
+    args = parser.parse_args()
+
+    text = paragraph_markdown(args.paragraphs)
+    renderer = MarkdownRenderer()
+
+    def convert(hidden):
+        with renderer._converters.converter() as md:
+            md.treeprocessors["paragraph_marks"].hidden = hidden
+            return md.convert(text)
+
+    unmarked_html = convert(True)
+
+    plain = _time(lambda: convert(True), args.repeat)
+    legacy_pass = _time(lambda: legacy_add_paragraph_marks(unmarked_html), args.repeat)
+    tree_marked = _time(lambda: convert(False), args.repeat)
+
+    print(f"{args.paragraphs:,} paragraphs ({len(text):,} bytes)")
+    print(f"  convert without marks:        {plain:10.1f} ms")
+    print(f"  + legacy regex pass (before): {plain + legacy_pass:10.1f} ms"
+          f"  (pass alone {legacy_pass:.1f} ms)")
+    print(f"  convert with treeprocessor:   {tree_marked:10.1f} ms"
+          f"  (marks add {tree_marked - plain:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: the render pipeline, stage by stage, with regression checks.
+
+Times each stage of showing a document on synthetic corpora of 10 KB, 1 MB
+and 50 MB:
+
+    convert              markdown parsing and serialisation, excluding the
+                         stages below that run inside it
+    highlight            Pygments highlighting of code blocks (cold cache)
+    paragraph_marks      the ParagraphMarkProcessor treeprocessor
+    copy_buttons         recording copy text and wrapping blocks with Copy links
+    resolve_image_paths  the ImagePathProcessor rewriting relative <img> paths
+                         to file:// URLs
+    theme_css            building the theme stylesheet
+    layout               QTextBrowser.setHtml plus layout, offscreen
+
+Paragraph marks, copy buttons and image paths are handled while the document
+is converted, so their methods are wrapped with timers and their time is
+subtracted from ``convert``. Documents the viewer shows in chunks (see chunked_document.py)
+are never laid out whole; for those ``layout`` times the window of sections
+the viewer actually lays out.
+
+Results can be written as JSON and compared against an earlier run; the run
+fails (exit status 1) when a stage is slower than the baseline by more than
+the threshold configured for it in thresholds.json.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--sizes 10KB,1MB,50MB] [--repeat N]
+        [--output results.json] [--baseline baseline.json] [--thresholds FILE]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication, QTextBrowser
+
+from benchmarks.corpus import synthetic_markdown
+from version import get_semver
+from viewer.block_renderer import BlockRenderer
+from viewer.chunked_document import MAX_LOADED_SECTIONS, ChunkedDocument, should_chunk
+from viewer.markdown_renderer import (
+    CachedCodeHilite,
+    CodeBlockExtension,
+    ImagePathProcessor,
+    MarkdownRenderer,
+    ParagraphMarkProcessor,
+)
+
+STAGES = (
+    "convert",
+    "highlight",
+    "paragraph_marks",
+    "copy_buttons",
+    "resolve_image_paths",
+    "theme_css",
+    "layout",
+)
+
+SIZES = {
+    "10KB": 10 * 1024,
+    "1MB": 1024 * 1024,
+    "50MB": 50 * 1024 * 1024,
+}
+
+# Corpora at least this large are measured once rather than best-of-repeat
+SINGLE_RUN_BYTES = 10 * 1024 * 1024
+
+DEFAULT_THRESHOLDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thresholds.json")
+
+# Image paths are resolved against this (never opened) file
+_CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus.md")
+
+
+@contextmanager
+def _timed_methods(totals):
+    """Wrap the methods of stages that run inside md.convert() with timers.
+
+    Seconds spent in each are added to ``totals`` under the given key.
+    """
+    targets = [
+        (CachedCodeHilite, "hilite", "highlight"),
+        (CodeBlockExtension, "stash_code", "_code_blocks"),
+        (ParagraphMarkProcessor, "run", "paragraph_marks"),
+        (ImagePathProcessor, "run", "resolve_image_paths"),
+    ]
+    originals = []
+    for cls, name, key in targets:
+        original = getattr(cls, name)
+        originals.append((cls, name, original))
+
+        def timed(*args, _original=original, _key=key, **kwargs):
+            start = time.perf_counter()
+            try:
+                return _original(*args, **kwargs)
+            finally:
+                totals[_key] = totals.get(_key, 0.0) + time.perf_counter() - start
+
+        setattr(cls, name, wraps(original)(timed))
+    try:
+        yield
+    finally:
+        for cls, name, original in originals:
+            setattr(cls, name, original)
+
+
+def _layout(browser, css, body_html):
+    """Lay out body_html the way MainWindow._display_body() does."""
+    browser.clear()
+    start = time.perf_counter()
+    browser.document().setDefaultStyleSheet(css)
+    browser.setHtml(body_html)
+    browser.document().documentLayout().documentSize()
+    return time.perf_counter() - start
+
+
+def _displayed_body(renderer, text):
+    """Return the body HTML the viewer lays out for text, and whether it is a window."""
+    if not should_chunk(text):
+        return None, False
+    chunked = ChunkedDocument(text, BlockRenderer(renderer), False, _CORPUS_PATH)
+    last = min(chunked.section_count, MAX_LOADED_SECTIONS)
+    sections = [chunked.render_section(index)[0] for index in range(last)]
+    return renderer.wrap_body("\n".join(sections), False), True
+
+
+def measure_once(renderer, browser, text):
+    """Time every stage once; returns {stage: seconds}."""
+    renderer.highlight_cache.clear()
+    inner = {}
+    with _timed_methods(inner):
+        start = time.perf_counter()
+        html, _ = renderer.convert_body(text, False, _CORPUS_PATH)
+        total = time.perf_counter() - start
+
+    highlight = inner.get("highlight", 0.0)
+    copy_buttons = inner.get("_code_blocks", 0.0) - highlight
+    paragraph_marks = inner.get("paragraph_marks", 0.0)
+    image_paths = inner.get("resolve_image_paths", 0.0)
+    times = {
+        "convert": total - highlight - copy_buttons - paragraph_marks - image_paths,
+        "highlight": highlight,
+        "paragraph_marks": paragraph_marks,
+        "copy_buttons": copy_buttons,
+        "resolve_image_paths": image_paths,
+    }
+
+    body = renderer.wrap_body(html, False)
+
+    start = time.perf_counter()
+    css = renderer.get_theme_css(renderer.current_theme, False)
+    times["theme_css"] = time.perf_counter() - start
+
+    window, _ = _displayed_body(renderer, text)
+    times["layout"] = _layout(browser, css, window if window is not None else body)
+    return times
+
+
+def measure_corpus(renderer, browser, text, repeat):
+    """Return the best time of each stage over ``repeat`` runs, in milliseconds."""
+    best = {stage: float("inf") for stage in STAGES}
+    for _ in range(repeat):
+        for stage, seconds in measure_once(renderer, browser, text).items():
+            best[stage] = min(best[stage], seconds)
+    return {stage: round(best[stage] * 1000, 3) for stage in STAGES}
+
+
+def load_thresholds(path):
+    """Return {"default": fraction, "min_ms": float, "stages": {stage: fraction}}."""
+    thresholds = {"default": 0.25, "min_ms": 1.0, "stages": {}}
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            thresholds.update(json.load(f))
+    return thresholds
+
+
+def find_regressions(results, baseline, thresholds):
+    """Return a message for every stage slower than baseline beyond its threshold.
+
+    A stage regresses when it is slower by more than its fractional threshold
+    and by more than ``min_ms``, so sub-millisecond stages do not fail on noise.
+    """
+    regressions = []
+    for corpus, current in results["corpora"].items():
+        previous = baseline.get("corpora", {}).get(corpus)
+        if not previous:
+            continue
+        for stage, ms in current["stages"].items():
+            before = previous["stages"].get(stage)
+            if before is None:
+                continue
+            allowed = thresholds["stages"].get(stage, thresholds["default"])
+            if ms > before * (1 + allowed) and ms - before > thresholds["min_ms"]:
+                regressions.append(
+                    f"{corpus} {stage}: {before:.3f} ms -> {ms:.3f} ms "
+                    f"(+{(ms / before - 1) * 100 if before else float('inf'):.0f}%, "
+                    f"allowed +{allowed * 100:.0f}%)"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default=",".join(SIZES),
+                        help=f"comma-separated corpora to run, from {', '.join(SIZES)}")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs per measurement (corpora of 10 MB and more run once)")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results from an earlier run")
+    parser.add_argument("--thresholds", default=DEFAULT_THRESHOLDS,
+                        help="JSON file of allowed slowdowns per stage")
+    args = parser.parse_args()
+
+    sizes = [name.strip() for name in args.sizes.split(",") if name.strip()]
+    unknown = [name for name in sizes if name not in SIZES]
+    if unknown:
+        parser.error(f"unknown size(s): {', '.join(unknown)}")
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    browser = QTextBrowser()
+    browser.resize(1000, 800)
+    renderer = MarkdownRenderer()
+
+    results = {
+        "meta": {
+            "version": get_semver(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "qpa": app.platformName(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "corpora": {},
+    }
+
+    for name in sizes:
+        text = synthetic_markdown(SIZES[name], images=True)
+        repeat = 1 if len(text) >= SINGLE_RUN_BYTES else args.repeat
+        stages = measure_corpus(renderer, browser, text, repeat)
+        results["corpora"][name] = {
+            "bytes": len(text),
+            "runs": repeat,
+            "layout_window": should_chunk(text),
+            "stages": stages,
+        }
+        print(f"{name} ({len(text):,} bytes, {repeat} run(s))")
+        for stage in STAGES:
+            print(f"  {stage:20s} {stages[stage]:12.3f} ms")
+        if should_chunk(text):
+            print(f"  (layout is the first {MAX_LOADED_SECTIONS} sections, as the viewer shows them)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, load_thresholds(args.thresholds))
+        if regressions:
+            print("Regressions against", args.baseline)
+            for message in regressions:
+                print("  " + message)
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: time to first rendered document for ``main.py FILE``.
+
+Each run starts a fresh interpreter that runs main.py's main() on the file
+and exits as soon as the main window has displayed the rendered document,
+so the measurement covers interpreter start-up, imports, window
+construction and the first render. Runs use a throwaway settings directory
+so they neither read nor change the user's MDviewer settings, and the
+offscreen Qt platform unless QT_QPA_PLATFORM is already set. Every run
+starts with an empty render cache; with --warm-cache the on-disk render
+cache is shared between runs, as it is between sessions of the viewer, so
+all but the first run reuse the stored render.
+
+The child also reports which optional subsystems were imported before the
+first document appeared; with deferred imports none of them should be.
+
+Usage:
+    python benchmarks/bench_startup.py [FILE] [--runs N] [--warm-cache]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Modules that are not needed to show a markdown document
+DEFERRED_MODULES = [
+    "PyQt6.QtPdf",
+    "PyQt6.QtPdfWidgets",
+    "github_version_checker",
+    "git_updater",
+    "release_downloader",
+    "viewer.update_dialogs",
+    "viewer.external_editor",
+    "viewer.color_settings_dialog",
+    "viewer.file_info_dialog",
+    "viewer.find_in_files_dialog",
+    "viewer.file_index",
+    "urllib.request",
+]
+
+# Runs inside the child: start the app normally, report and exit once the
+# first document has been displayed
+_CHILD = """
+import json, os, sys, time
+sys.path.insert(0, {root!r})
+sys.argv = ["main.py", "--new-instance", {file_path!r}]
+import main
+from viewer import main_window
+
+_display = main_window.MainWindow._on_render_finished
+
+def _on_render_finished(self, request_id, document):
+    _display(self, request_id, document)
+    if self.current_file:
+        loaded = [name for name in {deferred!r} if name in sys.modules]
+        print(json.dumps({{"ready": time.time(), "loaded": loaded}}), flush=True)
+        os._exit(0)
+
+main_window.MainWindow._on_render_finished = _on_render_finished
+main.main()
+"""
+
+
+def measure(file_path, env):
+    """Return (seconds to first document, optional modules loaded) for one run."""
+    code = _CHILD.format(root=os.path.abspath(ROOT), file_path=file_path, deferred=DEFERRED_MODULES)
+    start = time.time()
+    result = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, timeout=120
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith("{"):
+            report = json.loads(line)
+            return report["ready"] - start, report["loaded"]
+    raise RuntimeError(f"no document was displayed:\n{result.stderr.strip()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("file", nargs="?",
+                        default=os.path.join(ROOT, "tests", "testfile.md"),
+                        help="markdown file to open (default: tests/testfile.md)")
+    parser.add_argument("--runs", type=int, default=5, help="number of cold starts")
+    parser.add_argument("--warm-cache", action="store_true",
+                        help="keep the on-disk render cache between runs")
+    args = parser.parse_args()
+
+    file_path = os.path.abspath(args.file)
+    with tempfile.TemporaryDirectory() as config_dir:
+        env = dict(os.environ)
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+        # QSettings stores its files here on Linux; keeps runs independent
+        env["XDG_CONFIG_HOME"] = config_dir
+        env["HOME"] = config_dir
+
+        times = []
+        loaded = []
+        for run in range(args.runs):
+            cache_run = 0 if args.warm_cache else run
+            env["XDG_CACHE_HOME"] = os.path.join(config_dir, f"cache-{cache_run}")
+            seconds, loaded = measure(file_path, env)
+            times.append(seconds * 1000)
+
+    print(f"main.py {os.path.basename(file_path)}: time to first rendered document "
+          f"({args.runs} runs, platform {env['QT_QPA_PLATFORM']}, "
+          f"{'warm' if args.warm_cache else 'empty'} render cache)")
+    print(f"  median {statistics.median(times):8.1f} ms")
+    print(f"  best   {min(times):8.1f} ms")
+    print(f"  worst  {max(times):8.1f} ms")
+    print("  optional modules loaded before first document: "
+          + (", ".join(loaded) if loaded else "none"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Zoom benchmark: holding Ctrl+= on a long document.
+
+Renders a long document into an offscreen QTextBrowser and sends N zoom
+steps at key auto-repeat rate (one every --repeat ms), reporting the
+relayouts (font changes) done and the time until the last step is on screen:
+
+- one QTextBrowser.setFont() per step, as zooming used to work,
+- ZoomController, which applies the first step at once and coalesces the
+  steps arriving during a relayout into one.
+
+Usage:
+    python benchmarks/bench_zoom.py [--sections N] [--steps N] [--repeat MS]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication, QTextBrowser  # noqa: E402
+
+from viewer.markdown_renderer import MarkdownRenderer  # noqa: E402
+from viewer.zoom_controller import DEFAULT_POINT_SIZE, ZoomController, zoom_font  # noqa: E402
+
+
+def long_document(sections):
+    return "\n\n".join(f"## Section {i}\n\n" + "Some text about this section. " * 40
+                       for i in range(sections))
+
+
+def browser(app, html):
+    view = QTextBrowser()
+    view.resize(1000, 800)
+    view.show()
+    view.setFont(zoom_font(DEFAULT_POINT_SIZE))
+    view.setHtml(html)
+    view.document().documentLayout().documentSize()
+    app.processEvents()
+    return view
+
+
+def hold_key(app, view, step, steps, repeat_ms):
+    """Send steps key repeats; return (relayouts, ms until the last one is shown)."""
+    sizes = [view.document().defaultFont().pointSize()]
+
+    def note_size():
+        size = view.document().defaultFont().pointSize()
+        if size != sizes[-1]:
+            sizes.append(size)
+
+    target = DEFAULT_POINT_SIZE + steps
+    start = time.perf_counter()
+    for i in range(steps):
+        # Key repeats arrive on schedule, or as soon as the GUI thread is free
+        while time.perf_counter() < start + i * repeat_ms / 1000:
+            app.processEvents()
+            note_size()
+        step()
+        note_size()
+        view.viewport().repaint()
+    while sizes[-1] != target:
+        app.processEvents()
+        note_size()
+    view.viewport().repaint()
+    return len(sizes) - 1, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sections", type=int, default=1000, help="document sections")
+    parser.add_argument("--steps", type=int, default=10, help="zoom steps")
+    parser.add_argument("--repeat", type=float, default=33, help="key repeat interval, ms")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    html = MarkdownRenderer().render(long_document(args.sections))
+    print(f"{args.sections} sections, {args.steps} zoom steps every {args.repeat:.0f} ms")
+
+    view = browser(app, html)
+
+    def set_font():
+        view.setFont(zoom_font(view.font().pointSize() + 1))
+
+    relayouts, elapsed = hold_key(app, view, set_font, args.steps, args.repeat)
+    print(f"  setFont per step    {relayouts:3d} relayouts, last step shown after {elapsed:7.0f} ms")
+
+    view = browser(app, html)
+    zoom = ZoomController(view)
+    zoom.prepare_document(view.document(), None)
+    relayouts, elapsed = hold_key(app, view, lambda: zoom.zoom_by(1), args.steps, args.repeat)
+    print(f"  ZoomController      {relayouts:3d} relayouts, last step shown after {elapsed:7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Synthetic markdown corpora for the MDviewer benchmarks.
+
+The generated text mixes the constructs the renderer treats specially
+(headings, paragraphs, lists, blockquotes, tables and fenced code) so that
+timings reflect a realistic document rather than one repeated paragraph.
+"""
+
+_SECTION = """## Section {n}
+
+This is paragraph {n} with **bold**, *italic* and `inline code`, plus a
+[link](https://example.com/{n}) so the inline patterns have work to do.
+
+- First list item for section {n}
+- Second list item with `code`
+- Third list item
+
+> A blockquote in section {n}
+> spanning two lines.
+
+| Name | Value | Notes |
+|------|-------|-------|
+| a{n} | {n}   | plain |
+| b{n} | {n}   | **bold** |
+
+```python
+def section_{n}(value):
+    # Return a scaled value
+    return value * {n}
+```
+
+"""
+
+
+_IMAGE = "![Diagram {n}](images/diagram-{n}.png)\n\n"
+
+
+def synthetic_markdown(target_bytes, images=False):
+    """Return a markdown document of roughly ``target_bytes`` bytes.
+
+    With ``images`` every section also references a relative image, so image
+    path resolution has work to do.
+    """
+    parts = ["# Synthetic Benchmark Document\n\n"]
+    size = len(parts[0])
+    n = 0
+    while size < target_bytes:
+        section = _SECTION.format(n=n)
+        if images:
+            section += _IMAGE.format(n=n)
+        parts.append(section)
+        size += len(section)
+        n += 1
+    return "".join(parts)
+
+
+def paragraph_markdown(count):
+    """Return a markdown document of ``count`` short paragraphs under headings."""
+    parts = ["# Paragraph Benchmark Document\n\n"]
+    for n in range(count):
+        if n % 10 == 0:
+            parts.append(f"## Heading {n}\n\n")
+        parts.append(f"Paragraph {n} has a little *emphasis* and `code` in it.\n\n")
+    return "".join(parts)
@@ -2,14 +2,51 @@
 
 import sys
 import os
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import Qt
-from viewer.main_window import MainWindow
-from version import get_semver, get_version_string
-from icon_loader import icons
+
+
+def open_requested_files(window, files):
+    """Open files handed over by a later launch of the viewer, each in a tab."""
+    for file_path in files:
+        window.open_file_in_tab(file_path)
+    if window.isMinimized():
+        window.showNormal()
+    window.raise_()
+    window.activateWindow()
 
 
 def main():
+    # Headless batch conversion: no QApplication, no window
+    if len(sys.argv) > 1 and sys.argv[1] == "--render":
+        from viewer.batch_render import main as render_main
+
+        sys.exit(render_main(sys.argv[2:]))
+
+    args = sys.argv[1:]
+    new_instance = "--new-instance" in args
+    if new_instance:
+        args.remove("--new-instance")
+
+    # Check if a file path was provided as a command line argument
+    file_to_open = None
+    if args:
+        file_to_open = args[0]
+        # Convert relative paths to absolute
+        if not os.path.isabs(file_to_open):
+            file_to_open = os.path.abspath(file_to_open)
+
+    # Hand the file to a viewer that is already running, before paying for
+    # QApplication and the GUI imports
+    if not new_instance:
+        from viewer.single_instance import send_to_running_instance
+
+        if send_to_running_instance([file_to_open] if file_to_open else []):
+            sys.exit(0)
+
+    from PyQt6.QtWidgets import QApplication
+    from viewer.main_window import MainWindow
+    from version import get_semver
+    from icon_loader import icons
+
     app = QApplication(sys.argv)
     app.setApplicationName("MDviewer")
     app.setApplicationVersion(get_semver())
@@ -27,19 +64,21 @@ def main():
 
     # High DPI support is enabled by default in PyQt6
 
-    # Check if a file path was provided as a command line argument
-    file_to_open = None
-    if len(sys.argv) > 1:
-        file_to_open = sys.argv[1]
-        # Convert relative paths to absolute
-        if not os.path.isabs(file_to_open):
-            file_to_open = os.path.abspath(file_to_open)
-
     app.setWindowIcon(icons.app_icon())
 
     window = MainWindow(file_to_open)
     window.show()
 
+    # Become the instance later launches hand their files to
+    if not new_instance:
+        from viewer.single_instance import SingleInstanceServer
+
+        server = SingleInstanceServer(parent=app)
+        if server.listen():
+            server.files_requested.connect(
+                lambda files: open_requested_files(window, files)
+            )
+
     # Fix Windows taskbar icon (no-op on other platforms)
     icons.set_taskbar_icon(window, app_id="com.mdviewer.mdviewer")
 
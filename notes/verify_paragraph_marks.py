@@ -67,8 +67,7 @@ def test_renderer_modifications():
 
         required_patterns = [
             "hide_paragraph_marks",
-            "_add_paragraph_marks",
-            "_should_have_paragraph_mark",
+            "ParagraphMarkProcessor",
             "paragraph-mark",
         ]
 
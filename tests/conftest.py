@@ -0,0 +1,22 @@
+"""
+Shared pytest fixtures
+"""
+
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """The QApplication shared by every test that needs an event loop or widgets.
+
+    Qt allows one application object per process, so tests never create
+    their own: a QCoreApplication made first would leave later widget tests
+    without a GUI application.
+    """
+    from PyQt6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for headless batch rendering (main.py --render)
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from viewer.batch_render import render_tree
+from viewer.markdown_renderer import MarkdownRenderer
+
+
+def _make_tree(root):
+    (root / "docs" / "guide").mkdir(parents=True)
+    (root / "docs" / "index.md").write_text("# Index\n\n![logo](img/logo.png)\n", encoding="utf-8")
+    (root / "docs" / "guide" / "setup.md").write_text("## Setup\n\n```python\nx = 1\n```\n", encoding="utf-8")
+    (root / "docs" / "notes.txt").write_text("not markdown\n", encoding="utf-8")
+    return root / "docs"
+
+
+def test_output_matches_viewer_renderer(tmp_path):
+    """Pages hold the renderer's theme CSS and body with images resolved."""
+    docs = _make_tree(tmp_path)
+    out = tmp_path / "out"
+    summary = render_tree([str(docs)], output_dir=str(out), theme="light", jobs=1, log=lambda m: None)
+
+    assert summary["rendered"] == 2 and not summary["failed"]
+    assert not (out / "notes.html").exists()
+
+    source = str(docs / "index.md")
+    renderer = MarkdownRenderer(theme="light")
+    expected = renderer.render_document(
+        (docs / "index.md").read_text(encoding="utf-8"), file_path=source
+    )
+    page = (out / "index.html").read_text(encoding="utf-8")
+    assert expected.css in page
+    assert expected.body_html in page
+    assert (out / "guide" / "setup.html").exists()
+
+
+def test_unchanged_files_are_skipped(tmp_path):
+    """A second run only re-renders files whose content changed."""
+    docs = _make_tree(tmp_path)
+    out = str(tmp_path / "out")
+    render_tree([str(docs)], output_dir=out, jobs=1, log=lambda m: None)
+
+    summary = render_tree([str(docs)], output_dir=out, jobs=1, log=lambda m: None)
+    assert (summary["rendered"], summary["skipped"]) == (0, 2)
+
+    (docs / "index.md").write_text("# Changed\n", encoding="utf-8")
+    summary = render_tree([str(docs)], output_dir=out, jobs=1, log=lambda m: None)
+    assert (summary["rendered"], summary["skipped"]) == (1, 1)
+
+    # Other render settings invalidate the manifest
+    summary = render_tree([str(docs)], output_dir=out, theme="light", jobs=1, log=lambda m: None)
+    assert summary["rendered"] == 2
+
+
+def test_process_pool_renders_all_files(tmp_path):
+    """Rendering across worker processes writes every page."""
+    docs = _make_tree(tmp_path)
+    for n in range(6):
+        (docs / f"page{n}.md").write_text(f"# Page {n}\n", encoding="utf-8")
+    out = tmp_path / "out"
+    summary = render_tree([str(docs)], output_dir=str(out), jobs=2, log=lambda m: None)
+
+    assert summary["rendered"] == 8 and not summary["failed"]
+    assert "Page 5" in (out / "page5.html").read_text(encoding="utf-8")
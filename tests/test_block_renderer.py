@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for block-level incremental rendering
+"""
+
+import sys
+import os
+import re
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from viewer.block_renderer import BlockRenderer, can_split, split_blocks
+from viewer.markdown_renderer import MarkdownRenderer
+
+
+def test_split_keeps_fences_lists_and_quotes_whole():
+    """Blank lines inside code fences, lists and blockquotes do not split blocks."""
+    text = (
+        "# Title\n\n"
+        "```python\nx = 1\n\ny = 2\n```\n\n"
+        "- one\n\n- two\n\n    nested\n\n"
+        "> quoted\n\n> more\n\n"
+        "Para."
+    )
+    blocks = split_blocks(text)
+
+    assert blocks == [
+        "# Title",
+        "```python\nx = 1\n\ny = 2\n```",
+        "- one\n\n- two\n\n    nested",
+        "> quoted\n\n> more",
+        "Para.",
+    ]
+
+
+def test_blocks_render_like_the_whole_document():
+    """Blank lines inside blocks and fence closers follow a whole-document render."""
+    renderer = MarkdownRenderer()
+    texts = [
+        # Indented code with runs of blank lines
+        "Intro.\n\n    line one\n\n\n    line two\n\n\n\n    line three\n\nAfter.\n",
+        # A longer fence does not close a shorter one
+        "~~~\na\n~~~~\n\nb\n~~~\n\nc\n",
+        # A fence never closed is not a fence
+        "```python\nx = 1\n\nPara two\n\n# Heading\n",
+        # Loose lists and blockquotes right below a heading
+        "### Steps\n1. one\n2. two\n\n3. three\n",
+        "Title\n=====\n> a\n\n> b\n",
+        "- a\n\n    nested\n\n- b\n",
+    ]
+    for text in texts:
+        whole = renderer.render_document(text, False, "/tmp/x.md")
+        blocks = BlockRenderer(renderer).render_document(text, False, "/tmp/x.md")
+
+        def strip_anchors(html):
+            return re.sub(r'<a name="mdv-block-[^"]*"></a>', "", html).replace("\n", "")
+
+        assert strip_anchors(blocks.body_html) == strip_anchors(whole.body_html)
+        assert blocks.copy_buffer == whole.copy_buffer
+
+    assert split_blocks("    a\n\n\n    b\n\nText") == ["    a\n\n\n    b", "Text"]
+
+
+def test_non_local_constructs_disable_splitting():
+    """Reference links and raw HTML depend on the whole document."""
+    assert can_split("# Title\n\nPlain text.")
+    assert not can_split("See [x][1].\n\n[1]: http://example.com")
+    assert not can_split("<div>raw</div>")
+
+
+def test_unchanged_blocks_keep_their_anchors_and_cache():
+    """Editing one block leaves the other blocks' anchors and cache entries intact."""
+    block_renderer = BlockRenderer(MarkdownRenderer())
+    before = block_renderer.render_document("# A\n\nfirst\n\nsecond\n", False, "/tmp/x.md")
+    cached = len(block_renderer.cache)
+    after = block_renderer.render_document("# A\n\nfirst\n\nedited\n", False, "/tmp/x.md")
+
+    assert [n for n, _ in before.blocks[:2]] == [n for n, _ in after.blocks[:2]]
+    assert before.blocks[2][0] != after.blocks[2][0]
+    assert len(block_renderer.cache) == cached + 1
+
+
+def test_duplicate_heading_ids_are_numbered_across_blocks():
+    """Headings in separate blocks get the same unique ids a whole-document render gives."""
+    block_renderer = BlockRenderer(MarkdownRenderer())
+    result = block_renderer.render_document("# Intro\n\n# Intro\n\n# Intro\n", False, "/tmp/x.md")
+
+    assert 'id="intro"' in result.body_html
+    assert 'id="intro_1"' in result.body_html
+    assert 'id="intro_2"' in result.body_html
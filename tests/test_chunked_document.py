@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for splitting very large documents into lazily rendered sections
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import viewer.chunked_document as chunked_document
+from viewer.block_renderer import BlockRenderer
+from viewer.chunked_document import ChunkedDocument
+from viewer.markdown_renderer import MarkdownRenderer
+
+
+def _document(text):
+    return ChunkedDocument(text, BlockRenderer(MarkdownRenderer()), False, "/tmp/doc.md")
+
+
+def test_sections_are_cut_at_headings_within_size_bounds(monkeypatch):
+    """Sections end at a heading once they reach the minimum size."""
+    monkeypatch.setattr(chunked_document, "SECTION_MIN_BYTES", 20)
+    monkeypatch.setattr(chunked_document, "SECTION_MAX_BYTES", 1000)
+    text = "\n\n".join(
+        f"## Part {n}\n\nA paragraph that is long enough to fill a section."
+        for n in range(4)
+    )
+    doc = _document(text)
+
+    assert doc.section_count == 4
+    assert doc.render_section(2)[0].startswith('<a name="mdv-section-2"></a>')
+    assert "Part 2" in doc.render_section(2)[0]
+
+
+def test_heading_anchors_are_unique_across_sections(monkeypatch):
+    """Repeated headings get toc-style ids that match the rendered sections."""
+    monkeypatch.setattr(chunked_document, "SECTION_MIN_BYTES", 1)
+    doc = _document("# Notes\n\nfirst\n\n# Notes\n\nsecond\n\nSetext *Title*\n-----\n\nthird")
+
+    assert doc.anchor_sections == {"notes": 0, "notes_1": 1, "setext-title": 2}
+    html, _ = doc.render_section(doc.section_for_anchor("notes_1"))
+    assert 'id="notes_1"' in html
+    assert 'href="#notes_1"' in html
+
+
+def test_fenced_comments_are_not_headings(monkeypatch):
+    """A heading right after a closing fence gets its id; # lines inside do not."""
+    monkeypatch.setattr(chunked_document, "SECTION_MIN_BYTES", 1)
+    doc = _document("# Setup\n\n```sh\n# Setup\nmake\n```\n# Usage\n\ntext\n\n# Setup\n\nagain")
+
+    assert doc.anchor_sections == {"setup": 0, "usage": 0, "setup_1": 1}
+    html, _ = doc.render_section(0)
+    assert 'id="usage"' in html
+    html, _ = doc.render_section(doc.section_for_anchor("setup_1"))
+    assert 'id="setup_1"' in html
+
+
+def test_small_documents_are_not_chunked():
+    """Only documents past the size threshold are shown in chunks."""
+    assert not chunked_document.should_chunk("# Small\n\ntext")
+
+
+def test_view_drops_copy_text_of_unloaded_sections(monkeypatch, qapp):
+    """Scrolling through the sections keeps only the loaded ones' Copy texts."""
+    from PyQt6.QtWidgets import QTextBrowser
+
+    from viewer.chunked_document import MAX_LOADED_SECTIONS, ChunkedView
+
+    monkeypatch.setattr(chunked_document, "SECTION_MIN_BYTES", 1)
+    text = "\n\n".join(f"## Part {n}\n\n```\ncode {n}\n```" for n in range(12))
+    doc = _document(text)
+    assert doc.section_count == 12
+
+    renderer = MarkdownRenderer()
+    copy_buffer = {}
+    browser = QTextBrowser()
+    view = ChunkedView(browser, doc, renderer.wrap_body, copy_buffer)
+    for index in range(doc.section_count):
+        view.show_section(index)
+        loaded = set()
+        for section in range(view.first, view.last):
+            loaded.update(doc.render_section(section)[1])
+        assert set(copy_buffer) == loaded
+        assert len(copy_buffer) <= MAX_LOADED_SECTIONS
+    view.detach()
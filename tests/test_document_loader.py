@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared document loader and streaming statistics
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from viewer import document_loader
+from viewer.document_loader import document_stats, load_document
+
+
+def _expected_stats(text):
+    """The counts FileInfoDialog used to compute from the fully read file."""
+    lines = text.count("\n") + (1 if text and not text.endswith("\n") else 0)
+    return lines, len(text.split()), len(text)
+
+
+def test_bom_selects_encoding_and_is_stripped(tmp_path):
+    """UTF-8 and UTF-16 BOMs pick the encoding and are not part of the text."""
+    utf8 = tmp_path / "bom8.md"
+    utf8.write_bytes(b"\xef\xbb\xbf# Title\n")
+    utf16 = tmp_path / "bom16.md"
+    utf16.write_bytes("# Tïtle\n".encode("utf-16"))
+
+    assert load_document(str(utf8)).text == "# Title\n"
+    loaded = load_document(str(utf16))
+    assert loaded.text == "# Tïtle\n"
+    assert loaded.encoding.startswith("utf-16")
+
+
+def test_invalid_utf8_falls_back(tmp_path):
+    """Files that are not UTF-8 and have no BOM are read as cp1252."""
+    doc = tmp_path / "legacy.md"
+    doc.write_bytes("café crème\n".encode("cp1252"))
+
+    loaded = load_document(str(doc))
+    assert loaded.text == "café crème\n"
+    assert loaded.encoding == "cp1252"
+    assert document_stats(str(doc))[1] == "cp1252"
+
+
+def test_stats_match_full_read_across_chunk_boundaries(tmp_path, monkeypatch):
+    """Streaming counts equal whole-file counts even when words straddle chunks."""
+    monkeypatch.setattr(document_loader, "CHUNK_BYTES", 5)
+    samples = [
+        "",
+        "one",
+        "alpha beta gamma\n",
+        "naïve wörds spanning chunks\n\nand a last line",
+        "\n\n  indented   words\t\there\n",
+    ]
+    for index, text in enumerate(samples):
+        doc = tmp_path / f"doc{index}.md"
+        doc.write_bytes(text.encode("utf-8"))
+        stats, encoding = document_stats(str(doc))
+        assert (stats.lines, stats.words, stats.chars) == _expected_stats(text), text
+        assert encoding == "utf-8"
+
+
+def test_large_files_are_memory_mapped(tmp_path, monkeypatch):
+    """Above the threshold the mmap path yields the same text and counts."""
+    monkeypatch.setattr(document_loader, "MMAP_THRESHOLD_BYTES", 16)
+    monkeypatch.setattr(document_loader, "CHUNK_BYTES", 64)
+    text = "# Heading\n\n" + "Some paragraph text with ünïcode.\n\n" * 50
+    doc = tmp_path / "large.md"
+    doc.write_bytes(text.encode("utf-8"))
+
+    assert load_document(str(doc)).text == text
+    stats, _ = document_stats(str(doc))
+    assert (stats.lines, stats.words, stats.chars) == _expected_stats(text)
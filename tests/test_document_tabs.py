@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for per-tab document state and the layout memory budget
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from viewer.document_tabs import (
+    LAYOUT_BYTES_PER_CHARACTER,
+    DocumentTab,
+    enforce_layout_budget,
+)
+
+
+class FakeDocument:
+    """Stands in for a laid-out QTextDocument of a given length."""
+
+    def __init__(self, characters):
+        self.characters = characters
+        self.deleted = False
+
+    def characterCount(self):
+        return self.characters
+
+    def deleteLater(self):
+        self.deleted = True
+
+
+def _tab(name, characters, rendered=True):
+    tab = DocumentTab(f"/docs/{name}.md")
+    tab.document = FakeDocument(characters)
+    if rendered:
+        tab.body_html = f"<p>{name}</p>"
+        tab.needs_render = False
+    tab.touch()
+    return tab
+
+
+def test_least_recently_viewed_documents_are_dropped_first():
+    a, b, c = _tab("a", 1000), _tab("b", 1000), _tab("c", 1000)
+    a.touch()  # b is now the least recently viewed
+    budget = 2000 * LAYOUT_BYTES_PER_CHARACTER
+
+    dropped = enforce_layout_budget([a, b, c], active=c, budget=budget)
+
+    assert dropped == [b]
+    assert b.document is None and b.body_html == "<p>b</p>"
+    assert a.document is not None and c.document is not None
+
+
+def test_active_tab_and_unrendered_tabs_are_kept():
+    """Only documents that can be laid out again from a compact render go."""
+    welcome = _tab("welcome", 1000, rendered=False)
+    active = _tab("active", 5000)
+
+    dropped = enforce_layout_budget([welcome, active], active=active, budget=0)
+
+    assert dropped == []
+    assert welcome.document is not None and active.document is not None
+
+
+def test_within_budget_nothing_is_dropped():
+    tabs = [_tab(name, 100) for name in "abc"]
+    assert enforce_layout_budget(tabs, active=tabs[0], budget=10 ** 9) == []
+
+
+def test_new_tab_state():
+    """A tab for a file is rendered when first shown; PDFs are recognised by name."""
+    tab = DocumentTab("/docs/guide.md")
+    assert tab.needs_render and not tab.has_render() and tab.title == "guide.md"
+    assert DocumentTab("/docs/paper.PDF").is_pdf
+    welcome = DocumentTab()
+    assert not welcome.needs_render and welcome.title == "Welcome"
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for the Find in Files index
+"""
+
+import sys
+import os
+import re
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from viewer import file_index
+from viewer.file_index import FileIndex, parse_markdown, search_indexes, search_roots
+from viewer.markdown_renderer import MarkdownRenderer
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _search(index, query):
+    hits, matched = search_indexes([index], query)
+    return [(os.path.basename(hit.path), hit.anchor) for hit in hits], matched
+
+
+def test_section_anchors_match_rendered_heading_ids():
+    text = (
+        "Intro\n\n# Hello **World**\nbody\n## Hello World\n\nSetext Title\n---\n"
+        "## Custom {: #my-id }\n```\n# not a heading\n```\n"
+        "### `code` [Link](https://example.com) &amp; more!\n"
+    )
+    words, sections = parse_markdown(text)
+    rendered = MarkdownRenderer().md.convert(text)
+    assert [s[0] for s in sections[1:]] == re.findall(r'<h\d id="([^"]+)"', rendered)
+    anchor, title, start, heading_end, line = sections[1]
+    assert (title, line) == ("Hello World", 2)
+    assert words[start:heading_end] == ["hello", "world"]
+    assert "not" in words  # fenced code is indexed as text, not as a heading
+
+
+def test_refresh_only_reads_changed_files(tmp_path, monkeypatch):
+    docs = tmp_path / "docs"
+    for name in ("a.md", "b.md", "sub/c.markdown"):
+        _write(str(docs / name), f"# {name}\n\ncommon words\n")
+    _write(str(docs / ".hidden" / "d.md"), "common\n")
+    _write(str(docs / "notes.txt"), "common\n")
+    index = FileIndex(str(docs), directory=str(tmp_path / "index"))
+    assert index.refresh()
+    assert len(index) == 3
+
+    parsed = []
+    real_parse = file_index.parse_markdown
+    monkeypatch.setattr(file_index, "parse_markdown",
+                        lambda text: parsed.append(text) or real_parse(text))
+    assert not index.refresh()
+    assert parsed == []
+
+    _write(str(docs / "a.md"), "# a.md\n\nchanged text with zebra\n")
+    os.remove(str(docs / "b.md"))
+    assert index.refresh()
+    assert len(parsed) == 1
+    assert _search(index, "common")[1] == 1
+    assert _search(index, "zebra") == ([("a.md", "amd")], 1)
+
+
+def test_phrase_prefix_and_heading_ranking(tmp_path):
+    docs = tmp_path / "docs"
+    _write(str(docs / "body.md"), "# Intro\n\nThe render cache keeps renders.\n"
+                                  "render cache render cache\n")
+    _write(str(docs / "heading.md"), "# Overview\n\ntext\n\n## Render Cache\n\ncache render\n")
+    _write(str(docs / "split.md"), "# Notes\n\ncache then render\n")
+    index = FileIndex(str(docs), directory=str(tmp_path / "index"))
+    index.refresh()
+
+    # All words anywhere; files with heading hits first, then by hits
+    assert _search(index, "render cache") == (
+        [("heading.md", "render-cache"), ("body.md", "intro"), ("split.md", "notes")], 3)
+    # Phrases need the words in order
+    assert _search(index, '"render cache"') == (
+        [("heading.md", "render-cache"), ("body.md", "intro")], 2)
+    assert _search(index, '"then render"') == ([("split.md", "notes")], 1)
+    assert _search(index, '"render then"')[1] == 0
+    # Prefixes, also at the end of a phrase
+    assert _search(index, "rend*")[1] == 3
+    assert _search(index, '"the rend*"') == ([("body.md", "intro")], 1)
+    assert _search(index, "missing")[1] == 0
+
+    [hit], _ = search_indexes([index], "keeps")
+    assert hit.section == "Intro"
+    assert hit.snippet == "The render cache keeps renders."
+
+
+def test_saved_index_is_reloaded_without_reading_files(tmp_path, monkeypatch):
+    docs = tmp_path / "docs"
+    _write(str(docs / "a.md"), "# Title\n\nfirst file\n")
+    _write(str(docs / "b.md"), "# Other\n\nsecond file\n")
+    index = FileIndex(str(docs), directory=str(tmp_path / "index"))
+    index.refresh()
+    os.remove(str(docs / "b.md"))
+    index.refresh()
+    index.save()
+
+    monkeypatch.setattr(file_index, "parse_markdown", lambda text: 1 / 0)
+    reloaded = FileIndex(str(docs), directory=str(tmp_path / "index"))
+    assert reloaded.load()
+    assert not reloaded.refresh()
+    assert _search(reloaded, '"first file"') == ([("a.md", "title")], 1)
+
+    # An index written by another version is ignored
+    monkeypatch.setattr(file_index, "INDEX_FORMAT", file_index.INDEX_FORMAT + 1)
+    assert not FileIndex(str(docs), directory=str(tmp_path / "index")).load()
+
+
+def test_search_roots_skips_nested_and_missing_directories(tmp_path):
+    (tmp_path / "docs" / "sub").mkdir(parents=True)
+    (tmp_path / "other").mkdir()
+    roots = search_roots([
+        str(tmp_path / "docs" / "sub"), str(tmp_path / "docs"),
+        str(tmp_path / "other"), str(tmp_path / "gone"),
+    ])
+    assert roots == [str(tmp_path / "docs"), str(tmp_path / "other")]
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for the debounced document watcher used by auto-reload
+"""
+
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from viewer.file_watcher import DocumentWatcher
+
+
+def _pump(app, seconds):
+    end = time.time() + seconds
+    while time.time() < end:
+        app.processEvents()
+        time.sleep(0.01)
+
+
+def test_burst_of_saves_is_reported_once(tmp_path, qapp):
+    """Several quick writes produce a single change notification."""
+    doc = tmp_path / "doc.md"
+    doc.write_text("# One\n", encoding="utf-8")
+    watcher = DocumentWatcher(debounce_ms=100)
+    changes = []
+    watcher.file_changed.connect(changes.append)
+    watcher.watch(str(doc))
+
+    for i in range(5):
+        doc.write_text(f"# Edit {i}\n" * (i + 1), encoding="utf-8")
+        _pump(qapp, 0.02)
+    _pump(qapp, 0.5)
+
+    assert changes == [str(doc)]
+
+
+def test_atomic_rename_keeps_watching(tmp_path, qapp):
+    """Replacing the file by rename is detected, and so are later saves."""
+    doc = tmp_path / "doc.md"
+    doc.write_text("# One\n", encoding="utf-8")
+    watcher = DocumentWatcher(debounce_ms=50)
+    changes = []
+    watcher.file_changed.connect(changes.append)
+    watcher.watch(str(doc))
+
+    tmp = tmp_path / ".doc.md.swp"
+    tmp.write_text("# Two, renamed into place\n", encoding="utf-8")
+    os.replace(tmp, doc)
+    _pump(qapp, 0.4)
+    assert len(changes) == 1
+
+    doc.write_text("# Three, written in place again\n", encoding="utf-8")
+    _pump(qapp, 0.4)
+    assert len(changes) == 2
+
+
+def test_busy_directory_does_not_postpone_reload(tmp_path, qapp):
+    """Writes to other files in the directory do not restart the debounce."""
+    doc = tmp_path / "doc.md"
+    doc.write_text("# One\n", encoding="utf-8")
+    watcher = DocumentWatcher(debounce_ms=150)
+    changes = []
+    watcher.file_changed.connect(changes.append)
+    watcher.watch(str(doc))
+
+    doc.write_text("# Two\n", encoding="utf-8")
+    for i in range(40):
+        (tmp_path / f"build-{i}.log").write_text("output\n", encoding="utf-8")
+        _pump(qapp, 0.02)
+        if changes:
+            break
+
+    assert changes == [str(doc)]
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Tests for asynchronous image loading in the document view
+"""
+
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QSize, QUrl
+from PyQt6.QtGui import QImage, QTextDocument
+
+from viewer.image_loader import (DiskImageCache, ImageLoader, ImageStatCache, ImageTextBrowser,
+                                 fitted_size, image_cache_key, local_image_path)
+
+
+def _write_image(path, width, height, color=0xff3366):
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(color)
+    assert image.save(path)
+
+
+def _wait_for(app, condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        app.processEvents()
+        time.sleep(0.005)
+    assert condition()
+
+
+def test_local_image_path():
+    assert local_image_path(QUrl.fromLocalFile("/tmp/a b.png")) == "/tmp/a b.png"
+    assert local_image_path(QUrl("/tmp/x.png")) == "/tmp/x.png"
+    assert local_image_path(QUrl("https://example.com/x.png")) is None
+    assert local_image_path(QUrl("images/x.png")) is None
+
+
+def test_stat_cache_remembers_missing_files(tmp_path, monkeypatch):
+    path = str(tmp_path / "late.png")
+    stats = ImageStatCache(max_age=60)
+    calls = []
+    real_stat = os.stat
+    monkeypatch.setattr(os, "stat", lambda p, *a, **k: calls.append(p) or real_stat(p, *a, **k))
+    assert stats.stat(path) is None
+    _write_image(path, 4, 4)
+    assert stats.stat(path) is None and len(calls) == 1
+
+    # Once the entry expires the new file is found
+    stats.max_age = 0
+    assert stats.stat(path).st_size == os.path.getsize(path)
+
+
+def test_loader_decodes_in_background_into_shared_cache(tmp_path, qapp):
+    path = str(tmp_path / "a.png")
+    _write_image(path, 30, 20)
+    key = image_cache_key(path, os.stat(path))
+    broken = str(tmp_path / "broken.png")
+    with open(broken, "wb") as f:
+        f.write(b"not a png")
+    broken_key = image_cache_key(broken, os.stat(broken))
+
+    loader = ImageLoader()
+    decoded = []
+    loader.image_decoded.connect(lambda k, image: decoded.append((k, image.size())))
+    loader.decode(key, path)
+    loader.decode(key, path)  # already queued: not decoded twice
+    loader.decode(broken_key, broken)
+    _wait_for(qapp, lambda: len(decoded) == 2)
+    loader.shutdown()
+
+    assert dict(decoded)[key] == QSize(30, 20)
+    assert loader.cached(key).size().width() == 30
+    assert loader.cached(broken_key) is None and loader.failed(broken_key)
+    assert loader.cache.total_bytes == loader.cached(key).sizeInBytes()
+
+    # Editing the file changes the key, so the new content is decoded
+    _write_image(path, 40, 20)
+    assert image_cache_key(path, os.stat(path)) != key
+
+
+def test_downscaled_decode_is_kept_on_disk(tmp_path, monkeypatch, qapp):
+    from viewer import image_loader
+
+    path = str(tmp_path / "photo.png")
+    _write_image(path, 600, 400)
+    target = fitted_size(QSize(600, 400), 150)
+    assert target == QSize(150, 100)
+    key = image_cache_key(path, os.stat(path), target)
+    assert key[:3] == image_cache_key(path, os.stat(path)) and key[3:] == (150, 100)
+
+    disk_cache = DiskImageCache(str(tmp_path / "images"))
+    loader = ImageLoader(disk_cache=disk_cache)
+    decoded = []
+    loader.image_decoded.connect(lambda k, image: decoded.append(image))
+    loader.decode(key, path, target, 2.0)
+    _wait_for(qapp, lambda: decoded)
+    image = decoded[0]
+    assert image.size() == QSize(150, 100) and image.devicePixelRatio() == 2.0
+    assert disk_cache.get(key).size() == QSize(150, 100)
+
+    # A new session reads the downscaled image instead of decoding the original
+    monkeypatch.setattr(image_loader, "decode_image", lambda *args: 1 / 0)
+    loader = ImageLoader(disk_cache=disk_cache)
+    loader.image_decoded.connect(lambda k, image: decoded.append(image))
+    loader.decode(key, path, target, 1.0)
+    _wait_for(qapp, lambda: len(decoded) == 2)
+    assert decoded[1].size() == QSize(150, 100)
+    assert decoded[1].pixel(0, 0) & 0xffffff == 0xff3366
+    loader.shutdown()
+
+
+def test_browser_lays_out_placeholder_then_swaps_in_image(tmp_path, qapp):
+    path = str(tmp_path / "shot.png")
+    _write_image(path, 64, 48)
+    url = QUrl.fromLocalFile(path)
+    image_type = QTextDocument.ResourceType.ImageResource.value
+
+    browser = ImageTextBrowser(ImageLoader())
+    decoded = []
+    browser.image_loader.image_decoded.connect(lambda k, image: decoded.append(k))
+    browser.setDocument(QTextDocument(browser))
+    browser.setHtml(f'<p><img src="{url.toString()}"></p>')
+    size_before = browser.document().documentLayout().documentSize()
+
+    placeholder = browser.document().resource(image_type, url)
+    assert placeholder.size().width() == 64 and placeholder.size().height() == 48
+    assert placeholder.format() == QImage.Format.Format_Mono
+
+    _wait_for(qapp, lambda: decoded)
+    image = browser.document().resource(image_type, url)
+    assert image.format() != QImage.Format.Format_Mono
+    assert image.pixel(0, 0) & 0xffffff == 0xff3366
+    # The placeholder had the final size, so nothing moved
+    assert browser.document().documentLayout().documentSize() == size_before
+
+    # Another document showing the same file gets the cached image at once
+    browser.setDocument(QTextDocument(browser))
+    browser.setHtml(f'<p><img src="{url.toString()}"></p>')
+    assert browser.document().resource(image_type, url).format() != QImage.Format.Format_Mono
+    assert len(decoded) == 1
+    browser.image_loader.shutdown()
+
+
+def test_browser_fits_wide_images_to_the_page(tmp_path, qapp):
+    path = str(tmp_path / "wide.png")
+    _write_image(path, 3000, 1000)
+    url = QUrl.fromLocalFile(path)
+    image_type = QTextDocument.ResourceType.ImageResource.value
+
+    browser = ImageTextBrowser(ImageLoader())
+    browser.resize(700, 500)
+    decoded = []
+    browser.image_loader.image_decoded.connect(lambda k, image: decoded.append(k))
+    browser.setDocument(QTextDocument(browser))
+    browser.setHtml(f'<p><img src="{url.toString()}"></p>')
+    fit = browser.fit_width()
+    assert fit < 700 and fit % 64 == 0
+
+    _wait_for(qapp, lambda: decoded)
+    image = browser.document().resource(image_type, url)
+    assert image.deviceIndependentSize().toSize() == fitted_size(QSize(3000, 1000), fit)
+
+    # Asking for full size decodes the original and lays the page out again
+    browser.set_full_size_images(True)
+    _wait_for(qapp, lambda: len(decoded) == 2)
+    assert browser.document().resource(image_type, url).size() == QSize(3000, 1000)
+    assert browser.document().documentLayout().documentSize().width() > 3000
+
+    # Back to fitted: the downscaled image is still cached
+    browser.set_full_size_images(False)
+    assert browser.document().resource(image_type, url).width() == fit
+    assert len(decoded) == 2
+    browser.image_loader.shutdown()
+
+
+def test_browser_shows_missing_images_without_retrying(tmp_path, qapp):
+    url = QUrl.fromLocalFile(str(tmp_path / "missing.png"))
+    image_type = QTextDocument.ResourceType.ImageResource.value
+
+    class CountingBrowser(ImageTextBrowser):
+        loads = 0
+
+        def loadResource(self, resource_type, url):
+            CountingBrowser.loads += 1
+            return super().loadResource(resource_type, url)
+
+    browser = CountingBrowser(ImageLoader())
+    browser.resize(400, 300)
+    browser.show()
+    browser.setDocument(QTextDocument(browser))
+    browser.setHtml(f'<p><img src="{url.toString()}"> text</p>')
+    for _ in range(3):
+        browser.viewport().repaint()
+        qapp.processEvents()
+    assert CountingBrowser.loads == 1
+    assert browser.document().resource(image_type, url) == browser.image_loader.missing_image()
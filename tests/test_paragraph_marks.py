@@ -137,6 +137,48 @@ Normal paragraph without special formatting.
         return False
 
 
+def test_marks_added_during_conversion():
+    """Headings, paragraphs and list items get one mark each; code gets none."""
+    from viewer.markdown_renderer import MarkdownRenderer
+
+    renderer = MarkdownRenderer("dark")
+    html, copy_buffer = renderer.convert_body(
+        "# Title\n\nSome text.\n\n- one\n- two\n\n```\n## not a heading\n```\n",
+        hide_paragraph_marks=False,
+    )
+
+    assert html.count('<span class="paragraph-mark">.</span>') == 4
+    assert '## not a heading' in html
+    assert "paragraph-mark" not in html[html.index("<pre"):]
+    # The stashed code block must survive being next to marked paragraphs
+    assert list(copy_buffer.values()) == ["## not a heading"]
+
+
+def test_nested_blocks_are_marked_once():
+    """A list item or blockquote holding paragraphs leaves the marks to the paragraphs."""
+    from viewer.markdown_renderer import MarkdownRenderer
+
+    renderer = MarkdownRenderer("dark")
+    html, _ = renderer.convert_body(
+        "- first\n\n- second\n\n> quoted\n", hide_paragraph_marks=False
+    )
+
+    assert html.count("paragraph-mark") == 3
+    assert "<li>\n<p>first<span" in html
+
+
+def test_hidden_marks_remove_permalinks():
+    """With marks hidden no marks are added and heading permalinks are removed."""
+    from viewer.markdown_renderer import MarkdownRenderer
+
+    renderer = MarkdownRenderer("dark")
+    html, _ = renderer.convert_body("# Title\n\nText.\n", hide_paragraph_marks=True)
+
+    assert "paragraph-mark" not in html
+    assert "headerlink" not in html
+    assert '<h1 id="title">Title</h1>' in html
+
+
 def test_main_window_integration():
     """Test main window integration"""
     try:
@@ -145,8 +187,9 @@ def test_main_window_integration():
 
         print("\n=== Testing Main Window Integration ===")
 
-        # Create minimal application for testing
-        app = QApplication([])
+        # Create minimal application for testing (under pytest, the shared
+        # qapp fixture's application may already be running)
+        app = QApplication.instance() or QApplication([])
 
         # Test main window initialization
         window = MainWindow()
@@ -171,6 +214,9 @@ def test_main_window_integration():
 
         print("✅ Main window integration working!")
 
+        # The window may have started rendering the last opened file
+        for worker in list(window._render_workers):
+            worker.wait()
         app.quit()
         return True
 
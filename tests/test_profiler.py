@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for render profiling (View → Profile Rendering / MDVIEWER_PROFILE)
+"""
+
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from viewer.markdown_renderer import MarkdownRenderer
+from viewer.profiler import ProfileCycle, RenderProfiler, activate, stage
+from viewer.render_cache import RenderCache
+from viewer.render_worker import RenderWorker
+
+TESTFILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "testfile.md")
+
+
+def test_stages_are_ignored_without_an_active_cycle():
+    """Markers outside an active cycle record nothing."""
+    cycle = ProfileCycle("doc")
+    with stage("convert"):
+        pass
+    assert cycle.stages == []
+
+
+def test_nested_stages_report_self_time():
+    """A nested stage's time is not counted again in its parent's breakdown."""
+    cycle = ProfileCycle("doc")
+    with activate(cycle):
+        with stage("convert"):
+            with stage("highlight"):
+                sum(range(20000))
+    names = [name for name, _, _ in cycle.breakdown()]
+    assert names == ["convert", "highlight"]
+    convert, highlight = cycle.stages[1], cycle.stages[0]
+    assert convert["self_us"] == convert["duration_us"] - highlight["duration_us"]
+    assert highlight["depth"] == 1
+    assert "convert" in cycle.summary() and "highlight" in cycle.summary()
+
+
+def test_worker_records_its_stages_in_the_cycle(qapp):
+    """A profiled RenderWorker records read and convert stages for its document."""
+    profiler = RenderProfiler()
+    profiler.set_enabled(True)
+    try:
+        cycle = profiler.new_cycle("testfile.md")
+        finished = []
+        worker = RenderWorker(1, TESTFILE, MarkdownRenderer(), RenderCache(), False, profile=cycle)
+        worker.render_finished.connect(lambda rid, doc: finished.append(doc))
+        worker.start()
+        worker.wait()
+        qapp.processEvents()
+    finally:
+        profiler.set_enabled(False)
+
+    assert finished and finished[0].profile is cycle
+    names = {record["name"] for record in cycle.stages}
+    assert {"read", "convert", "highlight", "resolve_image_paths"} <= names
+    assert all(record["thread"] != "MainThread" for record in cycle.stages)
+
+
+def test_history_exports_json_and_chrome_trace(tmp_path):
+    """Finished cycles are kept and written in the format the file name asks for."""
+    profiler = RenderProfiler(history_size=2)
+    profiler.set_enabled(True)
+    try:
+        for label in ("a", "b", "c"):
+            cycle = profiler.new_cycle(label)
+            with activate(cycle), stage("layout"):
+                pass
+            profiler.finish(cycle)
+    finally:
+        profiler.set_enabled(False)
+    assert [cycle.label for cycle in profiler.history] == ["b", "c"]
+
+    profiler.export(str(tmp_path / "profile.json"))
+    data = json.loads((tmp_path / "profile.json").read_text(encoding="utf-8"))
+    assert [cycle["label"] for cycle in data["cycles"]] == ["b", "c"]
+
+    profiler.export(str(tmp_path / "profile.trace.json"))
+    trace = json.loads((tmp_path / "profile.trace.json").read_text(encoding="utf-8"))
+    spans = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert [event["cat"] for event in spans] == ["b", "c"]
+    assert all("alloc_bytes" in event["args"] for event in spans)
+
+
+def test_disabled_profiler_creates_no_cycles():
+    profiler = RenderProfiler()
+    assert profiler.new_cycle("doc") is None
+    profiler.finish(None)
+    assert not profiler.history
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Tests for fetching remote images, against a local HTTP server
+"""
+
+import sys
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QBuffer, QIODevice, QSize, QUrl
+from PyQt6.QtGui import QImage, QTextDocument
+
+from viewer.image_loader import ImageLoader, ImageTextBrowser
+from viewer.remote_images import RemoteImageCache, RemoteImageFetcher, fetch_image_data
+
+
+def _png(width, height, color=0x3366ff):
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(color)
+    buffer = QBuffer()
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(buffer.data())
+
+
+class _ImageServer:
+    """Serves PNGs with ETag (/etag/...) or Last-Modified (/modified/...) validators.
+
+    /slow/... answers after a delay; requests, full downloads and the most
+    requests in flight at once are counted.
+    """
+
+    def __init__(self, body, delay=0.0):
+        self.body = body
+        self.delay = delay
+        self.requests = []
+        self.downloads = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server.lock:
+                    server.requests.append((self.path, dict(self.headers)))
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                try:
+                    self._respond()
+                finally:
+                    with server.lock:
+                        server.in_flight -= 1
+
+            def _respond(self):
+                if self.path.startswith("/slow/") or server.delay:
+                    time.sleep(server.delay or 1.0)
+                if self.path.startswith("/missing/"):
+                    self.send_error(404)
+                    return
+                if self.path.startswith("/etag/"):
+                    validator = ("ETag", '"v1"')
+                    fresh = self.headers.get("If-None-Match") == '"v1"'
+                else:
+                    validator = ("Last-Modified", "Wed, 01 Jan 2025 00:00:00 GMT")
+                    fresh = self.headers.get("If-Modified-Since") == validator[1]
+                if fresh:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                with server.lock:
+                    server.downloads += 1
+                self.send_response(200)
+                self.send_header("Content-Type", "image/png")
+                self.send_header("Content-Length", str(len(server.body)))
+                self.send_header(*validator)
+                self.end_headers()
+                self.wfile.write(server.body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}{path}"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    server = _ImageServer(_png(40, 20))
+    yield server
+    server.close()
+
+
+def _wait_for(app, condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        app.processEvents()
+        time.sleep(0.005)
+    assert condition()
+
+
+def test_cached_images_are_revalidated_not_downloaded_again(server, tmp_path):
+    cache = RemoteImageCache(str(tmp_path / "remote"))
+    for path, header in (("/etag/a.png", "If-None-Match"),
+                         ("/modified/b.png", "If-Modified-Since")):
+        url = server.url(path)
+        assert fetch_image_data(url, cache) == server.body
+        downloads = server.downloads
+        # A new session revalidates the cached copy: 304, nothing downloaded
+        assert fetch_image_data(url, RemoteImageCache(str(tmp_path / "remote"))) == server.body
+        assert server.downloads == downloads
+        assert header in server.requests[-1][1]
+        # Without revalidation no request is made at all
+        requests = len(server.requests)
+        assert fetch_image_data(url, cache, revalidate=False) == server.body
+        assert len(server.requests) == requests
+
+    assert fetch_image_data(server.url("/missing/c.png"), cache) is None
+
+
+def test_requests_time_out_and_fall_back_to_the_cached_copy(server, tmp_path):
+    cache = RemoteImageCache(str(tmp_path / "remote"))
+    start = time.perf_counter()
+    assert fetch_image_data(server.url("/slow/a.png"), cache, timeout=0.2) is None
+    assert time.perf_counter() - start < 0.9
+
+    cache.put(server.url("/slow/b.png"), {"etag": '"v0"', "last_modified": None}, b"stale")
+    assert fetch_image_data(server.url("/slow/b.png"), cache, timeout=0.2) == b"stale"
+    assert fetch_image_data("http://127.0.0.1:1/refused.png", cache, timeout=0.2) is None
+
+
+def test_fetcher_limits_connections_and_decodes_in_background(tmp_path, qapp):
+    server = _ImageServer(_png(40, 20), delay=0.05)
+    try:
+        fetcher = RemoteImageFetcher(RemoteImageCache(str(tmp_path / "remote")), connections=2)
+        loader = ImageLoader(fetcher=fetcher)
+        decoded = {}
+        loader.image_decoded.connect(lambda key, image: decoded.__setitem__(key, image))
+        for i in range(8):
+            loader.fetch(i, server.url(f"/etag/{i}.png"))
+        loader.fetch(0, server.url("/etag/0.png"))  # already underway
+        loader.fetch("wide", server.url("/etag/0.png"), max_width=20, device_ratio=1.0)
+        _wait_for(qapp, lambda: len(decoded) == 9)
+        loader.shutdown()
+
+        assert server.max_in_flight == 2
+        assert all(decoded[i].size() == QSize(40, 20) for i in range(8))
+        assert decoded["wide"].size() == QSize(20, 10)
+        # /etag/0.png was revalidated once in this session, then read from disk
+        assert [path for path, _ in server.requests].count("/etag/0.png") == 1
+    finally:
+        server.close()
+
+
+def test_browser_swaps_remote_images_in(server, tmp_path, qapp):
+    url = QUrl(server.url("/etag/badge.png"))
+    image_type = QTextDocument.ResourceType.ImageResource.value
+
+    fetcher = RemoteImageFetcher(RemoteImageCache(str(tmp_path / "remote")))
+    browser = ImageTextBrowser(ImageLoader(fetcher=fetcher))
+    decoded = []
+    browser.image_loader.image_decoded.connect(lambda k, image: decoded.append(k))
+    browser.setDocument(QTextDocument(browser))
+    browser.setHtml(f'<p><img src="{url.toString()}"></p>')
+    assert browser.document().resource(image_type, url).format() == QImage.Format.Format_Mono
+
+    _wait_for(qapp, lambda: decoded)
+    image = browser.document().resource(image_type, url)
+    assert image.size() == QSize(40, 20)
+    assert image.pixel(0, 0) & 0xffffff == 0x3366ff
+    browser.image_loader.shutdown()
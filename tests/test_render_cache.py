@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for the bounded LRU render cache
+"""
+
+import sys
+import os
+import json
+import time
+import zlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from viewer.render_cache import DiskRenderCache, RenderCache, disk_cache_key, render_cache_key
+
+
+def test_lru_eviction_by_size():
+    """Least recently used entries are evicted once the byte budget is exceeded."""
+    cache = RenderCache(max_bytes=100)
+    cache.put("a", "A", 40)
+    cache.put("b", "B", 40)
+
+    # Touch "a" so "b" becomes the eviction candidate
+    assert cache.get("a") == "A"
+    cache.put("c", "C", 40)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.total_bytes == 80
+
+
+def test_oversized_entry_is_not_cached():
+    """An entry larger than the whole budget is ignored rather than flushing the cache."""
+    cache = RenderCache(max_bytes=100)
+    cache.put("a", "A", 40)
+    cache.put("huge", "H", 500)
+
+    assert "a" in cache
+    assert "huge" not in cache
+
+
+def test_key_tracks_render_inputs():
+    """Changing content, mark state or file path yields a different key."""
+    base = render_cache_key("# Doc", False, "/tmp/doc.md")
+
+    assert base == render_cache_key("# Doc", False, "/tmp/doc.md")
+    assert base != render_cache_key("# Doc!", False, "/tmp/doc.md")
+    assert base != render_cache_key("# Doc", True, "/tmp/doc.md")
+    assert base != render_cache_key("# Doc", False, "/other/doc.md")
+
+
+def test_disk_cache_round_trip_and_lru_budget(tmp_path):
+    """Entries survive a new cache instance; the least recently used go first."""
+    cache = DiskRenderCache(str(tmp_path))
+    value = ("<p>body</p>", {"copy-1": "code"}, [("mdv-block-a", "<p>body</p>")])
+    cache.put("a", value)
+    assert DiskRenderCache(str(tmp_path)).get("a") == value
+
+    one_entry = cache.total_bytes
+    cache = DiskRenderCache(str(tmp_path), max_bytes=one_entry * 2)
+    cache.put("b", ("<p>b</p>", {}, None))
+    old = time.time() - 60
+    os.utime(tmp_path / ("b" + DiskRenderCache.SUFFIX), (old, old))
+    os.utime(tmp_path / ("a" + DiskRenderCache.SUFFIX), (old - 60, old - 60))
+    cache.get("a")  # refreshes "a", leaving "b" least recently used
+    cache.put("c", ("<p>c</p>", {}, None))
+
+    assert cache.get("a") == value
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_disk_cache_total_counts_a_rewritten_entry_once(tmp_path):
+    """Storing a key again replaces its size in the total instead of adding to it."""
+    cache = DiskRenderCache(str(tmp_path))
+    cache.put("a", ("<p>first</p>", {}, None))
+    cache.put("b", ("<p>other</p>", {}, None))
+    for body in ("<p>second, longer</p>", "<p>x</p>"):
+        cache.put("a", (body, {}, None))
+        assert cache.total_bytes == cache._measure()
+
+
+def test_disk_cache_treats_corrupt_entries_as_misses(tmp_path):
+    cache = DiskRenderCache(str(tmp_path))
+    (tmp_path / ("bad" + DiskRenderCache.SUFFIX)).write_bytes(b"not zlib")
+    assert cache.get("bad") is None
+    assert not (tmp_path / ("bad" + DiskRenderCache.SUFFIX)).exists()
+
+    # Well-formed entries of another layout are misses too
+    for name, data in (("keys", {"html": "<p>x</p>"}), ("list", ["<p>x</p>"]),
+                       ("blocks", {"body_html": "", "copy_buffer": {}, "blocks": [1]})):
+        path = tmp_path / (name + DiskRenderCache.SUFFIX)
+        path.write_bytes(zlib.compress(json.dumps(data).encode("utf-8")))
+        assert cache.get(name) is None
+        assert not path.exists()
+
+
+def test_disk_key_tracks_file_identity(tmp_path):
+    """Touching the file or changing the renderer invalidates the entry."""
+    doc = tmp_path / "doc.md"
+    doc.write_text("# Doc", encoding="utf-8")
+    st = os.stat(doc)
+    base = disk_cache_key(str(doc), st, "hash", False, "v1")
+
+    assert base == disk_cache_key(str(doc), os.stat(doc), "hash", False, "v1")
+    assert base != disk_cache_key(str(doc), st, "hash", False, "v2")
+    assert base != disk_cache_key(str(doc), st, "hash", True, "v1")
+    os.utime(doc, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert base != disk_cache_key(str(doc), os.stat(doc), "hash", False, "v1")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for the background RenderWorker
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from viewer.markdown_renderer import MarkdownRenderer
+from viewer.render_cache import DiskRenderCache, RenderCache
+from viewer.render_worker import RenderWorker
+
+TESTFILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "testfile.md")
+
+
+def _run_worker(app, worker):
+    """Run a worker to completion and deliver its queued signals."""
+    finished, failed = [], []
+    worker.render_finished.connect(lambda rid, doc: finished.append((rid, doc)))
+    worker.render_failed.connect(lambda rid, msg: failed.append((rid, msg)))
+    worker.start()
+    worker.wait()
+    app.processEvents()
+    return finished, failed
+
+
+def test_worker_renders_file_and_fills_cache(qapp):
+    """A worker delivers the rendered body and stores it in the render cache."""
+    cache = RenderCache()
+    worker = RenderWorker(7, TESTFILE, MarkdownRenderer(), cache, False, scroll_pos=42)
+
+    finished, failed = _run_worker(qapp, worker)
+
+    assert not failed
+    assert len(finished) == 1
+    request_id, document = finished[0]
+    assert request_id == 7
+    assert "<h1" in document.body_html
+    assert document.scroll_pos == 42
+    assert len(cache) == 1
+
+
+def test_missing_file_reports_failure(qapp):
+    """Read errors come back through render_failed instead of raising."""
+    worker = RenderWorker(3, TESTFILE + ".missing", MarkdownRenderer(), RenderCache(), False)
+
+    finished, failed = _run_worker(qapp, worker)
+
+    assert not finished
+    assert len(failed) == 1 and failed[0][0] == 3
+
+
+def test_disk_cache_skips_conversion_in_a_new_session(tmp_path, qapp):
+    """A fresh worker with an empty memory cache reuses the on-disk render."""
+    disk_cache = DiskRenderCache(str(tmp_path))
+    first, _ = _run_worker(
+        qapp,
+        RenderWorker(1, TESTFILE, MarkdownRenderer(), RenderCache(), False, disk_cache=disk_cache)
+    )
+    assert disk_cache.total_bytes > 0
+
+    class NoConvert(MarkdownRenderer):
+        def render_document(self, *args, **kwargs):
+            raise AssertionError("converted despite a disk cache hit")
+
+    second, failed = _run_worker(
+        qapp,
+        RenderWorker(2, TESTFILE, NoConvert(), RenderCache(), False, disk_cache=disk_cache)
+    )
+    assert not failed
+    assert second[0][1].body_html == first[0][1].body_html
+    assert second[0][1].copy_buffer == first[0][1].copy_buffer
@@ -75,6 +75,99 @@ def hello_world():
         return False
 
 
+def test_converter_reuse_resets_state():
+    """Reused converters must not carry header ids over between renders."""
+
+    renderer = MarkdownRenderer()
+
+    first = renderer.render("# Title\n\nBody text.")
+    second = renderer.render("# Title\n\nBody text.")
+
+    assert first == second, "Repeated renders produced different HTML"
+    assert 'id="title"' in second, "Header id leaked from the previous render"
+    assert 'id="title_1"' not in second, "Header id leaked from the previous render"
+
+
+def test_render_document_separates_css():
+    """The body HTML is theme independent; only the CSS follows the theme."""
+
+    renderer = MarkdownRenderer("dark")
+    dark = renderer.render_document("# Title\n\nBody text.")
+    renderer.current_theme = "light"
+    light = renderer.render_document("# Title\n\nBody text.")
+
+    assert dark.body_html == light.body_html, "Body HTML changed with the theme"
+    assert dark.css != light.css, "CSS did not follow the theme"
+    assert "<style>" not in dark.body_html, "Theme CSS leaked into the body HTML"
+
+
+def test_copy_buffer_holds_raw_code_source():
+    """Copy text comes from the code source, for fenced and indented blocks alike."""
+
+    renderer = MarkdownRenderer()
+    html, copy_buffer = renderer.convert_body(
+        "```html\n<b>&amp; \"x\"</b>\n```\n\nText.\n\n    indented = 1\n",
+        hide_paragraph_marks=True,
+    )
+
+    assert sorted(copy_buffer.values()) == ['<b>&amp; "x"</b>', "indented = 1"]
+    for copy_id in copy_buffer:
+        assert f'href="copy:{copy_id}"' in html, "Copy link missing for a code block"
+    assert html.count('class="highlight"') == 2, "Code block was not highlighted"
+
+
+def test_highlight_cache_reused_across_renders(monkeypatch):
+    """Unchanged code blocks are not re-highlighted on the next render."""
+    import viewer.markdown_renderer as markdown_renderer
+
+    renderer = MarkdownRenderer()
+    text = "```python\nx = 1\n```\n\n```\nplain <text>\n```\n"
+    first = renderer.render_document(text).body_html
+    assert len(renderer.highlight_cache) == 2
+
+    calls = []
+    monkeypatch.setattr(
+        markdown_renderer, "highlight", lambda *args: calls.append(args) or ""
+    )
+    second = renderer.render_document(text).body_html
+
+    assert calls == [], "Cached code block was highlighted again"
+    assert first == second
+    # Unlabeled fences are shown as plain text rather than guessed
+    assert '<code>plain &lt;text&gt;' in first
+
+
+def test_image_paths_resolved_in_the_tree(tmp_path):
+    """Image sources are resolved against the document, code samples are left alone."""
+    from PyQt6.QtCore import QUrl
+
+    renderer = MarkdownRenderer()
+    source = str(tmp_path / "docs" / "readme.md")
+    text = (
+        "![a](img/a.png) ![b][ref] ![ref]\n\n"
+        "[ref]: ../shared/b%20c.png\n\n"
+        '<p><img alt="raw" src="raw.png"></p>\n\n'
+        "![remote](https://example.com/x.png) ![abs](/abs/x.png)\n\n"
+        '```html\n<img src="code.png">\n```\n\n'
+        'Inline `src="inline.png"` text.\n'
+    )
+    html, _ = renderer.convert_body(text, True, source)
+
+    def url(path):
+        return QUrl.fromLocalFile(os.path.normpath(str(tmp_path / path))).toString()
+
+    assert f'src="{url("docs/img/a.png")}"' in html
+    assert html.count(f'src="{url("shared/b%20c.png")}"') == 2
+    assert f'src="{url("docs/raw.png")}"' in html
+    assert 'src="https://example.com/x.png"' in html and 'src="/abs/x.png"' in html
+    assert "&quot;code.png&quot;" in html and url("docs/code.png") not in html
+    assert '<code>src="inline.png"</code>' in html
+
+    # Without a file path sources stay as written
+    html, _ = renderer.convert_body("![a](img/a.png)\n", True)
+    assert 'src="img/a.png"' in html
+
+
 if __name__ == "__main__":
     success = test_markdown_renderer()
     sys.exit(0 if success else 1)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for single-instance mode (later launches hand their files over)
+"""
+
+import sys
+import os
+import subprocess
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from PyQt6.QtNetwork import QLocalSocket
+
+from viewer.single_instance import SingleInstanceServer, send_to_running_instance
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def _unique_name():
+    return "mdviewer-test-" + uuid.uuid4().hex[:8]
+
+
+def _launch_client(name, files):
+    """Run send_to_running_instance() in a separate process, as a new launch would."""
+    code = (
+        "import sys; sys.path.insert(0, sys.argv[1]);"
+        "from viewer.single_instance import send_to_running_instance as send;"
+        "sys.exit(0 if send(sys.argv[3:], name=sys.argv[2]) else 1)"
+    )
+    return subprocess.Popen([sys.executable, "-c", code, os.path.abspath(ROOT), name, *files])
+
+
+def _serve_until_exit(app, process, timeout=10):
+    deadline = time.time() + timeout
+    while process.poll() is None and time.time() < deadline:
+        app.processEvents()
+        time.sleep(0.005)
+    app.processEvents()
+    return process.wait(timeout=1)
+
+
+def test_launch_hands_files_to_running_server(qapp):
+    """A second launch delivers its paths to the server and exits successfully."""
+    name = _unique_name()
+    server = SingleInstanceServer(name=name)
+    assert server.listen()
+    requests = []
+    server.files_requested.connect(requests.append)
+    try:
+        client = _launch_client(name, ["/docs/a.md", "/docs/ü b.md"])
+        assert _serve_until_exit(qapp, client) == 0
+    finally:
+        server.close()
+    assert requests == [["/docs/a.md", "/docs/ü b.md"]]
+
+
+def test_no_handover_without_a_running_server():
+    assert not send_to_running_instance(["/docs/a.md"], name=_unique_name())
+
+
+def test_second_server_does_not_take_over_a_live_one(qapp):
+    name = _unique_name()
+    first = SingleInstanceServer(name=name)
+    assert first.listen()
+    try:
+        assert not SingleInstanceServer(name=name).listen()
+    finally:
+        first.close()
+
+
+def test_malformed_request_is_rejected(qapp):
+    """Garbage on the socket gets an error reply and no open request."""
+    name = _unique_name()
+    server = SingleInstanceServer(name=name)
+    assert server.listen()
+    requests = []
+    server.files_requested.connect(requests.append)
+    try:
+        socket = QLocalSocket()
+        socket.connectToServer(name)
+        assert socket.waitForConnected(1000)
+        socket.write(b'{"files": [1, 2]}\n')
+        socket.flush()
+        reply = b""
+        deadline = time.time() + 5
+        while not reply.endswith(b"\n") and time.time() < deadline:
+            qapp.processEvents()
+            socket.waitForReadyRead(10)
+            reply += bytes(socket.readAll())
+    finally:
+        server.close()
+    assert reply == b"error\n"
+    assert requests == []
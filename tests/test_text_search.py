@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the Find dialog's plain-text search index
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from viewer.text_search import SearchWorker, TextIndex, matches_in_range, utf16_length
+
+
+def test_find_all_matches_like_qtextdocument_find():
+    """Case-insensitive by default, non-overlapping, in document order."""
+    index = TextIndex("The theme, then THE end. aaaa")
+    assert index.find_all("the") == [0, 4, 11, 16]
+    assert index.find_all("the", case_sensitive=True) == [4, 11]
+    assert index.find_all("aa") == [25, 27]
+    assert index.find_all("") == []
+
+
+def test_whole_word_matches():
+    index = TextIndex("the theme; the-end (the)")
+    assert index.find_all("the", whole_word=True) == [0, 11, 20]
+
+
+def test_offsets_survive_case_folding_that_changes_length():
+    """U+0130 lower-cases to two characters; offsets must still line up."""
+    text = "İstanbul and more text"
+    index = TextIndex(text)
+    [offset] = index.find_all("more")
+    assert text[offset:offset + 4] == "more"
+
+
+def test_offsets_are_document_positions_after_emoji(qapp):
+    """Characters outside the BMP take two document positions."""
+    from PyQt6.QtGui import QTextCursor, QTextDocument
+
+    document = QTextDocument()
+    document.setPlainText("Done \U0001F389 twice \U0001F600\U0001F600 then the end")
+    index = TextIndex.from_document(document)
+    [offset] = index.find_all("end")
+    # Three emoji before the match, each one position more than in the string
+    assert offset == index.text.index("end") + 3
+    cursor = QTextCursor(document)
+    cursor.setPosition(offset)
+    cursor.setPosition(offset + utf16_length("end"), QTextCursor.MoveMode.KeepAnchor)
+    assert cursor.selectedText() == "end"
+    assert utf16_length("a\U0001F389") == 3
+
+
+def test_interrupted_search_returns_none():
+    index = TextIndex("x " * 20000)
+    assert index.find_all("x", interrupted=lambda: True) is None
+
+
+def test_matches_in_range_uses_start_offsets():
+    offsets = [3, 10, 25, 40]
+    assert matches_in_range(offsets, 10, 40) == (1, 3)
+    assert matches_in_range(offsets, 41, 100) == (4, 4)
+
+
+def test_worker_reports_offsets_for_its_request(qapp):
+    results = []
+    worker = SearchWorker(5, TextIndex("find me, find me"), "find", False, False)
+    worker.search_finished.connect(lambda rid, offsets: results.append((rid, offsets)))
+    worker.start()
+    worker.wait()
+    qapp.processEvents()
+    assert results == [(5, [0, 9])]
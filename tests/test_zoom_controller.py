@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for coalesced, anchored zooming of the document view
+"""
+
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QPoint, QPointF, QSettings, Qt
+from PyQt6.QtGui import QTextDocument, QWheelEvent
+
+from viewer.zoom_controller import DEFAULT_POINT_SIZE, MAX_POINT_SIZE, ZoomController
+
+
+def _browser(html):
+    from PyQt6.QtWidgets import QTextBrowser
+
+    browser = QTextBrowser()
+    browser.resize(600, 400)
+    browser.show()
+    browser.setHtml(html)
+    browser.document().documentLayout().documentSize()
+    return browser
+
+
+def _long_html(sections=80):
+    return "".join(f"<h2>Heading {i}</h2><p>{'Some words to wrap. ' * 20}</p>"
+                   for i in range(sections))
+
+
+def _wait_for(app, condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        app.processEvents()
+        time.sleep(0.005)
+    assert condition()
+
+
+def _heading(document, number):
+    block = document.begin()
+    while block.text() != f"Heading {number}":
+        block = block.next()
+    return block
+
+
+def test_burst_of_zoom_requests_is_one_relayout(qapp):
+    browser = _browser(_long_html())
+    zoom = ZoomController(browser, interval_ms=50)
+    zoom.prepare_document(browser.document(), None)
+    applied = []
+    zoom.zoom_changed.connect(applied.append)
+
+    # The first request is applied at once, the rest of the burst together
+    for _ in range(6):
+        zoom.zoom_by(1)
+    assert applied == [DEFAULT_POINT_SIZE + 1]
+    _wait_for(qapp, lambda: len(applied) == 2)
+    assert applied[1] == DEFAULT_POINT_SIZE + 6
+    assert browser.document().defaultFont().pointSize() == DEFAULT_POINT_SIZE + 6
+
+    # Requests beyond the limit change nothing
+    time.sleep(0.06)
+    qapp.processEvents()
+    zoom.zoom_by(100)
+    zoom.zoom_by(1)
+    _wait_for(qapp, lambda: len(applied) == 3)
+    assert applied[2] == MAX_POINT_SIZE
+
+
+def test_zoom_level_is_remembered_per_document(qapp, tmp_path):
+    settings = QSettings(str(tmp_path / "settings.ini"), QSettings.Format.IniFormat)
+    browser = _browser("<p>text</p>")
+    zoom = ZoomController(browser, settings)
+    zoom.prepare_document(browser.document(), "/docs/a.md")
+    zoom.zoom_by(3)
+    assert browser.document().defaultFont().pointSize() == DEFAULT_POINT_SIZE + 3
+
+    # Another document opens at its own level
+    other = QTextDocument(browser)
+    zoom.prepare_document(other, "/docs/b.md")
+    assert other.defaultFont().pointSize() == DEFAULT_POINT_SIZE
+    assert zoom.point_size == DEFAULT_POINT_SIZE
+
+    # A new session reads the levels back
+    zoom = ZoomController(browser, QSettings(str(tmp_path / "settings.ini"),
+                                             QSettings.Format.IniFormat))
+    assert zoom.level_for("/docs/a.md") == DEFAULT_POINT_SIZE + 3
+    assert zoom.level_for("/docs/b.md") == DEFAULT_POINT_SIZE
+
+
+def test_heading_under_the_cursor_stays_in_place(qapp):
+    browser = _browser(_long_html())
+    document = browser.document()
+    layout = document.documentLayout()
+    scroll_bar = browser.verticalScrollBar()
+    zoom = ZoomController(browser, interval_ms=0)
+    zoom.prepare_document(document, None)
+
+    heading = _heading(document, 40)
+    scroll_bar.setValue(int(layout.blockBoundingRect(heading).top()) - 150)
+    before = layout.blockBoundingRect(heading).top() - scroll_bar.value()
+
+    # Ctrl+wheel over the paragraph below the heading
+    point = QPointF(50, before + 60)
+    event = QWheelEvent(point, browser.viewport().mapToGlobal(point), QPoint(), QPoint(0, 240),
+                        Qt.MouseButton.NoButton, Qt.KeyboardModifier.ControlModifier,
+                        Qt.ScrollPhase.NoScrollPhase, False)
+    qapp.sendEvent(browser.viewport(), event)
+    assert document.defaultFont().pointSize() == DEFAULT_POINT_SIZE + 2
+    assert layout.blockBoundingRect(heading).top() - scroll_bar.value() == before
+
+    # From the keyboard, the heading at the top of the view is kept
+    time.sleep(0.01)
+    qapp.processEvents()
+    top = _heading(document, 20)
+    scroll_bar.setValue(int(layout.blockBoundingRect(top).top()) - 5)
+    zoom.zoom_by(-4)
+    assert layout.blockBoundingRect(top).top() - scroll_bar.value() == 5
@@ -0,0 +1,243 @@
+"""
+Headless batch rendering for MDviewer.
+
+``python main.py --render PATH... [-o OUTDIR]`` converts markdown files, or
+whole directory trees of them, to standalone HTML pages using the same
+MarkdownRenderer output and theme CSS as the viewer. Files are rendered in
+parallel on a ProcessPoolExecutor, and a manifest of content hashes lets
+repeated runs skip files that have not changed since they were last written.
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from version import get_semver
+
+from .document_loader import load_document
+from .markdown_renderer import MarkdownRenderer
+
+
+MARKDOWN_EXTENSIONS = (".md", ".markdown")
+MANIFEST_NAME = ".mdviewer-render.json"
+MANIFEST_VERSION = 1
+
+_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+{css}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+# Per-process renderer, created once by _init_worker
+_renderer = None
+
+
+def find_markdown_files(paths):
+    """Expand files and directories into (source, root) pairs.
+
+    ``root`` is the directory the output path is made relative to: the
+    directory itself for directory arguments, the parent for file arguments.
+    """
+    found = []
+    for path in paths:
+        path = os.path.abspath(path)
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+                for name in sorted(filenames):
+                    if name.lower().endswith(MARKDOWN_EXTENSIONS):
+                        found.append((os.path.join(dirpath, name), path))
+        elif os.path.isfile(path):
+            found.append((path, os.path.dirname(path)))
+        else:
+            raise FileNotFoundError(path)
+    return found
+
+
+def output_path(source, root, output_dir):
+    """Return where the HTML for source goes: mirrored under output_dir, or beside it."""
+    base = os.path.splitext(source)[0] + ".html"
+    if output_dir is None:
+        return base
+    return os.path.join(os.path.abspath(output_dir), os.path.relpath(base, root))
+
+
+def file_digest(path):
+    """Return the SHA-1 of a file's bytes."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def settings_fingerprint(theme, hide_paragraph_marks):
+    """Identify the render settings; a change invalidates every manifest entry."""
+    return f"{get_semver()}:{theme}:{int(bool(hide_paragraph_marks))}"
+
+
+def load_manifest(path, fingerprint):
+    """Return {source: {"hash", "output"}} from a manifest written with fingerprint."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if (manifest.get("version") != MANIFEST_VERSION
+            or manifest.get("settings") != fingerprint):
+        return {}
+    return manifest.get("files", {})
+
+
+def save_manifest(path, fingerprint, files):
+    """Write the manifest atomically, so an interrupted run leaves the old one."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"version": MANIFEST_VERSION, "settings": fingerprint, "files": files},
+            f, indent=1, sort_keys=True,
+        )
+    os.replace(tmp_path, path)
+
+
+def render_page(renderer, source):
+    """Render one markdown file to a standalone HTML page."""
+    text = load_document(source).text
+    result = renderer.render_document(text, file_path=source)
+    title = html.escape(os.path.splitext(os.path.basename(source))[0])
+    return _PAGE_TEMPLATE.format(title=title, css=result.css, body=result.body_html)
+
+
+def _init_worker(theme, hide_paragraph_marks):
+    global _renderer
+    _renderer = MarkdownRenderer(theme=theme)
+    _renderer.hide_paragraph_marks = hide_paragraph_marks
+
+
+def _render_job(job):
+    """Render job = (source, dest); returns (source, error message or None)."""
+    source, dest = job
+    try:
+        page = render_page(_renderer, source)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        with open(dest, "w", encoding="utf-8") as f:
+            f.write(page)
+    except Exception as e:
+        return source, str(e)
+    return source, None
+
+
+def render_tree(paths, output_dir=None, theme="dark", hide_paragraph_marks=False,
+                jobs=None, manifest_path=None, force=False, log=print):
+    """Render every markdown file under paths; returns a summary dict.
+
+    Files whose content hash and output file match the manifest are skipped
+    unless force is set. With ``jobs=1`` everything runs in this process.
+    """
+    start = time.perf_counter()
+    if manifest_path is None:
+        manifest_path = os.path.join(os.path.abspath(output_dir or "."), MANIFEST_NAME)
+    fingerprint = settings_fingerprint(theme, hide_paragraph_marks)
+    manifest = {} if force else load_manifest(manifest_path, fingerprint)
+
+    pending = []
+    hashes = {}
+    skipped = 0
+    for source, root in find_markdown_files(paths):
+        dest = output_path(source, root, output_dir)
+        digest = file_digest(source)
+        entry = manifest.get(source)
+        if (entry and entry.get("hash") == digest and entry.get("output") == dest
+                and os.path.exists(dest)):
+            skipped += 1
+            continue
+        hashes[source] = digest
+        pending.append((source, dest))
+
+    failed = []
+    if jobs == 1 or len(pending) <= 1:
+        _init_worker(theme, hide_paragraph_marks)
+        results = map(_render_job, pending)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker,
+            initargs=(theme, hide_paragraph_marks),
+        )
+        chunksize = max(1, len(pending) // ((jobs or os.cpu_count() or 1) * 8))
+        results = executor.map(_render_job, pending, chunksize=chunksize)
+    try:
+        destinations = dict(pending)
+        for source, error in results:
+            if error is None:
+                manifest[source] = {"hash": hashes[source], "output": destinations[source]}
+            else:
+                manifest.pop(source, None)
+                failed.append(source)
+                log(f"error: {source}: {error}")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    save_manifest(manifest_path, fingerprint, manifest)
+
+    elapsed = time.perf_counter() - start
+    rendered = len(pending) - len(failed)
+    return {
+        "rendered": rendered,
+        "skipped": skipped,
+        "failed": failed,
+        "seconds": elapsed,
+        "files_per_second": rendered / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main(argv=None):
+    """Entry point for ``main.py --render``; returns the process exit code."""
+    parser = argparse.ArgumentParser(
+        prog="main.py --render",
+        description="Render markdown files or directories to standalone HTML.",
+    )
+    parser.add_argument("paths", nargs="+", help="markdown files or directories")
+    parser.add_argument("-o", "--output", help="output directory (default: beside each file)")
+    parser.add_argument("--theme", default="dark", help="content theme (default: dark)")
+    parser.add_argument("--hide-paragraph-marks", action="store_true",
+                        help="render without paragraph marks")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--manifest", help=f"manifest path (default: OUTPUT/{MANIFEST_NAME})")
+    parser.add_argument("--force", action="store_true", help="re-render unchanged files")
+    args = parser.parse_args(argv)
+
+    try:
+        summary = render_tree(
+            args.paths, output_dir=args.output, theme=args.theme,
+            hide_paragraph_marks=args.hide_paragraph_marks, jobs=args.jobs,
+            manifest_path=args.manifest, force=args.force,
+            log=lambda message: print(message, file=sys.stderr),
+        )
+    except FileNotFoundError as e:
+        print(f"error: no such file or directory: {e}", file=sys.stderr)
+        return 2
+
+    print(
+        f"Rendered {summary['rendered']} file(s), {summary['skipped']} unchanged, "
+        f"{len(summary['failed'])} failed in {summary['seconds']:.2f}s "
+        f"({summary['files_per_second']:.1f} files/sec)"
+    )
+    return 1 if summary["failed"] else 0
@@ -0,0 +1,257 @@
+"""
+Block-level incremental rendering for MDviewer.
+
+A document is split into top-level markdown blocks (headings, fenced code,
+tables, paragraphs, whole lists and blockquotes). Each block is converted on
+its own and its HTML cached by hash, so re-rendering an edited document only
+converts the blocks that changed. Every block is preceded by a named anchor
+derived from its final HTML, which lets the main window locate unchanged
+blocks in the QTextDocument and patch only the edited range.
+"""
+
+import bisect
+import hashlib
+import re
+
+from markdown.extensions.attr_list import get_attrs_and_remainder
+
+from .markdown_renderer import FencedCodePreprocessor, RenderResult
+from .render_cache import RenderCache, content_hash
+
+
+BLOCK_ANCHOR_PREFIX = "mdv-block-"
+
+# Python-Markdown's default tab width, used when it normalizes whitespace
+_TAB_LENGTH = 4
+_LIST_ITEM_RE = re.compile(r"^(?:[*+-]|\d+[.)])[ \t]")
+# Lines Python-Markdown turns into a heading wherever they are in a chunk
+# (HashHeaderProcessor), and setext underlines, which end a chunk's heading
+_ATX_HEADING_RE = re.compile(r"^#{1,6}")
+_SETEXT_UNDERLINE_RE = re.compile(r"^[=-]+[ ]*$")
+
+# Constructs whose meaning depends on text outside their own block: reference
+# link definitions, abbreviations, the [TOC] marker and raw HTML blocks.
+# Documents using them are rendered as a whole.
+_NON_LOCAL_RE = re.compile(
+    r"^[ ]{0,3}(?:\[[^\]]+\]:|\*\[[^\]]+\]:|\[TOC\]|<[A-Za-z!/])", re.MULTILINE
+)
+
+_HEADING_ID_RE = re.compile(r'<h[1-6] id="([^"]*)"')
+_ID_COUNT_RE = re.compile(r"^(.*)_([0-9]+)$")
+
+
+def can_split(text):
+    """Return True if the document can be rendered block by block."""
+    return _NON_LOCAL_RE.search(text) is None
+
+
+def split_blocks(text):
+    """Split markdown source into independently renderable top-level blocks.
+
+    Chunks are separated by blank lines outside fenced code. A chunk that is
+    indented, or that continues a list or blockquote, is merged into the
+    previous block so lists and nested content stay in one piece; a list or
+    blockquote that follows a heading in the same chunk is continued too.
+    Each block is the exact source text it spans, blank lines included, so
+    it converts the same as in a whole-document render.
+    """
+    lines = text.split("\n")
+    in_fence = _fenced_lines(lines)
+
+    # (first, last) line of each run of non-blank lines outside fences
+    chunks = []
+    start = None
+    for number, line in enumerate(lines):
+        if line.strip() or in_fence[number]:
+            if start is None:
+                start = number
+        elif start is not None:
+            chunks.append((start, number - 1))
+            start = None
+    if start is not None:
+        chunks.append((start, len(lines) - 1))
+
+    spans = []
+    # First line of the top-level construct the last span ends with
+    tail = None
+    for first, last in chunks:
+        if spans and _continues_previous(lines[tail], lines[first]):
+            spans[-1] = (spans[-1][0], last)
+            if lines[first][0] in " \t":
+                # Nested content: the list or blockquote goes on
+                continue
+        else:
+            spans.append((first, last))
+        tail = _construct_start(lines, in_fence, first, last)
+    return ["\n".join(lines[first:last + 1]) for first, last in spans]
+
+
+def _construct_start(lines, in_fence, first, last):
+    """Return the line where the last top-level construct of a chunk starts.
+
+    Python-Markdown splits a chunk after a heading line and parses the rest
+    as a block of its own, so a list can start right below a heading.
+    """
+    start = first
+    if first < last and _SETEXT_UNDERLINE_RE.match(lines[first + 1]) and not in_fence[first]:
+        start = min(first + 2, last)
+    for number in range(last, start - 1, -1):
+        if not in_fence[number] and _ATX_HEADING_RE.match(lines[number]):
+            return min(number + 1, last)
+    return start
+
+
+def _fenced_lines(lines):
+    """Return a flag per line telling whether it is part of a fenced code block.
+
+    Fences are found with the same pattern, on the same whitespace-normalized
+    text, as FencedCodePreprocessor, so an unclosed or mismatched fence is
+    treated exactly as a whole-document render treats it.
+    """
+    normalized = ["" if not line.strip() else line.expandtabs(_TAB_LENGTH) for line in lines]
+    text = "\n".join(normalized)
+    line_starts = []
+    offset = 0
+    for line in normalized:
+        line_starts.append(offset)
+        offset += len(line) + 1
+
+    in_fence = [False] * len(lines)
+    pattern = FencedCodePreprocessor.FENCED_BLOCK_RE
+    index = 0
+    while True:
+        m = pattern.search(text, index)
+        if not m:
+            break
+        if m.group("attrs") and get_attrs_and_remainder(m.group("attrs"))[1]:
+            # Unbalanced braces: not a fence, as in FencedCodePreprocessor.run()
+            index = m.end("attrs")
+            continue
+        first = bisect.bisect_right(line_starts, m.start()) - 1
+        last = bisect.bisect_right(line_starts, m.end() - 1) - 1
+        for number in range(first, last + 1):
+            in_fence[number] = True
+        index = m.end()
+    return in_fence
+
+
+def _continues_previous(previous, chunk):
+    """Return True if chunk belongs to the same top-level block as previous.
+
+    Only the first line of each is looked at.
+    """
+    if chunk[0] in " \t":
+        return True
+    if _LIST_ITEM_RE.match(chunk) and _LIST_ITEM_RE.match(previous):
+        return True
+    if chunk.startswith(">") and previous.startswith(">"):
+        return True
+    return False
+
+
+def _next_unique_id(heading_id):
+    """Return the next candidate id the way the toc extension numbers them."""
+    match = _ID_COUNT_RE.match(heading_id)
+    if match:
+        return f"{match.group(1)}_{int(match.group(2)) + 1}"
+    return f"{heading_id}_1"
+
+
+def _dedupe_heading_ids(html, seen_ids):
+    """Rename heading ids already used by earlier blocks, as toc would."""
+    for heading_id in _HEADING_ID_RE.findall(html):
+        unique = heading_id
+        while unique in seen_ids:
+            unique = _next_unique_id(unique)
+        seen_ids.add(unique)
+        if unique != heading_id:
+            html = html.replace(f'id="{heading_id}"', f'id="{unique}"', 1)
+            html = html.replace(f'href="#{heading_id}"', f'href="#{unique}"', 1)
+    return html
+
+
+def anchor_positions(doc, prefix=BLOCK_ANCHOR_PREFIX):
+    """Map each anchor name in a QTextDocument starting with prefix to its block position.
+
+    Empty ``<a name>`` anchors end up either in the block's char format or in
+    the format of the block's first fragment, so both are checked.
+    """
+    positions = {}
+    block = doc.begin()
+    while block.isValid():
+        names = list(block.charFormat().anchorNames())
+        it = block.begin()
+        while not it.atEnd():
+            names.extend(it.fragment().charFormat().anchorNames())
+            it += 1
+        for name in names:
+            if name.startswith(prefix):
+                positions.setdefault(name, block.position())
+        block = block.next()
+    return positions
+
+
+class BlockRenderer:
+    """Renders documents block by block, reusing cached HTML for unchanged blocks.
+
+    The block cache is a RenderCache, so it is size-bounded and safe to share
+    between render worker threads.
+    """
+
+    def __init__(self, renderer, cache=None):
+        self.renderer = renderer
+        self.cache = cache if cache is not None else RenderCache(32 * 1024 * 1024)
+
+    def render_block(self, source, hide_paragraph_marks, file_path):
+        """Return (html, copy_buffer) for one block, from the cache when possible."""
+        key = (content_hash(source), bool(hide_paragraph_marks), file_path)
+        cached = self.cache.get(key)
+        if cached is None:
+            html, block_copies = self.renderer.convert_body(
+                source + "\n", hide_paragraph_marks, file_path
+            )
+            cached = (html, block_copies)
+            size = len(html) + sum(len(t) for t in block_copies.values())
+            self.cache.put(key, cached, size)
+        return cached
+
+    def render_document(self, text, hide_paragraph_marks, file_path):
+        """Render a document into a RenderResult with ``blocks`` filled in.
+
+        Returns None when the document uses constructs that span blocks; the
+        caller should then render it as a whole.
+        """
+        if not can_split(text):
+            return None
+
+        copy_buffer = {}
+        blocks = []
+        seen_ids = set()
+        anchor_counts = {}
+
+        for source in split_blocks(text):
+            html, block_copies = self.render_block(
+                source, hide_paragraph_marks, file_path
+            )
+            copy_buffer.update(block_copies)
+            html = _dedupe_heading_ids(html, seen_ids)
+
+            # Anchor names follow the final HTML, so any change to a block
+            # (including a renamed heading id) gives it a new name
+            digest = hashlib.sha1(html.encode("utf-8")).hexdigest()[:16]
+            occurrence = anchor_counts.get(digest, 0)
+            anchor_counts[digest] = occurrence + 1
+            name = f"{BLOCK_ANCHOR_PREFIX}{digest}-{occurrence}"
+            blocks.append((name, f'<a name="{name}"></a>{html}'))
+
+        body_html = self.renderer.wrap_body(
+            "\n".join(html for _, html in blocks), hide_paragraph_marks
+        )
+        return RenderResult(
+            body_html=body_html,
+            css=self.renderer.get_theme_css(
+                self.renderer.current_theme, hide_paragraph_marks
+            ),
+            copy_buffer=copy_buffer,
+            blocks=blocks,
+        )
@@ -0,0 +1,293 @@
+"""
+Chunked viewing of very large markdown documents.
+
+Above LAZY_THRESHOLD_BYTES a document is not rendered as a whole. It is split
+into sections of bounded size, cut at headings where possible, and only a
+small window of sections around the viewport is rendered and laid out in the
+QTextBrowser; the window moves as the user scrolls. Heading anchors are computed for the whole document up
+front, so links to any heading still work: the window is moved to the
+heading's section before scrolling to it.
+"""
+
+import html
+import re
+
+from markdown.extensions.toc import slugify, unique
+from PyQt6.QtCore import QObject
+
+from .block_renderer import _fenced_lines, anchor_positions, can_split, split_blocks
+from .profiler import activate as activate_profile, stage as profile_stage
+
+
+# Documents at least this large (in characters) are shown in chunks
+LAZY_THRESHOLD_BYTES = 4 * 1024 * 1024
+# Sections are cut at the first heading after SECTION_MIN_BYTES, or at any
+# block boundary once they reach SECTION_MAX_BYTES
+SECTION_MIN_BYTES = 16 * 1024
+SECTION_MAX_BYTES = 64 * 1024
+# Number of sections laid out in the browser at any time
+MAX_LOADED_SECTIONS = 5
+
+SECTION_ANCHOR_PREFIX = "mdv-section-"
+
+_ATX_HEADING_RE = re.compile(r"^#{1,6}[ \t]+(.*?)(?:[ \t]+#+)?[ \t]*$")
+_SETEXT_UNDERLINE_RE = re.compile(r"^(?:=+|-+)[ \t]*$")
+_INLINE_LINK_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+_INLINE_TAG_RE = re.compile(r"<[^>]+>")
+_EMPHASIS_RE = re.compile(r"[*`]|(?<!\w)_+|_+(?!\w)")
+_HEADING_ID_RE = re.compile(r'(<h[1-6] id=")([^"]*)(")')
+
+
+def should_chunk(text):
+    """Return True if text is large enough, and simple enough, to show in chunks."""
+    return len(text) >= LAZY_THRESHOLD_BYTES and can_split(text)
+
+
+def _heading_texts(source):
+    """Return the raw text of every heading in a block, in document order."""
+    texts = []
+    lines = source.split("\n")
+    in_fence = _fenced_lines(lines)
+    for index, line in enumerate(lines):
+        if in_fence[index] or line.startswith(("    ", "\t")):
+            continue
+        match = _ATX_HEADING_RE.match(line)
+        if match:
+            texts.append(match.group(1))
+        elif (index + 1 < len(lines) and line.strip() and not in_fence[index + 1]
+              and _SETEXT_UNDERLINE_RE.match(lines[index + 1])
+              and not _SETEXT_UNDERLINE_RE.match(line)):
+            texts.append(line.strip())
+    return texts
+
+
+def _starts_with_heading(source):
+    """Return True if a block opens with an ATX or setext heading."""
+    lines = source.split("\n", 2)
+    if _ATX_HEADING_RE.match(lines[0]):
+        return True
+    if len(lines) < 2 or _SETEXT_UNDERLINE_RE.match(lines[0]):
+        return False
+    return bool(_SETEXT_UNDERLINE_RE.match(lines[1]))
+
+
+def _heading_slug(text):
+    """Approximate the id the toc extension gives a heading, from its source."""
+    text = _INLINE_LINK_RE.sub(r"\1", text)
+    text = _INLINE_TAG_RE.sub("", text)
+    text = _EMPHASIS_RE.sub("", text)
+    return slugify(html.unescape(text), "-")
+
+
+class ChunkedDocument:
+    """A large markdown document split into independently rendered sections.
+
+    Splitting and heading indexing are plain string work and are done once,
+    on the render worker. Sections are rendered on demand through the
+    BlockRenderer, whose size-bounded block cache keeps recently shown
+    sections cheap to show again.
+    """
+
+    def __init__(self, text, block_renderer, hide_paragraph_marks, file_path):
+        self.block_renderer = block_renderer
+        self.hide_paragraph_marks = hide_paragraph_marks
+        self.file_path = file_path
+
+        self._blocks = split_blocks(text)
+        # Section i covers blocks [_section_starts[i], _section_starts[i + 1])
+        self._section_starts = []
+        # Heading ids per block index, for blocks that contain headings
+        self._heading_ids = {}
+        # Heading id -> index of the section that contains it
+        self.anchor_sections = {}
+
+        used_ids = set()
+        section_size = 0
+        for index, source in enumerate(self._blocks):
+            texts = _heading_texts(source)
+            if (not self._section_starts
+                    or section_size >= SECTION_MAX_BYTES
+                    or (section_size >= SECTION_MIN_BYTES and _starts_with_heading(source))):
+                self._section_starts.append(index)
+                section_size = 0
+            section_size += len(source)
+
+            if texts:
+                ids = [unique(_heading_slug(t), used_ids) for t in texts]
+                self._heading_ids[index] = ids
+                for heading_id in ids:
+                    self.anchor_sections[heading_id] = len(self._section_starts) - 1
+
+    @property
+    def section_count(self):
+        return len(self._section_starts)
+
+    def section_for_anchor(self, anchor):
+        """Return the index of the section holding the heading anchor, or None."""
+        return self.anchor_sections.get(anchor)
+
+    def render_section(self, index):
+        """Return (html, copy_buffer) for one section, starting with its anchor."""
+        start = self._section_starts[index]
+        end = (self._section_starts[index + 1]
+               if index + 1 < len(self._section_starts) else len(self._blocks))
+
+        parts = [f'<a name="{SECTION_ANCHOR_PREFIX}{index}"></a>']
+        copy_buffer = {}
+        for block_index in range(start, end):
+            block_html, block_copies = self.block_renderer.render_block(
+                self._blocks[block_index], self.hide_paragraph_marks, self.file_path
+            )
+            ids = self._heading_ids.get(block_index)
+            if ids:
+                block_html = self._apply_heading_ids(block_html, ids)
+            parts.append(block_html)
+            copy_buffer.update(block_copies)
+        return "\n".join(parts), copy_buffer
+
+    @staticmethod
+    def _apply_heading_ids(block_html, ids):
+        # Give headings their document-wide ids instead of per-block ones, so
+        # the anchors match anchor_sections and stay unique across sections
+        rendered = _HEADING_ID_RE.findall(block_html)
+        if len(rendered) != len(ids):
+            return block_html
+        for (_, old_id, _), new_id in zip(rendered, ids):
+            if old_id != new_id:
+                block_html = block_html.replace(f'id="{old_id}"', f'id="{new_id}"', 1)
+                block_html = block_html.replace(f'href="#{old_id}"', f'href="#{new_id}"', 1)
+        return block_html
+
+
+class ChunkedView(QObject):
+    """Keeps a sliding window of a ChunkedDocument's sections in a QTextBrowser.
+
+    When the user scrolls near either end of the window the next section is
+    loaded and the one furthest away is dropped, so at most
+    MAX_LOADED_SECTIONS sections are ever laid out. The window is rebuilt
+    with setHtml() and the scroll position is carried over relative to the
+    section at the top of the viewport, so content does not jump.
+    """
+
+    def __init__(self, browser, document, wrap_body, copy_buffer, profiler=None, parent=None):
+        super().__init__(parent)
+        self.browser = browser
+        self.document = document
+        self._wrap_body = wrap_body
+        # Shared with the renderer so Copy links of loaded sections work
+        self._copy_buffer = copy_buffer
+        # Loaded section index -> copy ids it added to the copy buffer
+        self._section_copies = {}
+        # RenderProfiler that window slides are reported to, if any
+        self.profiler = profiler
+        self.first = 0
+        self.last = 0
+        self._updating = False
+        self.browser.verticalScrollBar().valueChanged.connect(self._on_scroll)
+
+    def detach(self):
+        """Stop following the browser's scroll bar."""
+        self.browser.verticalScrollBar().valueChanged.disconnect(self._on_scroll)
+
+    def show_section(self, index, anchor=None):
+        """Load a window starting around section index and scroll to it."""
+        index = max(0, min(index, self.document.section_count - 1))
+        first = max(0, index - 1)
+        last = min(self.document.section_count, first + MAX_LOADED_SECTIONS - 1)
+        self._load(first, last)
+        self.browser.scrollToAnchor(anchor or f"{SECTION_ANCHOR_PREFIX}{index}")
+
+    def show_anchor(self, anchor):
+        """Scroll to a heading anchor, loading its section first. Returns False if unknown."""
+        index = self.document.section_for_anchor(anchor)
+        if index is None:
+            return False
+        if self.first <= index < self.last:
+            self.browser.scrollToAnchor(anchor)
+        else:
+            self.show_section(index, anchor)
+        return True
+
+    def top_section(self):
+        """Return the index of the section at the top of the viewport."""
+        return self._top_position()[0]
+
+    def _load(self, first, last):
+        parts = []
+        section_copies = {}
+        for index in range(first, last):
+            section_html, copies = self.document.render_section(index)
+            parts.append(section_html)
+            self._copy_buffer.update(copies)
+            section_copies[index] = set(copies)
+        # Drop the Copy texts of sections that left the window, so the buffer
+        # stays as bounded as the window (an id can recur in a loaded section)
+        loaded_ids = set().union(*section_copies.values())
+        for index, copy_ids in self._section_copies.items():
+            if index not in section_copies:
+                for copy_id in copy_ids - loaded_ids:
+                    self._copy_buffer.pop(copy_id, None)
+        self._section_copies = section_copies
+        self._updating = True
+        try:
+            with profile_stage("layout"):
+                self.browser.setHtml(
+                    self._wrap_body("\n".join(parts), self.document.hide_paragraph_marks)
+                )
+        finally:
+            self._updating = False
+        self.first, self.last = first, last
+
+    def _section_tops(self):
+        """Map loaded section index -> y coordinate of its top in the document."""
+        doc = self.browser.document()
+        layout = doc.documentLayout()
+        tops = {}
+        for name, position in anchor_positions(doc, SECTION_ANCHOR_PREFIX).items():
+            block = doc.findBlock(position)
+            tops[int(name[len(SECTION_ANCHOR_PREFIX):])] = layout.blockBoundingRect(block).top()
+        return tops
+
+    def _top_position(self):
+        """Return (section index, offset in pixels) of the viewport's top edge."""
+        value = self.browser.verticalScrollBar().value()
+        best = (self.first, value)
+        for index, top in sorted(self._section_tops().items()):
+            if top <= value:
+                best = (index, value - top)
+        return best
+
+    def reload(self):
+        """Re-render the loaded window (e.g. after a theme change) in place."""
+        self._load_keeping_position(self.first, self.last)
+
+    def _load_keeping_position(self, first, last):
+        section, offset = self._top_position()
+        self._load(first, last)
+        top = self._section_tops().get(section, 0)
+        self._updating = True
+        try:
+            self.browser.verticalScrollBar().setValue(int(top + offset))
+        finally:
+            self._updating = False
+
+    def _on_scroll(self, value):
+        if self._updating:
+            return
+        scroll_bar = self.browser.verticalScrollBar()
+        count = self.document.section_count
+        if value >= scroll_bar.maximum() - scroll_bar.pageStep() and self.last < count:
+            first, last = self.first, self.last + 1
+            if last - first > MAX_LOADED_SECTIONS:
+                first += 1
+        elif value <= scroll_bar.pageStep() and self.first > 0:
+            first, last = self.first - 1, self.last
+            if last - first > MAX_LOADED_SECTIONS:
+                last -= 1
+        else:
+            return
+        cycle = self.profiler.new_cycle("section window") if self.profiler else None
+        with activate_profile(cycle):
+            self._load_keeping_position(first, last)
+        if cycle is not None:
+            self.profiler.finish(cycle)
@@ -0,0 +1,156 @@
+"""
+Document loading for MDviewer.
+
+One place that turns a file on disk into text: the encoding is taken from a
+byte-order mark when there is one and is UTF-8 otherwise, large files are
+memory-mapped instead of copied into a read buffer, and line/word/character
+statistics can be computed in a single streaming pass without holding the
+decoded document in memory.
+"""
+
+import codecs
+import mmap
+import os
+from dataclasses import dataclass
+
+
+# Files at least this large are memory-mapped rather than read into a buffer
+MMAP_THRESHOLD_BYTES = 8 * 1024 * 1024
+# Size of the slices decoded at a time when streaming
+CHUNK_BYTES = 1024 * 1024
+# Used when a file without a BOM is not valid UTF-8
+FALLBACK_ENCODING = "cp1252"
+
+# Longest BOMs first, so UTF-32 LE is not mistaken for UTF-16 LE
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+
+@dataclass
+class DocumentStats:
+    """Line, word and character counts of a document."""
+
+    lines: int = 0
+    words: int = 0
+    chars: int = 0
+
+
+@dataclass
+class LoadedDocument:
+    """Decoded document text and how it was decoded."""
+
+    text: str
+    encoding: str
+    size: int
+
+
+def detect_encoding(head):
+    """Return (encoding, BOM length) for a file starting with the bytes head."""
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding, len(bom)
+    return "utf-8", 0
+
+
+def _map_or_read(f, size):
+    """Return a buffer over the whole file: an mmap for large files, bytes otherwise."""
+    if size >= MMAP_THRESHOLD_BYTES:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return f.read()
+
+
+def _iter_decoded(data, encoding, start, errors="strict"):
+    """Decode data[start:] slice by slice, yielding text chunks."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+    view = memoryview(data)
+    try:
+        for offset in range(start, len(data), CHUNK_BYTES):
+            yield decoder.decode(view[offset:offset + CHUNK_BYTES])
+        yield decoder.decode(b"", final=True)
+    finally:
+        view.release()
+
+
+def _decode(data):
+    """Decode a whole buffer; returns (text, encoding).
+
+    Files with a BOM are decoded once with the BOM's encoding. Files without
+    one are decoded as UTF-8 and, only if that fails, once more with
+    FALLBACK_ENCODING.
+    """
+    encoding, start = detect_encoding(bytes(data[:4]))
+    try:
+        return "".join(_iter_decoded(data, encoding, start)), encoding
+    except UnicodeDecodeError:
+        if start:
+            raise
+    return "".join(_iter_decoded(data, FALLBACK_ENCODING, 0, "replace")), FALLBACK_ENCODING
+
+
+def load_document(file_path):
+    """Read and decode a document, memory-mapping it if it is large."""
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return LoadedDocument(text="", encoding="utf-8", size=0)
+        data = _map_or_read(f, size)
+        try:
+            text, encoding = _decode(data)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+    return LoadedDocument(text=text, encoding=encoding, size=size)
+
+
+def document_stats(file_path):
+    """Count lines, words and characters of a file in one streaming pass.
+
+    Only one decoded chunk is alive at a time, so the memory used does not
+    grow with the file. Returns (DocumentStats, encoding); the encoding is
+    chosen the same way load_document() chooses it.
+    """
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return DocumentStats(), "utf-8"
+        data = _map_or_read(f, size)
+        try:
+            encoding, start = detect_encoding(bytes(data[:4]))
+            try:
+                # BOM-marked files count undecodable bytes as U+FFFD, like
+                # errors="replace"; unmarked ones fall back below instead
+                errors = "replace" if start else "strict"
+                return _count(_iter_decoded(data, encoding, start, errors)), encoding
+            except UnicodeDecodeError:
+                chunks = _iter_decoded(data, FALLBACK_ENCODING, 0, "replace")
+                return _count(chunks), FALLBACK_ENCODING
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+
+def _count(chunks):
+    """Accumulate DocumentStats over an iterable of text chunks."""
+    stats = DocumentStats()
+    in_word = False
+    last_char = ""
+    for chunk in chunks:
+        if not chunk:
+            continue
+        stats.chars += len(chunk)
+        stats.lines += chunk.count("\n")
+        stats.words += len(chunk.split())
+        # A word running across the chunk boundary was counted twice
+        if in_word and not chunk[0].isspace():
+            stats.words -= 1
+        last_char = chunk[-1]
+        in_word = not last_char.isspace()
+    # A last line without a trailing newline still counts
+    if last_char and last_char != "\n":
+        stats.lines += 1
+    return stats
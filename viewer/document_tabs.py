@@ -0,0 +1,107 @@
+"""
+Per-tab document state for MDviewer's tabbed interface.
+
+All tabs share the main window's QTextBrowser; each markdown tab owns the
+QTextDocument the browser shows while the tab is active, together with the
+compact render it was laid out from (body HTML and blocks, or the section
+index of a very large document) and the scroll position.
+
+Laid-out QTextDocuments are far larger than the HTML they come from, so a
+memory budget applies across tabs: once the estimated layout size of all
+tabs exceeds it, the documents of the least recently viewed tabs are
+dropped. Their compact render is kept, and the document is laid out again
+from it when the tab is next shown.
+"""
+
+import itertools
+import os
+
+
+# Rough memory cost of a laid-out QTextDocument per character (text, block
+# and format data, layout lines); measured around 40-50 bytes with the
+# default stylesheet
+LAYOUT_BYTES_PER_CHARACTER = 48
+# Estimated layout size all tabs together may keep in memory
+DEFAULT_LAYOUT_BUDGET_BYTES = 256 * 1024 * 1024
+
+_view_clock = itertools.count(1)
+
+
+class DocumentTab:
+    """State of one open document.
+
+    ``document`` is the tab's QTextDocument, or None while it has never been
+    laid out or was dropped to stay within the memory budget. A tab that
+    still ``needs_render`` only knows its file (restored from the previous
+    session, or rendered with other paragraph-mark settings) and is rendered
+    when it is shown.
+    """
+
+    def __init__(self, file_path=None):
+        self.file_path = file_path
+        self.document = None
+        self.body_html = None
+        self.blocks = None
+        # ChunkedDocument of a very large file, and the section shown at the top
+        self.chunked = None
+        self.chunk_section = 0
+        self.copy_buffer = {}
+        self.scroll_pos = 0
+        self.is_pdf = bool(file_path) and file_path.lower().endswith(".pdf")
+        # Paragraph-mark setting the compact render was made with
+        self.hide_paragraph_marks = None
+        self.needs_render = file_path is not None
+        # (mtime, size) of the file when it was rendered
+        self.signature = None
+        # Id of the render in flight for this tab, if any
+        self.request_id = None
+        # Heading id to scroll to once the document is displayed ("" = top)
+        self.anchor = None
+        self.last_viewed = 0
+
+    @property
+    def title(self):
+        return os.path.basename(self.file_path) if self.file_path else "Welcome"
+
+    def touch(self):
+        """Mark the tab as the most recently viewed."""
+        self.last_viewed = next(_view_clock)
+
+    def layout_cost(self):
+        """Estimated memory held by the tab's laid-out document, in bytes."""
+        if self.document is None:
+            return 0
+        return self.document.characterCount() * LAYOUT_BYTES_PER_CHARACTER
+
+    def has_render(self):
+        """True if the tab can be laid out again without rendering its file."""
+        return self.body_html is not None or self.chunked is not None
+
+    def drop_document(self):
+        """Release the laid-out document, keeping the compact render."""
+        if self.document is not None:
+            self.document.deleteLater()
+            self.document = None
+
+
+def enforce_layout_budget(tabs, active, budget=DEFAULT_LAYOUT_BUDGET_BYTES):
+    """Drop the documents of least recently viewed tabs until within budget.
+
+    The active tab is never touched, and tabs whose document could not be
+    laid out again from a compact render are skipped. Returns the tabs whose
+    document was dropped.
+    """
+    total = sum(tab.layout_cost() for tab in tabs)
+    dropped = []
+    candidates = sorted(
+        (tab for tab in tabs
+         if tab is not active and tab.document is not None and tab.has_render()),
+        key=lambda tab: tab.last_viewed,
+    )
+    for tab in candidates:
+        if total <= budget:
+            break
+        total -= tab.layout_cost()
+        tab.drop_document()
+        dropped.append(tab)
+    return dropped
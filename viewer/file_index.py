@@ -0,0 +1,755 @@
+"""
+Find in Files index for MDviewer.
+
+Each search root (one of the recent directories) gets a FileIndex: an
+inverted index over the words of every markdown file below it, stored on
+disk under $XDG_CACHE_HOME/mdviewer/search so it survives sessions. An
+IndexWorker brings the indexes up to date in the background, re-reading
+only files whose mtime or size changed since they were indexed, and a
+FileSearchWorker runs queries against them off the GUI thread.
+
+Every file is indexed as a stream of term ids split into heading sections.
+The postings of a term list the files it occurs in (as sorted file ids with
+occurrence counts), separately for all text and for headings only, so
+single-word queries and ranking never look at the files themselves.
+Phrases are matched by searching the term-id streams of the files that
+contain all of their words.
+
+Queries are words (all must occur), ``"quoted phrases"`` and prefixes
+ending in ``*``; files with the most heading hits come first. Each hit
+carries the anchor of its best matching section, computed the same way as
+the markdown toc extension computes heading ids.
+"""
+
+import hashlib
+import heapq
+import html
+import itertools
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import zlib
+from array import array
+from base64 import b64decode, b64encode
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from dataclasses import dataclass
+
+from markdown.extensions.toc import slugify, unique
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from .render_cache import default_cache_dir, renderer_fingerprint
+
+
+MARKDOWN_EXTENSIONS = (".md", ".markdown")
+# Directories never worth indexing (hidden directories are skipped as well)
+SKIPPED_DIRECTORIES = frozenset({"node_modules", "__pycache__", "site-packages"})
+# Files larger than this are not indexed
+MAX_FILE_BYTES = 8 * 1024 * 1024
+# Prefix queries match at most this many distinct words
+MAX_PREFIX_TERMS = 512
+# Bumped whenever the on-disk layout or the way files are parsed changes
+INDEX_FORMAT = 1
+
+_WORD_RE = re.compile(r"\w+")
+# Same rules as python-markdown's hash and setext header processors
+_ATX_RE = re.compile(r"^(#{1,6})(.*?)#*\s*$")
+_SETEXT_RE = re.compile(r"^[=-]+[ ]*$")
+_FENCE_RE = re.compile(r"^[ ]{0,3}(`{3,}|~{3,})")
+# Trailing attribute list of a heading, e.g. "Title {: #custom-id }"
+_ATTR_LIST_RE = re.compile(r"\s*\{:?([^}]*)\}\s*$")
+_ATTR_ID_RE = re.compile(r"(?:^|\s)#([^\s}]+)")
+_IMAGE_RE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_LINK_RE = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_TAG_RE = re.compile(r"<[^>]+>")
+_EMPHASIS_RE = re.compile(r"(?<!\w)[*_]+|[*_]+(?!\w)|`+")
+_QUERY_RE = re.compile(r'"([^"]*)"?|(\S+)')
+
+# Longest snippet shown for a hit, in characters
+SNIPPET_LENGTH = 160
+
+
+def default_index_dir():
+    """Return the directory for the Find in Files indexes, next to the render cache."""
+    return os.path.join(os.path.dirname(default_cache_dir()), "search")
+
+
+def _heading_text(raw):
+    """Return (visible text, explicit id or None) of a heading's markdown."""
+    explicit_id = None
+    attrs = _ATTR_LIST_RE.search(raw)
+    if attrs:
+        found = _ATTR_ID_RE.search(attrs.group(1))
+        explicit_id = found.group(1) if found else None
+        raw = raw[:attrs.start()]
+    text = _IMAGE_RE.sub("", raw)
+    text = _LINK_RE.sub(r"\1", text)
+    text = _TAG_RE.sub("", text)
+    text = _EMPHASIS_RE.sub("", text)
+    return html.unescape(text).strip(), explicit_id
+
+
+def parse_markdown(text):
+    """Split markdown text into index words and heading sections.
+
+    Returns (words, sections). words are the lower-cased words of the text
+    in document order. sections holds (anchor, title, start, heading_end,
+    line) for the text before the first heading (anchor "") and for every
+    heading: the heading's words are words[start:heading_end], its section
+    runs up to the next section's start, and it is on line ``line``.
+    Anchors are the ids the toc extension gives the rendered headings.
+    """
+    words = []
+    headings = []  # (title, explicit id, start, heading_end, line)
+    pending = []   # body lines not split into words yet
+
+    def flush():
+        if pending:
+            words.extend(_WORD_RE.findall("\n".join(pending).lower()))
+            pending.clear()
+
+    lines = text.splitlines()
+    fence = None
+    previous_blank = True
+    skip = False
+    for number, line in enumerate(lines):
+        if skip:
+            skip = False
+            previous_blank = False
+            continue
+        if fence is not None:
+            if line.strip().startswith(fence) and not line.strip().strip(fence[0]):
+                fence = None
+            pending.append(line)
+            continue
+        opening = _FENCE_RE.match(line)
+        if opening:
+            fence = opening.group(1)
+            pending.append(line)
+            previous_blank = False
+            continue
+
+        raw = None
+        if line.startswith("#"):
+            match = _ATX_RE.match(line)
+            if match:
+                raw = match.group(2)
+        elif (previous_blank and line.strip() and not line.startswith(("    ", "\t"))
+              and number + 1 < len(lines) and _SETEXT_RE.match(lines[number + 1])):
+            raw = line
+            skip = True
+        previous_blank = not line.strip()
+        if raw is None:
+            pending.append(line)
+            continue
+
+        flush()
+        title, explicit_id = _heading_text(raw)
+        start = len(words)
+        words.extend(_WORD_RE.findall(title.lower()))
+        headings.append((title, explicit_id, start, len(words), number))
+    flush()
+
+    # Like the toc extension: explicit ids are taken first, generated ones
+    # are made unique against them and each other in document order
+    used_ids = {explicit_id for _, explicit_id, _, _, _ in headings if explicit_id}
+    sections = [("", "", 0, 0, 0)]
+    for title, explicit_id, start, heading_end, number in headings:
+        anchor = explicit_id or unique(slugify(title, "-"), used_ids)
+        sections.append((anchor, title, start, heading_end, number))
+    return words, sections
+
+
+def parse_query(query):
+    """Split a query into clauses, each a tuple of (word, is_prefix) pairs.
+
+    Quoted text is a phrase; so is an unquoted piece holding several words
+    (``foo-bar``). A trailing ``*`` makes the last word of a piece a prefix.
+    """
+    clauses = []
+    for match in _QUERY_RE.finditer(query):
+        piece = match.group(1) if match.group(1) is not None else match.group(2)
+        words = _WORD_RE.findall(piece.lower())
+        if not words:
+            continue
+        prefix = piece.rstrip().endswith("*")
+        clauses.append(tuple(
+            (word, prefix and i == len(words) - 1) for i, word in enumerate(words)
+        ))
+    return clauses
+
+
+def search_roots(directories):
+    """Return the directories to index: existing ones not inside another one."""
+    roots = []
+    for directory in sorted({os.path.abspath(d) for d in directories if os.path.isdir(d)},
+                            key=len):
+        if not any(os.path.commonpath([directory, root]) == root for root in roots):
+            roots.append(directory)
+    return roots
+
+
+class _IndexedFile:
+    """One indexed file: its stat signature, term-id stream and sections."""
+
+    __slots__ = ("path", "mtime_ns", "size", "tokens", "sections")
+
+    def __init__(self, path, mtime_ns, size, tokens, sections):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.tokens = tokens  # term ids as native unsigned ints (array "I" bytes)
+        self.sections = sections
+
+    def token_ids(self):
+        return memoryview(self.tokens).cast("I")
+
+
+@dataclass
+class FileHit:
+    """A file matching a Find in Files query."""
+
+    path: str
+    heading_hits: int
+    hits: int
+    anchor: str = ""
+    section: str = ""
+    line: int = 0
+    snippet: str = ""
+
+
+class FileIndex:
+    """Persistent inverted index of the markdown files below one directory.
+
+    File ids are positions in ``_files`` and only ever grow while the index
+    is in memory (a re-indexed file gets a new id), so every postings array
+    stays sorted by appending; ``save()`` renumbers the files to close the
+    gaps. Access is guarded by a lock: the IndexWorker updates an index
+    file by file while searches may run on another thread.
+    """
+
+    SUFFIX = ".mdvi"
+
+    def __init__(self, root, directory=None):
+        self.root = os.path.abspath(root)
+        self.directory = directory or default_index_dir()
+        self.loaded = False
+        self._lock = threading.Lock()
+        self._files = []       # file id -> _IndexedFile, or None once removed
+        self._ids = {}         # path -> file id
+        self._terms = {}       # word -> term id, in id order
+        self._postings = {}    # term id -> (file ids, counts) arrays
+        self._headings = {}    # term id -> (file ids, counts) within headings
+        self._vocabulary = None  # sorted words, for prefix queries
+        self._dirty = False
+
+    @property
+    def path(self):
+        key = hashlib.sha1(self.root.encode("utf-8", "surrogatepass")).hexdigest()
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def __len__(self):
+        return len(self._ids)
+
+    # -- building --------------------------------------------------------
+
+    def scan(self):
+        """Yield (path, stat result) of every markdown file below the root."""
+        for directory, subdirectories, names in os.walk(self.root):
+            subdirectories[:] = sorted(
+                name for name in subdirectories
+                if not name.startswith(".") and name not in SKIPPED_DIRECTORIES
+            )
+            for name in sorted(names):
+                if not name.lower().endswith(MARKDOWN_EXTENSIONS):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                if st.st_size <= MAX_FILE_BYTES:
+                    yield path, st
+
+    def refresh(self, interrupted=None, progress=None):
+        """Bring the index up to date with the files on disk.
+
+        Files are only read when their mtime or size changed. ``progress`` is
+        called with the number of files checked every few hundred files, and
+        ``interrupted`` is polled as often; an interrupted refresh keeps the
+        files indexed so far. Returns True if anything changed.
+        """
+        seen = set()
+        changed = False
+        for count, (path, st) in enumerate(self.scan(), 1):
+            if count % 256 == 0:
+                if interrupted is not None and interrupted():
+                    return changed
+                if progress is not None:
+                    progress(count)
+            seen.add(path)
+            file_id = self._ids.get(path)
+            if file_id is not None:
+                entry = self._files[file_id]
+                if entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+                    continue
+            try:
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    words, sections = parse_markdown(f.read())
+            except OSError:
+                continue
+            with self._lock:
+                self._remove(path)
+                self._add(path, st.st_mtime_ns, st.st_size, words, sections)
+            changed = True
+
+        with self._lock:
+            for path in [path for path in self._ids if path not in seen]:
+                self._remove(path)
+                changed = True
+            if self._vocabulary is None:
+                self._vocabulary = sorted(self._terms)
+        return changed
+
+    def _add(self, path, mtime_ns, size, words, sections):
+        terms = self._terms
+        known = len(terms)
+        tokens = array("I", [terms.setdefault(word, len(terms)) for word in words])
+        if len(terms) != known:
+            self._vocabulary = None
+        file_id = len(self._files)
+        self._files.append(_IndexedFile(path, mtime_ns, size, tokens.tobytes(), sections))
+        self._ids[path] = file_id
+        self._post(self._postings, file_id, Counter(tokens))
+        self._dirty = True
+        heading_tokens = Counter()
+        for _, _, start, heading_end, _ in sections:
+            heading_tokens.update(tokens[start:heading_end])
+        self._post(self._headings, file_id, heading_tokens)
+
+    @staticmethod
+    def _post(postings, file_id, counts):
+        for term_id, count in counts.items():
+            posting = postings.get(term_id)
+            if posting is None:
+                posting = postings[term_id] = (array("I"), array("I"))
+            posting[0].append(file_id)
+            posting[1].append(count)
+
+    def _remove(self, path):
+        file_id = self._ids.pop(path, None)
+        if file_id is None:
+            return
+        entry = self._files[file_id]
+        self._files[file_id] = None
+        self._dirty = True
+        for term_id in set(entry.token_ids()):
+            for postings in (self._postings, self._headings):
+                posting = postings.get(term_id)
+                if posting is None:
+                    continue
+                i = bisect_left(posting[0], file_id)
+                if i < len(posting[0]) and posting[0][i] == file_id:
+                    del posting[0][i]
+                    del posting[1][i]
+
+    # -- persistence -----------------------------------------------------
+
+    def load(self):
+        """Read the stored index; a missing, stale or unreadable one leaves it empty."""
+        self.loaded = True
+        try:
+            with open(self.path, "rb") as f:
+                data = json.loads(zlib.decompress(f.read()).decode("utf-8", "surrogatepass"))
+            if (data["format"] != INDEX_FORMAT or data["root"] != self.root
+                    or data["fingerprint"] != renderer_fingerprint()
+                    or data["byteorder"] != sys.byteorder):
+                return False
+            files = [
+                _IndexedFile(os.path.join(self.root, relative), mtime_ns, size,
+                             b64decode(tokens), [tuple(section) for section in sections])
+                for relative, mtime_ns, size, tokens, sections in data["files"]
+            ]
+            terms = {word: term_id for term_id, word in enumerate(data["terms"])}
+            postings = [self._decode_postings(data[key]) for key in ("postings", "headings")]
+        except (OSError, ValueError, KeyError, TypeError, zlib.error):
+            return False
+        with self._lock:
+            self._files = files
+            self._ids = {entry.path: file_id for file_id, entry in enumerate(files)}
+            self._terms = terms
+            self._postings, self._headings = postings
+            self._vocabulary = sorted(terms)
+            self._dirty = False
+        return True
+
+    def save(self):
+        """Write the index to disk if it changed since it was loaded or saved."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._compact()
+            data = {
+                "format": INDEX_FORMAT,
+                "root": self.root,
+                "fingerprint": renderer_fingerprint(),
+                "byteorder": sys.byteorder,
+                "terms": list(self._terms),
+                "files": [
+                    [os.path.relpath(entry.path, self.root), entry.mtime_ns, entry.size,
+                     b64encode(entry.tokens).decode("ascii"), entry.sections]
+                    for entry in self._files
+                ],
+                "postings": self._encode_postings(self._postings),
+                "headings": self._encode_postings(self._headings),
+            }
+            self._dirty = False
+        payload = zlib.compress(json.dumps(data).encode("utf-8", "surrogatepass"), 1)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        except OSError:
+            pass
+
+    def _compact(self):
+        """Renumber the files so ids are contiguous again (lock held)."""
+        if len(self._ids) == len(self._files):
+            return
+        new_ids = array("I", bytes(4 * len(self._files)))
+        files = []
+        for file_id, entry in enumerate(self._files):
+            if entry is not None:
+                new_ids[file_id] = len(files)
+                files.append(entry)
+        for postings in (self._postings, self._headings):
+            for term_id, (file_ids, counts) in list(postings.items()):
+                if file_ids:
+                    postings[term_id] = (array("I", [new_ids[i] for i in file_ids]), counts)
+                else:
+                    del postings[term_id]
+        self._files = files
+        self._ids = {entry.path: file_id for file_id, entry in enumerate(files)}
+
+    @staticmethod
+    def _encode_postings(postings):
+        return [
+            [term_id, b64encode(file_ids.tobytes()).decode("ascii"),
+             b64encode(counts.tobytes()).decode("ascii")]
+            for term_id, (file_ids, counts) in postings.items() if file_ids
+        ]
+
+    @staticmethod
+    def _decode_postings(encoded):
+        postings = {}
+        for term_id, file_ids, counts in encoded:
+            posting = (array("I"), array("I"))
+            posting[0].frombytes(b64decode(file_ids))
+            posting[1].frombytes(b64decode(counts))
+            postings[term_id] = posting
+        return postings
+
+    # -- searching -------------------------------------------------------
+
+    def search(self, clauses, limit=200, interrupted=None):
+        """Return (best [FileHit] without anchors, number of files matching every clause)."""
+        with self._lock:
+            resolved = [self._resolve(clause) for clause in clauses]
+            if not resolved or not all(resolved):
+                return [], 0
+            matches = []
+            for clause in resolved:
+                match = self._match(clause, interrupted)
+                if match is None:
+                    return [], 0
+                matches.append(match)
+            if len(matches) == 1:
+                headings, hits = matches[0]
+            else:
+                file_ids = set(matches[0][1]).intersection(*(hits for _, hits in matches[1:]))
+                headings = dict.fromkeys(file_ids, 0)
+                hits = dict.fromkeys(file_ids, 0)
+                for clause_headings, clause_hits in matches:
+                    for file_id in file_ids:
+                        hits[file_id] += clause_hits[file_id]
+                    for file_id in clause_headings.keys() & file_ids:
+                        headings[file_id] += clause_headings[file_id]
+            files = self._files
+            best = heapq.nsmallest(limit, hits, key=lambda file_id: (
+                -headings.get(file_id, 0), -hits[file_id], files[file_id].path))
+            return [
+                FileHit(files[file_id].path, headings.get(file_id, 0), hits[file_id])
+                for file_id in best
+            ], len(hits)
+
+    def locate(self, hit, clauses):
+        """Fill in the best matching section and a snippet for a hit."""
+        with self._lock:
+            file_id = self._ids.get(hit.path)
+            if file_id is None:
+                return
+            entry = self._files[file_id]
+            resolved = [self._resolve(clause) for clause in clauses]
+            if not all(resolved):
+                return
+            sections = entry.sections
+            starts = [section[2] for section in sections]
+            scores = [[0, 0] for _ in sections]
+            for clause in resolved:
+                for position in self._positions(entry, clause):
+                    i = bisect_right(starts, position) - 1
+                    scores[i][1] += 1
+                    if position + len(clause) <= sections[i][3]:
+                        scores[i][0] += 1
+        best = max(range(len(sections)), key=lambda i: (scores[i], -i))
+        hit.anchor, hit.section, _, _, hit.line = sections[best]
+        end = sections[best + 1][4] if best + 1 < len(sections) else None
+        hit.snippet = _snippet(hit.path, hit.line, end, clauses, heading=best > 0)
+
+    def _resolve(self, clause):
+        """Return the term ids each word of a clause may be, or None if one has none."""
+        resolved = []
+        for word, prefix in clause:
+            if prefix:
+                vocabulary = self._vocabulary
+                if vocabulary is None:
+                    vocabulary = self._vocabulary = sorted(self._terms)
+                first = bisect_left(vocabulary, word)
+                term_ids = [
+                    self._terms[term]
+                    for term in vocabulary[first:first + MAX_PREFIX_TERMS]
+                    if term.startswith(word)
+                ]
+            else:
+                term_id = self._terms.get(word)
+                term_ids = [] if term_id is None else [term_id]
+            term_ids = [term_id for term_id in term_ids if self._postings.get(term_id, ((),))[0]]
+            if not term_ids:
+                return None
+            resolved.append(term_ids)
+        return resolved
+
+    def _match(self, clause, interrupted):
+        """Return ({file id: heading hits}, {file id: hits}) for one resolved clause."""
+        if len(clause) == 1:
+            return self._counts(self._headings, clause[0]), self._counts(self._postings, clause[0])
+
+        # Phrase: search the term-id streams of the files containing every
+        # word, once per combination of the words' alternatives
+        variants = 1
+        for term_ids in clause:
+            variants *= len(term_ids)
+        if variants > MAX_PREFIX_TERMS:
+            sequences = [None]
+        else:
+            sequences = list(itertools.product(*clause))
+        file_sets = {}
+        headings = {}
+        hits = {}
+        for sequence in sequences:
+            candidates = None
+            for term_ids in sorted(clause if sequence is None else [[t] for t in sequence],
+                                   key=lambda ids: sum(len(self._postings[t][0]) for t in ids)):
+                key = tuple(term_ids)
+                files = file_sets.get(key)
+                if files is None:
+                    files = file_sets[key] = set().union(
+                        *(self._postings[term_id][0] for term_id in term_ids))
+                candidates = files if candidates is None else candidates & files
+                if not candidates:
+                    break
+            if not candidates:
+                continue
+            needle = None if sequence is None else array("I", sequence).tobytes()
+            for n, file_id in enumerate(candidates):
+                if n % 1024 == 1023 and interrupted is not None and interrupted():
+                    return None
+                entry = self._files[file_id]
+                if needle is None:
+                    positions = self._positions(entry, clause)
+                else:
+                    position = entry.tokens.find(needle)
+                    if position == -1:
+                        continue
+                    positions = _find_all(entry.tokens, needle, position)
+                if not positions:
+                    continue
+                hits[file_id] = hits.get(file_id, 0) + len(positions)
+                heading_hits = _heading_hits(entry, positions, len(clause))
+                if heading_hits:
+                    headings[file_id] = headings.get(file_id, 0) + heading_hits
+        return headings, hits
+
+    @staticmethod
+    def _counts(postings, term_ids):
+        if len(term_ids) == 1:
+            posting = postings.get(term_ids[0])
+            return dict(zip(*posting)) if posting else {}
+        counts = Counter()
+        for term_id in term_ids:
+            posting = postings.get(term_id)
+            if posting:
+                for file_id, count in zip(*posting):
+                    counts[file_id] += count
+        return counts
+
+    @staticmethod
+    def _positions(entry, clause):
+        """Return the word positions where a resolved clause occurs in a file."""
+        tokens = entry.tokens
+        if all(len(term_ids) == 1 for term_ids in clause):
+            needle = array("I", [term_ids[0] for term_ids in clause]).tobytes()
+            return _find_all(tokens, needle)
+        # Find the word with the fewest alternatives, then check the others
+        ids = entry.token_ids()
+        pivot = min(range(len(clause)), key=lambda i: len(clause[i]))
+        candidates = []
+        for term_id in clause[pivot]:
+            candidates.extend(_find_all(tokens, array("I", [term_id]).tobytes()))
+        candidates.sort()
+        wanted = [set(term_ids) for term_ids in clause]
+        positions = []
+        for candidate in candidates:
+            start = candidate - pivot
+            if start < 0 or start + len(clause) > len(ids):
+                continue
+            if all(ids[start + i] in wanted[i] for i in range(len(clause))):
+                positions.append(start)
+        return positions
+
+
+def _find_all(tokens, needle, position=None):
+    """Return the positions of a term-id sequence in a term-id stream.
+
+    ``position`` is where a search for needle already found it, if known.
+    """
+    positions = []
+    if position is None:
+        position = tokens.find(needle)
+    while position != -1:
+        if position % 4 == 0:
+            positions.append(position // 4)
+            position = tokens.find(needle, position + len(needle))
+        else:
+            # Matched across term-id boundaries
+            position = tokens.find(needle, position + 1)
+    return positions
+
+
+def _heading_hits(entry, positions, length):
+    """Count the occurrences at positions that lie within a heading."""
+    sections = entry.sections
+    starts = [section[2] for section in sections]
+    count = 0
+    for position in positions:
+        if position + length <= sections[bisect_right(starts, position) - 1][3]:
+            count += 1
+    return count
+
+
+def _snippet(path, first_line, end_line, clauses, heading=True):
+    """Return the first line of a section mentioning the query, shortened."""
+    pattern = re.compile("|".join(
+        r"\b" + r"\W+".join(re.escape(word) + (r"\w*" if prefix else r"\b")
+                            for word, prefix in clause)
+        for clause in clauses
+    ), re.IGNORECASE)
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            lines = list(itertools.islice(f, first_line, end_line))
+    except OSError:
+        return ""
+    if heading:
+        # Prefer a body line; the heading itself if only it matches
+        lines = lines[1:] + lines[:1]
+    for line in lines:
+        line = line.strip()
+        match = pattern.search(line)
+        if match:
+            start = max(0, match.start() - SNIPPET_LENGTH // 3)
+            snippet = line[start:start + SNIPPET_LENGTH]
+            if start:
+                snippet = "…" + snippet
+            if start + SNIPPET_LENGTH < len(line):
+                snippet += "…"
+            return snippet
+    return ""
+
+
+def search_indexes(indexes, query, limit=200, interrupted=None):
+    """Search several indexes; return (best hits with anchors, number of files matched).
+
+    Hits are ordered by heading hits, then by hits, then by path.
+    """
+    clauses = parse_query(query)
+    if not clauses:
+        return [], 0
+    candidates = []
+    matched = 0
+    for index in indexes:
+        hits, count = index.search(clauses, limit, interrupted)
+        candidates.extend((hit, index) for hit in hits)
+        matched += count
+    best = heapq.nsmallest(
+        limit, candidates, key=lambda item: (-item[0].heading_hits, -item[0].hits, item[0].path)
+    )
+    for hit, index in best:
+        index.locate(hit, clauses)
+    return [hit for hit, _ in best], matched
+
+
+class IndexWorker(QThread):
+    """Loads and refreshes FileIndexes in the background, then saves them."""
+
+    progress = pyqtSignal(str, int)  # root, files checked so far
+    index_finished = pyqtSignal()
+
+    def __init__(self, indexes, parent=None):
+        super().__init__(parent)
+        self.indexes = list(indexes)
+
+    def run(self):
+        for index in self.indexes:
+            if self.isInterruptionRequested():
+                break
+            if not index.loaded:
+                index.load()
+            index.refresh(
+                interrupted=self.isInterruptionRequested,
+                progress=lambda count, root=index.root: self.progress.emit(root, count),
+            )
+            index.save()
+        self.index_finished.emit()
+
+
+class FileSearchWorker(QThread):
+    """Runs one Find in Files query off the GUI thread.
+
+    Like SearchWorker, each worker carries a request id; the dialog ignores
+    results for requests it has since superseded and interrupts their workers.
+    """
+
+    search_finished = pyqtSignal(int, object)  # request_id, (hits, files matched)
+
+    def __init__(self, request_id, indexes, query, limit=200, parent=None):
+        super().__init__(parent)
+        self.request_id = request_id
+        self.indexes = list(indexes)
+        self.query = query
+        self.limit = limit
+
+    def run(self):
+        result = search_indexes(
+            self.indexes, self.query, self.limit, interrupted=self.isInterruptionRequested
+        )
+        if not self.isInterruptionRequested():
+            self.search_finished.emit(self.request_id, result)
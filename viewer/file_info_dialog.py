@@ -13,6 +13,8 @@ from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 
+from .document_loader import document_stats
+
 
 def _format_size(size_bytes):
     """Format file size in human-readable form"""
@@ -199,16 +201,13 @@ class FileInfoDialog(QDialog):
         size_form = QFormLayout()
         size_form.addRow("File Size:", QLabel(_format_size(st.st_size)))
 
-        # Line/word/char count
+        # Line/word/char count, streamed so large files are never held in memory
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
-            lines = content.count('\n') + (1 if content and not content.endswith('\n') else 0)
-            words = len(content.split())
-            chars = len(content)
-            size_form.addRow("Lines:", QLabel(f"{lines:,}"))
-            size_form.addRow("Words:", QLabel(f"{words:,}"))
-            size_form.addRow("Characters:", QLabel(f"{chars:,}"))
+            stats, encoding = document_stats(file_path)
+            size_form.addRow("Lines:", QLabel(f"{stats.lines:,}"))
+            size_form.addRow("Words:", QLabel(f"{stats.words:,}"))
+            size_form.addRow("Characters:", QLabel(f"{stats.chars:,}"))
+            size_form.addRow("Encoding:", QLabel(encoding.upper()))
         except Exception:
             pass
 
@@ -0,0 +1,109 @@
+"""
+File watching for MDviewer's auto-reload mode.
+
+Wraps QFileSystemWatcher so the main window gets one ``file_changed`` signal
+per burst of saves, also for editors that save by writing a temporary file
+and renaming it over the original.
+"""
+
+import os
+
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+
+class DocumentWatcher(QObject):
+    """Watches a single document and reports settled changes to it.
+
+    Editors often save in several steps (truncate + write, or write a temp
+    file and rename it into place), each of which fires its own notification.
+    Notifications restart a single-shot timer, and ``file_changed`` is only
+    emitted once the file has been quiet for ``debounce_ms`` and its
+    modification time or size actually differs from the last report.
+
+    A rename over the watched file drops it from QFileSystemWatcher, so the
+    containing directory is watched as well and the file is re-added as soon
+    as it reappears. Directory notifications about other files in the
+    directory are ignored, so a busy directory cannot keep postponing the
+    reload.
+    """
+
+    file_changed = pyqtSignal(str)  # path of the watched file
+
+    def __init__(self, debounce_ms=300, parent=None):
+        super().__init__(parent)
+        self._path = None
+        self._signature = None
+        # Signature when the debounce timer was last (re)started
+        self._seen_signature = None
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_path_changed)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self._on_settled)
+
+    @property
+    def path(self):
+        return self._path
+
+    def watch(self, path):
+        """Start watching path, replacing any previously watched file."""
+        path = os.path.abspath(path)
+        if path == self._path:
+            return
+        self.unwatch()
+        self._path = path
+        self._signature = self._stat_signature()
+        self._seen_signature = self._signature
+        self._watcher.addPath(os.path.dirname(path))
+        self._ensure_file_watched()
+
+    def unwatch(self):
+        """Stop watching; pending notifications are dropped."""
+        self._timer.stop()
+        paths = self._watcher.files() + self._watcher.directories()
+        if paths:
+            self._watcher.removePaths(paths)
+        self._path = None
+        self._signature = None
+        self._seen_signature = None
+
+    def _stat_signature(self):
+        try:
+            st = os.stat(self._path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _ensure_file_watched(self):
+        # QFileSystemWatcher forgets a file once it is replaced or removed
+        if self._path not in self._watcher.files() and os.path.exists(self._path):
+            self._watcher.addPath(self._path)
+
+    def _on_path_changed(self, _changed_path):
+        if self._path is None:
+            return
+        self._ensure_file_watched()
+        self._seen_signature = self._stat_signature()
+        self._timer.start()
+
+    def _on_directory_changed(self, _changed_path):
+        if self._path is None:
+            return
+        # Only a missing or replaced file concerns us, not its neighbours
+        signature = self._stat_signature()
+        if signature is not None and signature == self._seen_signature:
+            return
+        self._on_path_changed(self._path)
+
+    def _on_settled(self):
+        if self._path is None:
+            return
+        self._ensure_file_watched()
+        signature = self._stat_signature()
+        # A missing file is usually mid-rename; wait for it to come back
+        if signature is None or signature == self._signature:
+            return
+        self._signature = signature
+        self.file_changed.emit(self._path)
@@ -0,0 +1,268 @@
+"""
+Find in Files dialog for MDviewer.
+
+Searches the markdown files below the recent directories through their
+persistent FileIndexes. Opening the dialog brings the indexes up to date in
+the background (only new and changed files are read); queries run on a
+worker thread once typing pauses, and clicking a hit opens the file at the
+heading of its best matching section.
+"""
+
+import os
+import time
+
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
+                             QPushButton, QTreeWidget, QTreeWidgetItem, QHeaderView)
+
+from .file_index import FileIndex, FileSearchWorker, IndexWorker, search_roots
+
+
+class FindInFilesDialog(QDialog):
+    """Non-modal dialog listing the files that match a query.
+
+    ``directories`` is called to get the directories to search each time
+    the dialog is shown; ``indexes`` maps a root directory to its FileIndex
+    and is kept by the caller, so indexes loaded once stay loaded when the
+    dialog is recreated (e.g. after a theme change).
+    """
+
+    # Milliseconds of typing pause before a search starts
+    SEARCH_DELAY_MS = 150
+    # Most hits listed for one query
+    MAX_RESULTS = 200
+
+    open_requested = pyqtSignal(str, str)  # file path, heading anchor ("" = top)
+
+    def __init__(self, directories, indexes, parent=None, theme="dark", index_dir=None):
+        super().__init__(parent)
+        self.setWindowTitle("Find in Files")
+        self.resize(760, 460)
+        self.theme = theme
+        self.directories = directories
+        self.indexes = indexes
+        self.index_dir = index_dir
+        self.roots = []
+
+        self._index_worker = None
+        self._reindex = False
+        self._search_request_id = 0
+        self._search_workers = set()
+        self._search_started = 0.0
+
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self.perform_search)
+
+        self.setup_ui()
+        self.search_input.textChanged.connect(self._search_timer.start)
+        self.search_input.returnPressed.connect(self.perform_search)
+        self.results.itemActivated.connect(self._on_item_activated)
+        self.results.itemClicked.connect(self._on_item_activated)
+        self.close_btn.clicked.connect(self.close)
+
+    def setup_ui(self):
+        """Create the dialog UI components"""
+        if self.theme == "dark":
+            bg_color = "#2d2d2d"
+            text_color = "#bbbbbb"
+            input_bg = "#1e1e1e"
+            border_color = "#444444"
+            btn_bg = "#3d3d3d"
+            btn_hover = "#4d4d4d"
+        else:
+            bg_color = "#f0f0f0"
+            text_color = "#000000"
+            input_bg = "#ffffff"
+            border_color = "#cccccc"
+            btn_bg = "#e0e0e0"
+            btn_hover = "#d0d0d0"
+
+        self.setStyleSheet(f"QDialog {{ background-color: {bg_color}; }}")
+        layout = QVBoxLayout()
+
+        find_label = QLabel("Find in files:")
+        find_label.setStyleSheet(f"font-weight: bold; color: {text_color};")
+
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText('Words, "a phrase" or a prefix*')
+        self.search_input.setStyleSheet(f"""
+            QLineEdit {{
+                border: 2px solid {border_color};
+                border-radius: 4px;
+                padding: 6px 8px;
+                font-size: 12px;
+                background-color: {input_bg};
+                color: {text_color};
+            }}
+            QLineEdit:focus {{
+                border-color: #007acc;
+            }}
+        """)
+
+        self.results = QTreeWidget()
+        self.results.setHeaderLabels(["File", "Section", "Match"])
+        self.results.setRootIsDecorated(False)
+        self.results.setUniformRowHeights(True)
+        self.results.setAlternatingRowColors(True)
+        header = self.results.header()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Interactive)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Interactive)
+        header.setStretchLastSection(True)
+        self.results.setColumnWidth(0, 220)
+        self.results.setColumnWidth(1, 180)
+        self.results.setStyleSheet(f"""
+            QTreeWidget {{
+                border: 1px solid {border_color};
+                background-color: {input_bg};
+                alternate-background-color: {bg_color};
+                color: {text_color};
+            }}
+        """)
+
+        bottom_layout = QHBoxLayout()
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet(f"color: {text_color}; font-size: 11px;")
+        self.close_btn = QPushButton("Close")
+        self.close_btn.setAutoDefault(False)
+        self.close_btn.setStyleSheet(f"""
+            QPushButton {{
+                background-color: {btn_bg};
+                color: {text_color};
+                border: 1px solid {border_color};
+                padding: 8px 16px;
+                border-radius: 4px;
+            }}
+            QPushButton:hover {{
+                background-color: {btn_hover};
+            }}
+        """)
+        bottom_layout.addWidget(self.status_label, 1)
+        bottom_layout.addWidget(self.close_btn)
+
+        layout.addWidget(find_label)
+        layout.addWidget(self.search_input)
+        layout.addWidget(self.results, 1)
+        layout.addLayout(bottom_layout)
+        self.setLayout(layout)
+
+    # -- indexing --------------------------------------------------------
+
+    def start_indexing(self):
+        """Bring the indexes of the current directories up to date in the background."""
+        self.roots = search_roots(self.directories())
+        if not self.roots:
+            self.status_label.setText("No recent directories to search yet: open a file first.")
+            return
+        if self._index_worker is not None:
+            # Runs again with the current directories once this pass is done
+            self._reindex = True
+            return
+        indexes = []
+        for root in self.roots:
+            if root not in self.indexes:
+                self.indexes[root] = FileIndex(root, self.index_dir)
+            indexes.append(self.indexes[root])
+        self._index_worker = IndexWorker(indexes, parent=self)
+        self._index_worker.progress.connect(self._on_index_progress)
+        self._index_worker.index_finished.connect(self._on_index_finished)
+        self._index_worker.finished.connect(self._index_worker.deleteLater)
+        self.status_label.setText("Updating index...")
+        self._index_worker.start()
+
+    def _on_index_progress(self, root, count):
+        self.status_label.setText(f"Updating index of {root}: {count:,} files checked...")
+
+    def _on_index_finished(self):
+        self._index_worker = None
+        if self._reindex and self.isVisible():
+            self._reindex = False
+            self.start_indexing()
+            return
+        files = sum(len(self.indexes[root]) for root in self.roots if root in self.indexes)
+        self.status_label.setText(
+            f"{files:,} files indexed in {len(self.roots)} "
+            f"{'directory' if len(self.roots) == 1 else 'directories'}"
+        )
+        # The index may have changed under the results shown
+        if self.search_input.text().strip():
+            self.perform_search()
+
+    # -- searching -------------------------------------------------------
+
+    def perform_search(self):
+        """Start a background search for the query over the current directories."""
+        self._search_timer.stop()
+        self.cancel_search()
+        query = self.search_input.text().strip()
+        if not query:
+            self.results.clear()
+            return
+        indexes = [self.indexes[root] for root in self.roots if root in self.indexes]
+        worker = FileSearchWorker(
+            self._search_request_id, indexes, query, self.MAX_RESULTS, parent=self
+        )
+        worker.search_finished.connect(self._on_search_finished)
+        worker.finished.connect(lambda w=worker: self._on_search_worker_done(w))
+        self._search_workers.add(worker)
+        self._search_started = time.perf_counter()
+        worker.start()
+
+    def cancel_search(self, wait=False):
+        """Supersede searches still running (and stop indexing and wait if asked)"""
+        self._search_request_id += 1
+        workers = list(self._search_workers)
+        if wait and self._index_worker is not None:
+            workers.append(self._index_worker)
+        for worker in workers:
+            worker.requestInterruption()
+            if wait:
+                worker.wait()
+
+    def _on_search_worker_done(self, worker):
+        self._search_workers.discard(worker)
+        worker.deleteLater()
+
+    def _on_search_finished(self, request_id, result):
+        if request_id != self._search_request_id:
+            return
+        elapsed_ms = (time.perf_counter() - self._search_started) * 1000
+        hits, matched = result
+        self.results.clear()
+        items = []
+        for hit in hits:
+            root = next((r for r in self.roots if hit.path.startswith(r + os.sep)), None)
+            name = os.path.relpath(hit.path, root) if root else hit.path
+            item = QTreeWidgetItem([name, hit.section, hit.snippet])
+            item.setData(0, Qt.ItemDataRole.UserRole, (hit.path, hit.anchor))
+            item.setToolTip(0, hit.path)
+            item.setToolTip(2, hit.snippet)
+            items.append(item)
+        self.results.addTopLevelItems(items)
+        shown = f", showing the best {len(hits)}" if matched > len(hits) else ""
+        self.status_label.setText(
+            f"{matched:,} {'file matches' if matched == 1 else 'files match'}{shown} "
+            f"({elapsed_ms:.0f} ms)"
+        )
+
+    def _on_item_activated(self, item, column=0):
+        path, anchor = item.data(0, Qt.ItemDataRole.UserRole)
+        self.open_requested.emit(path, anchor)
+
+    def keyPressEvent(self, event):
+        """Enter in the query field searches right away instead of closing"""
+        if event.key() in (Qt.Key.Key_Enter, Qt.Key.Key_Return):
+            return
+        super().keyPressEvent(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.search_input.setFocus()
+        self.search_input.selectAll()
+        self.start_indexing()
+
+    def hideEvent(self, event):
+        self._search_timer.stop()
+        self.cancel_search()
+        super().hideEvent(event)
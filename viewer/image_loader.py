@@ -0,0 +1,528 @@
+"""
+Asynchronous image loading for MDviewer's document view.
+
+QTextBrowser loads the images of a document while laying it out, reading
+and decoding each ``file://`` image on the GUI thread before the page can
+be shown. ImageTextBrowser takes over loadResource() for local images:
+an image decoded before comes straight from the shared ImageLoader cache,
+and any other image is handed to a thread pool and shown as a placeholder
+of the image's size (read from the file header) until it is decoded. As the
+placeholder has the final size, swapping the image in only needs a repaint,
+not a new layout.
+
+Decoded QImages are kept in a byte-budgeted LRU (the same RenderCache used
+for rendered documents), shared by all tabs and keyed by path, mtime and
+size, so reopening a document, switching tabs or changing the theme does
+not decode an image again, while an edited image is.
+
+Images wider than the page are fitted to the viewport width and decoded
+with QImageReader.setScaledSize() at the resolution that width needs on the
+screen's device pixel ratio rather than at full size, so a 6000x4000 photo
+costs a few MB instead of ~100 MB. The downscaled images are also kept on disk (keyed by
+path, mtime, size and target size), as decoding the original again is the
+slow part. Full resolution is only decoded once the user asks for it with
+View > Full-Size Images; resizing the window re-fits the images in steps of
+FIT_WIDTH_STEP pixels.
+
+Whether an image file exists is remembered for a moment in an
+ImageStatCache: a missing image gets a small "missing" placeholder, which
+the document keeps, instead of a failed load that QTextBrowser would retry
+on every paint.
+
+``http(s)://`` images are downloaded by a RemoteImageFetcher (see
+remote_images.py) when the ImageLoader has one, and decoded and fitted on
+its threads the same way.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+from PyQt6 import sip
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice, QObject, QSize, QThreadPool, QTimer, QUrl, pyqtSignal
+from PyQt6.QtGui import (QColor, QImage, QImageIOHandler, QImageReader, QPainter, QPen,
+                         QTextDocument)
+from PyQt6.QtWidgets import QTextBrowser
+
+from .remote_images import is_remote_image_url
+from .render_cache import DiskRenderCache, RenderCache, default_cache_dir
+
+
+# Decoded images kept in memory across documents
+DEFAULT_IMAGE_CACHE_BYTES = 128 * 1024 * 1024
+# Images decoding at the same time
+DECODE_THREADS = 4
+# Placeholder shown while an image decodes (light enough for either theme)
+PLACEHOLDER_COLOR = QColor(128, 128, 128, 40)
+# Placeholder of a remote image, whose size is only known once downloaded
+REMOTE_PLACEHOLDER_SIZE = QSize(16, 16)
+# Shown for an image file that does not exist
+MISSING_IMAGE_SIZE = QSize(16, 16)
+MISSING_IMAGE_COLOR = QColor(128, 128, 128, 160)
+# Seconds an image file's stat() result is reused
+STAT_CACHE_SECONDS = 2.0
+# Padding of the page body around .markdown-body in the renderer's CSS
+CONTENT_PADDING = 20
+# Fit widths are rounded down to a multiple of this, so resizing the window
+# only decodes images again once the width changed by a step
+FIT_WIDTH_STEP = 64
+# Milliseconds a resize must settle before images are fitted to the new width
+REFIT_DELAY_MS = 200
+
+
+def image_cache_key(path, stat_result, target_size=None):
+    """Build the cache key of a decoded image file.
+
+    target_size is the size in pixels an image is decoded at when it is
+    scaled down, or None for the full-size image.
+    """
+    key = (os.path.abspath(path), stat_result.st_mtime_ns, stat_result.st_size)
+    if target_size is None:
+        return key
+    return key + (target_size.width(), target_size.height())
+
+
+def default_image_cache_dir():
+    """Return the directory for downscaled images kept on disk ($XDG_CACHE_HOME)."""
+    return os.path.join(os.path.dirname(default_cache_dir()), "images")
+
+
+def fitted_size(size, max_width):
+    """Return size scaled down to at most max_width, keeping its aspect ratio."""
+    if size.width() <= max_width:
+        return QSize(size)
+    return QSize(max_width, max(1, round(size.height() * max_width / size.width())))
+
+
+def local_image_path(url):
+    """Return the file path a document image URL refers to, or None if not local."""
+    if url.isLocalFile():
+        return url.toLocalFile()
+    if not url.scheme() and os.path.isabs(url.path()):
+        return url.path()
+    return None
+
+
+def image_header_size(path):
+    """Return the displayed size of an image from its header, without decoding it.
+
+    Returns an invalid QSize if the format does not tell.
+    """
+    reader = QImageReader(path)
+    size = reader.size()
+    if size.isValid() and reader.transformation() & QImageIOHandler.Transformation.TransformationRotate90:
+        size = size.transposed()
+    return size
+
+
+def decode_image(path, target_size=None):
+    """Decode an image file (any thread), applying its EXIF orientation.
+
+    With a target_size the image is decoded straight at that (displayed)
+    size, which for JPEG skips most of the work and for every format avoids
+    keeping the full-size pixels around.
+    """
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    if target_size is not None:
+        # The scaled size applies before the EXIF rotation
+        if reader.transformation() & QImageIOHandler.Transformation.TransformationRotate90:
+            target_size = target_size.transposed()
+        reader.setScaledSize(target_size)
+    return reader.read()
+
+
+def decode_image_data(data, max_width=None, device_ratio=1.0):
+    """Decode image bytes (any thread), applying their EXIF orientation.
+
+    An image wider than max_width (in layout pixels) is decoded at the size
+    that width needs at device_ratio, like a fitted local image.
+    """
+    buffer = QBuffer()
+    buffer.setData(QByteArray(data))
+    buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+    reader = QImageReader(buffer)
+    reader.setAutoTransform(True)
+    size = reader.size()
+    rotated = reader.transformation() & QImageIOHandler.Transformation.TransformationRotate90
+    if rotated:
+        size = size.transposed()
+    ratio = 1.0
+    if max_width is not None and size.isValid() and size.width() > max_width:
+        display_size = fitted_size(size, max_width)
+        target_size = fitted_size(size, int(max_width * device_ratio))
+        ratio = target_size.width() / display_size.width()
+        reader.setScaledSize(target_size.transposed() if rotated else target_size)
+    image = reader.read()
+    image.setDevicePixelRatio(ratio)
+    return image
+
+
+class ImageStatCache:
+    """Recent os.stat() results of image files, missing files included.
+
+    A document asks for its images on every layout (and a tab switch or a
+    refit lays it out again), so stat() results are reused for ``max_age``
+    seconds; after that an image that was edited, added or deleted is
+    noticed on the next load.
+    """
+
+    def __init__(self, max_age=STAT_CACHE_SECONDS, max_entries=4096):
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._entries = {}
+
+    def stat(self, path):
+        """Return os.stat(path), or None if the file does not exist."""
+        now = time.monotonic()
+        entry = self._entries.get(path)
+        if entry is not None and now - entry[0] < self.max_age:
+            return entry[1]
+        try:
+            result = os.stat(path)
+        except OSError:
+            result = None
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+        self._entries[path] = (now, result)
+        return result
+
+
+def document_image_urls(document):
+    """Return the URLs of the images a QTextDocument shows, each once."""
+    urls = {}
+    block = document.begin()
+    while block.isValid():
+        fragments = block.begin()
+        while not fragments.atEnd():
+            char_format = fragments.fragment().charFormat()
+            if char_format.isImageFormat():
+                name = char_format.toImageFormat().name()
+                urls.setdefault(name, QUrl(name))
+            fragments += 1
+        block = block.next()
+    return list(urls.values())
+
+
+class DiskImageCache(DiskRenderCache):
+    """Downscaled images stored as PNG files, with the same LRU size budget.
+
+    Keys are image_cache_key() tuples including the target size.
+    """
+
+    SUFFIX = ".png"
+
+    def __init__(self, directory=None, max_bytes=256 * 1024 * 1024):
+        super().__init__(directory or default_image_cache_dir(), max_bytes)
+
+    def _path(self, key):
+        digest = hashlib.sha1(json.dumps(list(key)).encode("utf-8")).hexdigest()
+        return super()._path(digest)
+
+    def get(self, key):
+        """Return the QImage stored under key, or None."""
+        payload = self._read(key)
+        if payload is None:
+            return None
+        image = QImage()
+        if not image.loadFromData(payload, "PNG"):
+            self._discard(self._path(key))
+            return None
+        return image
+
+    def put(self, key, image):
+        """Store a QImage, evicting old entries."""
+        buffer = QBuffer()
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        # Light compression: these files are written once and read often
+        if image.save(buffer, "PNG", 80):
+            self._write(key, bytes(buffer.data()))
+
+
+class ImageLoader(QObject):
+    """Decodes images on a thread pool into a shared LRU cache.
+
+    ``image_decoded`` is emitted on the GUI thread with the cache key and
+    the image (a null QImage if it could not be decoded). Downscaled images
+    also go through ``disk_cache`` (a DiskImageCache) when one is given, and
+    remote images can only be loaded with a ``fetcher`` (a RemoteImageFetcher).
+    """
+
+    image_decoded = pyqtSignal(object, QImage)  # cache key, image
+    _finished = pyqtSignal(object, QImage)
+
+    def __init__(self, cache=None, disk_cache=None, fetcher=None, parent=None):
+        super().__init__(parent)
+        self.cache = cache if cache is not None else RenderCache(DEFAULT_IMAGE_CACHE_BYTES)
+        self.disk_cache = disk_cache
+        self.fetcher = fetcher
+        self.stats = ImageStatCache()
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(DECODE_THREADS)
+        self._pending = set()
+        # Keys that failed to decode, so they are not retried on every layout
+        self._failed = set()
+        self._placeholders = {}
+        self._missing_image = None
+        self._finished.connect(self._on_finished)
+
+    def cached(self, key):
+        """Return the decoded image for key, or None."""
+        return self.cache.get(key)
+
+    def failed(self, key):
+        return key in self._failed
+
+    def decode(self, key, path, target_size=None, ratio=1.0):
+        """Decode path in the background unless it already is being decoded.
+
+        target_size scales the image down while decoding it; ratio is the
+        device pixel ratio set on the result, so it is laid out at
+        ``target_size / ratio``.
+        """
+        if key in self._pending:
+            return
+        self._pending.add(key)
+        self._pool.start(lambda: self._finished.emit(key, self._load(key, path, target_size, ratio)))
+
+    def fetch(self, key, url, max_width=None, device_ratio=1.0):
+        """Download and decode an image URL in the background unless already underway."""
+        if key in self._pending:
+            return
+        self._pending.add(key)
+        self.fetcher.start(
+            lambda: self._finished.emit(key, self._download(url, max_width, device_ratio))
+        )
+
+    def decode_now(self, key, path):
+        """Decode path on the calling thread, caching the result."""
+        image = decode_image(path)
+        self._store(key, image)
+        return image
+
+    def placeholder(self, size):
+        """Return a blank image of size, shared by every image of that size."""
+        image = self._placeholders.get((size.width(), size.height()))
+        if image is None:
+            # One bit per pixel: a placeholder costs little even for large images
+            image = QImage(size, QImage.Format.Format_Mono)
+            image.setColorTable([PLACEHOLDER_COLOR.rgba(), PLACEHOLDER_COLOR.rgba()])
+            image.fill(0)
+            if len(self._placeholders) >= 64:
+                self._placeholders.clear()
+            self._placeholders[(size.width(), size.height())] = image
+        return image
+
+    def missing_image(self):
+        """Return the image shown for a file that does not exist."""
+        if self._missing_image is None:
+            image = QImage(MISSING_IMAGE_SIZE, QImage.Format.Format_ARGB32_Premultiplied)
+            image.fill(0)
+            painter = QPainter(image)
+            painter.setPen(QPen(MISSING_IMAGE_COLOR, 1))
+            right, bottom = image.width() - 1, image.height() - 1
+            painter.drawRect(0, 0, right, bottom)
+            painter.drawLine(0, 0, right, bottom)
+            painter.drawLine(0, bottom, right, 0)
+            painter.end()
+            self._missing_image = image
+        return self._missing_image
+
+    def shutdown(self):
+        """Drop queued decodes and wait for running ones to finish."""
+        if self.fetcher is not None:
+            self.fetcher.shutdown()
+        self._pool.clear()
+        self._pool.waitForDone()
+
+    def _download(self, url, max_width, device_ratio):
+        """Fetch and decode a remote image (any thread)."""
+        data = self.fetcher.fetch(url)
+        if data is None:
+            return QImage()
+        return decode_image_data(data, max_width, device_ratio)
+
+    def _load(self, key, path, target_size, ratio):
+        """Read a downscaled image from disk or decode it (any thread)."""
+        disk_cache = self.disk_cache if target_size is not None else None
+        image = disk_cache.get(key) if disk_cache is not None else None
+        if image is None:
+            image = decode_image(path, target_size)
+            if disk_cache is not None and not image.isNull():
+                disk_cache.put(key, image)
+        image.setDevicePixelRatio(ratio)
+        return image
+
+    def _store(self, key, image):
+        if image.isNull():
+            self._failed.add(key)
+        else:
+            self._failed.discard(key)
+            self.cache.put(key, image, image.sizeInBytes())
+
+    def _on_finished(self, key, image):
+        self._pending.discard(key)
+        self._store(key, image)
+        self.image_decoded.emit(key, image)
+
+
+class ImageTextBrowser(QTextBrowser):
+    """QTextBrowser that loads images asynchronously through an ImageLoader.
+
+    Documents shown in the browser must have it as parent for their images
+    to go through loadResource() here (QTextDocument only asks its parent).
+    Images wider than the page are fitted to it unless ``full_size_images``
+    is set.
+    """
+
+    def __init__(self, image_loader=None, parent=None):
+        super().__init__(parent)
+        self.image_loader = image_loader or ImageLoader(parent=self)
+        self.image_loader.image_decoded.connect(self._on_image_decoded)
+        self.full_size_images = False
+        # cache key -> [(document, url, placeholder size)] waiting for the image
+        self._waiting = {}
+        # document -> fit width its images were loaded at
+        self._fits = {}
+
+        self._refit_timer = QTimer(self)
+        self._refit_timer.setSingleShot(True)
+        self._refit_timer.setInterval(REFIT_DELAY_MS)
+        self._refit_timer.timeout.connect(self.refit_images)
+
+    def fit_width(self):
+        """Return the width images are fitted to, or None to show them at full size."""
+        if self.full_size_images:
+            return None
+        margin = self.document().documentMargin() + CONTENT_PADDING
+        # Room for the vertical scroll bar is left whether it is shown or not,
+        # or fitting the images could show and hide it in turn
+        width = self.contentsRect().width() - self.verticalScrollBar().sizeHint().width()
+        width = int(width - 2 * margin)
+        return max(FIT_WIDTH_STEP, width - width % FIT_WIDTH_STEP)
+
+    def set_full_size_images(self, enabled):
+        """Show images at full resolution instead of fitted to the page."""
+        self.full_size_images = enabled
+        self.refit_images()
+
+    def loadResource(self, resource_type, url):
+        if resource_type != QTextDocument.ResourceType.ImageResource.value:
+            return super().loadResource(resource_type, url)
+        document = self.document()
+        fit = self.fit_width()
+        image = self._image_for(document, QUrl(url), fit)
+        if image is None:
+            return super().loadResource(resource_type, url)
+        if self._fits.setdefault(document, fit) != fit:
+            # Laid out at two widths; fit all of them again once settled
+            self._refit_timer.start()
+        return image
+
+    def _image_for(self, document, url, fit):
+        """Return the image for url fitted to fit (or a placeholder), or None."""
+        path = local_image_path(url)
+        if path is not None:
+            return self._load_image(document, url, path, fit)
+        if is_remote_image_url(url) and self.image_loader.fetcher is not None:
+            return self._load_remote_image(document, url, fit)
+        return None
+
+    def _load_remote_image(self, document, url, fit):
+        loader = self.image_loader
+        ratio = self.devicePixelRatioF()
+        key = (url.toString(), fit, ratio)
+        image = loader.cached(key)
+        if image is not None:
+            return image
+        if loader.failed(key):
+            return None
+        self._waiting.setdefault(key, []).append((document, url, REMOTE_PLACEHOLDER_SIZE))
+        loader.fetch(key, url.toString(), fit, ratio)
+        return loader.placeholder(REMOTE_PLACEHOLDER_SIZE)
+
+    def _load_image(self, document, url, path, fit):
+        """Return the image for url fitted to fit (or a placeholder), or None."""
+        loader = self.image_loader
+        st = loader.stats.stat(path)
+        if st is None:
+            # Kept by the document, so the file is not looked for on every paint
+            return loader.missing_image()
+        key = image_cache_key(path, st)
+        # Decoded at full size before: no need to read the header again
+        image = loader.cached(key)
+        if image is not None and (fit is None or image.width() <= fit):
+            return image
+        if loader.failed(key):
+            return None
+        size = image_header_size(path)
+        if not size.isValid() or size.isEmpty():
+            # No size to lay out a placeholder with; decode it right away
+            image = loader.decode_now(key, path)
+            return image if not image.isNull() else None
+
+        target_size, ratio = None, 1.0
+        if fit is not None and size.width() > fit:
+            display_size = fitted_size(size, fit)
+            target_size = fitted_size(size, int(fit * self.devicePixelRatioF()))
+            ratio = target_size.width() / display_size.width()
+            key = image_cache_key(path, st, target_size)
+            image = loader.cached(key)
+            if image is not None:
+                return image
+            if target_size == size:
+                # The screen needs every pixel; only the layout size changes
+                target_size = None
+            size = display_size
+
+        self._waiting.setdefault(key, []).append((document, url, size))
+        loader.decode(key, path, target_size, ratio)
+        return loader.placeholder(size)
+
+    def refit_images(self):
+        """Fit the images of the shown document to the current width again."""
+        document = self.document()
+        for tracked in list(self._fits):
+            if sip.isdeleted(tracked):
+                del self._fits[tracked]
+        fit = self.fit_width()
+        if self._fits.get(document, fit) == fit:
+            return
+        self._fits[document] = fit
+        for waiting in self._waiting.values():
+            waiting[:] = [entry for entry in waiting if entry[0] is not document]
+        for url in document_image_urls(document):
+            image = self._image_for(document, url, fit)
+            if image is not None:
+                document.addResource(QTextDocument.ResourceType.ImageResource.value, url, image)
+        document.markContentsDirty(0, document.characterCount())
+        self.viewport().update()
+
+    def setDocument(self, document):
+        super().setDocument(document)
+        # The document may have been laid out at another width
+        self.refit_images()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self._fits:
+            self._refit_timer.start()
+
+    def _on_image_decoded(self, key, image):
+        """Swap a decoded image in for its placeholders."""
+        waiting = self._waiting.pop(key, [])
+        if image.isNull():
+            return
+        current = self.document()
+        repaint = False
+        for document, url, size in waiting:
+            if sip.isdeleted(document):
+                continue
+            document.addResource(QTextDocument.ResourceType.ImageResource.value, url, image)
+            if image.deviceIndependentSize().toSize() != size:
+                # The header did not tell the final size; lay the document out again
+                document.markContentsDirty(0, document.characterCount())
+            repaint = repaint or document is current
+        if repaint:
+            self.viewport().update()
@@ -21,8 +21,10 @@ from PyQt6.QtWidgets import (
     QListWidget,
     QListWidgetItem,
     QStackedWidget,
+    QProgressBar,
+    QTabBar,
 )
-from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal, QSettings, QObject
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal, QSettings, QObject, QPointF
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import (
     QAction,
@@ -33,32 +35,31 @@ from PyQt6.QtGui import (
     QPalette,
     QColor,
     QTextDocument,
+    QTextDocumentFragment,
 )
+from .block_renderer import BlockRenderer, anchor_positions
+from .image_loader import DiskImageCache, ImageLoader, ImageTextBrowser
+from .remote_images import RemoteImageFetcher
 from .markdown_renderer import MarkdownRenderer
-from .pdf_viewer import PdfViewerWidget
-from .color_settings_dialog import ColorSettingsDialog
-from .file_info_dialog import FileInfoDialog
-from .external_editor import (open_in_external_editor, change_preferred_editor,
-                               _launch_editor as launch_editor)
+from .render_cache import DiskRenderCache, RenderCache
+from .render_worker import RenderWorker
+from .chunked_document import ChunkedView
+from .document_tabs import DEFAULT_LAYOUT_BUDGET_BYTES, DocumentTab, enforce_layout_budget
+from .file_watcher import DocumentWatcher
+from .text_search import SearchWorker, TextIndex, matches_in_range, utf16_length
+from .profiler import RenderProfiler, activate as activate_profile, stage as profile_stage
 from .theme_manager import get_theme_registry
-from .update_dialogs import (
-    VersionCompareDialog,
-    UpToDateDialog,
-    UpdateProgressDialog,
-    UpdateResultDialog,
-    ErrorDialog,
-)
+from .zoom_controller import DEFAULT_POINT_SIZE, ZoomController, zoom_font
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from github_version_checker import GitHubVersionChecker
-from git_updater import GitUpdater
-from release_downloader import ReleaseDownloader
 from version import get_semver
 from version import __version__, __version_date__
-from pyqt_app_info import AppIdentity, gather_info
-from pyqt_app_info.qt import AboutDialog
+
+# The PDF stack, the update machinery, the external-editor helpers and the
+# dialogs are imported where they are first used, so none of them is loaded
+# before the first document is shown
 
 
 class QuickReferenceDialog(QDialog):
@@ -132,6 +133,10 @@ class QuickReferenceDialog(QDialog):
                     <td style="padding: 8px; font-weight: bold; color: {text_color};"><kbd style="background-color: {code_bg}; color: {text_color}; padding: 2px 6px; border-radius: 3px; font-family: monospace; border: 1px solid {border_color};">Ctrl+F</kbd></td>
                     <td style="padding: 8px; color: {text_color};">Find text in document</td>
                 </tr>
+                <tr style="border-bottom: 1px solid {border_color};">
+                    <td style="padding: 8px; font-weight: bold; color: {text_color};"><kbd style="background-color: {code_bg}; color: {text_color}; padding: 2px 6px; border-radius: 3px; font-family: monospace; border: 1px solid {border_color};">Ctrl+Shift+F</kbd></td>
+                    <td style="padding: 8px; color: {text_color};">Find in the files of the recent directories</td>
+                </tr>
                 <tr style="border-bottom: 1px solid {border_color};">
                     <td style="padding: 8px; font-weight: bold; color: {text_color};"><kbd style="background-color: {code_bg}; color: {text_color}; padding: 2px 6px; border-radius: 3px; font-family: monospace; border: 1px solid {border_color};">F5</kbd></td>
                     <td style="padding: 8px; color: {text_color};">Refresh current document</td>
@@ -157,7 +162,7 @@ class QuickReferenceDialog(QDialog):
                     <td style="padding: 8px; color: {text_color};">Check for updates</td>
                 </tr>
                 <tr style="border-bottom: 1px solid {border_color};">
-                    <td style="padding: 8px; font-weight: bold; color: {text_color};"><kbd style="background-color: {code_bg}; color: {text_color}; padding: 2px 6px; border-radius: 3px; font-family: monospace; border: 1px solid {border_color};">Ctrl++</kbd> / <kbd style="background-color: {code_bg}; color: {text_color}; padding: 2px 6px; border-radius: 3px; font-family: monospace; border: 1px solid {border_color};">Ctrl+-</kbd></td>
+                    <td style="padding: 8px; font-weight: bold; color: {text_color};"><kbd style="background-color: {code_bg}; color: {text_color}; padding: 2px 6px; border-radius: 3px; font-family: monospace; border: 1px solid {border_color};">Ctrl++</kbd> / <kbd style="background-color: {code_bg}; color: {text_color}; padding: 2px 6px; border-radius: 3px; font-family: monospace; border: 1px solid {border_color};">Ctrl+-</kbd> / <kbd style="background-color: {code_bg}; color: {text_color}; padding: 2px 6px; border-radius: 3px; font-family: monospace; border: 1px solid {border_color};">Ctrl+Wheel</kbd></td>
                     <td style="padding: 8px; color: {text_color};">Zoom in / out</td>
                 </tr>
                 <tr style="border-bottom: 1px solid {border_color};">
@@ -286,7 +291,17 @@ class ThemeManager:
 
 
 class FindDialog(QDialog):
-    """Simple Find dialog similar to Windows Notepad"""
+    """Simple Find dialog similar to Windows Notepad
+
+    Searches run on a SearchWorker against a plain-text TextIndex of the
+    document, taken once per render, and start once typing pauses. Only the
+    matches around the visible part of the document are highlighted.
+    """
+
+    # Milliseconds of typing pause before a search starts
+    SEARCH_DELAY_MS = 150
+    # Highlighted area above and below the viewport, in viewport heights
+    HIGHLIGHT_MARGIN = 1
 
     def __init__(self, parent=None, theme="dark"):
         super().__init__(parent)
@@ -301,12 +316,32 @@ class FindDialog(QDialog):
         self.total_matches = 0
         self.case_sensitive = False
         self.whole_word = False
+        # Start offsets of the matches in the document, and their length
+        self.matches = []
+        self.match_length = 0
+
+        # Plain-text snapshot of the searched document, retaken after it changes
+        self._index = None
+        self._search_request_id = 0
+        self._search_workers = set()
+        # Highlighted document range, its matches' selections (indexed from
+        # _highlight_first) and the match currently styled as current
+        self._highlight_range = None
+        self._highlight_first = 0
+        self._selections = []
+        self._styled_current = None
+
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self.perform_search)
 
         # Store reference to parent's text browser for search operations
         self.text_browser = None
 
         self.setup_ui()
         self.connect_signals()
+        self._build_highlight_formats()
 
     def setup_ui(self):
         """Create the dialog UI components"""
@@ -469,13 +504,19 @@ class FindDialog(QDialog):
     def set_text_browser(self, text_browser):
         """Set reference to the main window's text browser"""
         self.text_browser = text_browser
+        # Matches scrolled into view get highlighted as they appear
+        text_browser.verticalScrollBar().valueChanged.connect(self._on_viewport_scrolled)
 
     def on_search_text_changed(self):
-        """Handle search text changes"""
+        """Handle search text changes; the search starts once typing pauses"""
         self.search_text = self.search_input.text()
         if self.search_text:
-            self.perform_search()
+            self._search_timer.start()
         else:
+            self._search_timer.stop()
+            self.cancel_search()
+            self.matches = []
+            self.total_matches = 0
             self.clear_highlights()
             self.update_match_counter(0, 0)
 
@@ -486,48 +527,59 @@ class FindDialog(QDialog):
         if self.search_text:
             self.perform_search()
 
-    def build_find_flags(self):
-        """Build QTextDocument.FindFlags based on options"""
-        flags = QTextDocument.FindFlag(0)
-        if self.case_sensitive:
-            flags |= QTextDocument.FindFlag.FindCaseSensitively
-        if self.whole_word:
-            flags |= QTextDocument.FindFlag.FindWholeWords
-        return flags
-
     def perform_search(self):
-        """Find all occurrences of search text"""
+        """Start a background search for the search text in the current document"""
+        self._search_timer.stop()
         if not self.text_browser or not self.search_text:
             return
 
-        # Clear previous highlights
-        self.clear_highlights()
-
-        # Find all matches
         document = self.text_browser.document()
-        cursor = QTextCursor(document)
-        cursor.movePosition(QTextCursor.MoveOperation.Start)
-
-        matches = []
-        while True:
-            found_cursor = document.find(
-                self.search_text, cursor, self.build_find_flags()
-            )
-            if found_cursor.isNull():
-                break
-
-            # Store a copy of the cursor with its selection intact
-            matches.append(QTextCursor(found_cursor))
-            # Move search position past this match
-            cursor = found_cursor
-            cursor.setPosition(found_cursor.selectionEnd())
+        if self._index is None or not self._index.is_current_for(document):
+            self._index = TextIndex.from_document(document)
+
+        self.cancel_search()
+        self._search_request_id += 1
+        worker = SearchWorker(
+            self._search_request_id,
+            self._index,
+            self.search_text,
+            self.case_sensitive,
+            self.whole_word,
+            parent=self,
+        )
+        worker.search_finished.connect(self._on_search_finished)
+        worker.finished.connect(lambda w=worker: self._on_search_worker_done(w))
+        self._search_workers.add(worker)
+        worker.start()
+
+    def cancel_search(self, wait=False):
+        """Supersede searches still running (and wait for them to stop if asked)"""
+        self._search_request_id += 1
+        for worker in list(self._search_workers):
+            worker.requestInterruption()
+            if wait:
+                worker.wait()
+
+    def _on_search_worker_done(self, worker):
+        self._search_workers.discard(worker)
+        worker.deleteLater()
+
+    def _on_search_finished(self, request_id, offsets):
+        """Show the result of the latest search (runs on main thread)"""
+        if request_id != self._search_request_id:
+            return
+        if not self._index.is_current_for(self.text_browser.document()):
+            # The document changed while searching; the offsets are stale
+            self.perform_search()
+            return
 
-        self.matches = matches
-        self.total_matches = len(matches)
+        self.clear_highlights()
+        self.matches = offsets
+        self.match_length = utf16_length(self.search_text)
+        self.total_matches = len(offsets)
+        self.current_match_index = 0
 
         if self.total_matches > 0:
-            self.current_match_index = 0
-            self.highlight_all_matches()
             self.navigate_to_match(0)
 
         self.update_match_counter(self.current_match_index + 1, self.total_matches)
@@ -552,54 +604,101 @@ class FindDialog(QDialog):
         self.navigate_to_match(self.current_match_index)
         self.update_match_counter(self.current_match_index + 1, self.total_matches)
 
+    def _build_highlight_formats(self):
+        """Create the formats for the current match and the other matches"""
+        # Use pure, bright colors that should be impossible to miss
+        self._current_format = QTextCharFormat()
+        self._current_format.setBackground(QColor(255, 255, 0))  # Pure yellow
+        self._current_format.setForeground(QColor(0, 0, 0))  # Black text
+        self._current_format.setFontWeight(QFont.Weight.Bold)
+        self._current_format.setFontUnderline(True)
+        self._other_format = QTextCharFormat()
+        self._other_format.setBackground(QColor(255, 165, 0))  # Pure orange
+        self._other_format.setForeground(QColor(0, 0, 0))  # Black text
+
+    def _cursor_for(self, index):
+        """Return a cursor selecting match index"""
+        cursor = QTextCursor(self.text_browser.document())
+        start = self.matches[index]
+        cursor.setPosition(start)
+        cursor.setPosition(start + self.match_length, QTextCursor.MoveMode.KeepAnchor)
+        return cursor
+
+    def _visible_range(self):
+        """Return the document positions around the viewport that get highlights"""
+        layout = self.text_browser.document().documentLayout()
+        height = self.text_browser.viewport().height()
+        top = self.text_browser.verticalScrollBar().value()
+        margin = height * self.HIGHLIGHT_MARGIN
+        start = layout.hitTest(QPointF(0, max(0, top - margin)), Qt.HitTestAccuracy.FuzzyHit)
+        end = layout.hitTest(
+            QPointF(self.text_browser.viewport().width(), top + height + margin),
+            Qt.HitTestAccuracy.FuzzyHit,
+        )
+        return max(0, start), max(start, end) + 1
+
     def highlight_all_matches(self):
-        """Highlight all search matches with maximum contrast colors"""
+        """Highlight the matches in and around the visible part of the document"""
         if not self.text_browser:
             return
 
-        # Use pure, bright colors that should be impossible to miss
-        current_highlight = QColor(255, 255, 0)  # Pure yellow
-        other_highlight = QColor(255, 165, 0)  # Pure orange
-        current_text = QColor(0, 0, 0)  # Black text
-        other_text = QColor(0, 0, 0)  # Black text
-
-        extra_selections = []
-        for i, match in enumerate(self.matches):
+        start, end = self._visible_range()
+        first, last = matches_in_range(self.matches, start - self.match_length, end)
+        selections = []
+        for index in range(first, last):
             selection = QTextEdit.ExtraSelection()
-            selection.cursor = match
-
-            fmt = QTextCharFormat()
-            if i == self.current_match_index:
-                # Current match: maximum visibility
-                fmt.setBackground(current_highlight)
-                fmt.setForeground(current_text)
-                fmt.setFontWeight(QFont.Weight.Bold)
-                fmt.setFontUnderline(True)
+            selection.cursor = self._cursor_for(index)
+            if index == self.current_match_index:
+                selection.format = self._current_format
             else:
-                # Other matches: clear but less prominent
-                fmt.setBackground(other_highlight)
-                fmt.setForeground(other_text)
-
-            selection.format = fmt  # Apply the format to the selection
-            extra_selections.append(selection)
-
-        # Apply selections
-        self.text_browser.setExtraSelections(extra_selections)
-
-        # Force visual update
-        self.text_browser.viewport().update()
+                selection.format = self._other_format
+            selections.append(selection)
+
+        self._highlight_range = (start, end)
+        self._highlight_first = first
+        self._selections = selections
+        self._styled_current = self.current_match_index
+        self.text_browser.setExtraSelections(selections)
+
+    def _restyle_current(self):
+        """Move the current-match style to the current match; False if not highlighted"""
+        current = self.current_match_index - self._highlight_first
+        if not 0 <= current < len(self._selections):
+            return False
+        if self._styled_current is not None:
+            previous = self._styled_current - self._highlight_first
+            if 0 <= previous < len(self._selections):
+                self._selections[previous].format = self._other_format
+        self._selections[current].format = self._current_format
+        self._styled_current = self.current_match_index
+        self.text_browser.setExtraSelections(self._selections)
+        return True
+
+    def _on_viewport_scrolled(self):
+        """Highlight matches that scrolled into view"""
+        if not self.matches or not self.isVisible() or self._highlight_range is None:
+            return
+        start, end = self._visible_range()
+        if start < self._highlight_range[0] or end > self._highlight_range[1]:
+            self.highlight_all_matches()
 
     def navigate_to_match(self, index):
         """Navigate to specific match and highlight it"""
         if not self.matches or index >= len(self.matches):
             return
 
-        # Clear previous selection and set new one
-        self.text_browser.setTextCursor(self.matches[index])
-        self.highlight_all_matches()
+        self.current_match_index = index
+        # Scrolling to the match re-highlights the new viewport if needed;
+        # otherwise only the old and new current match change style
+        self.text_browser.setTextCursor(self._cursor_for(index))
+        if self._highlight_range is None or not self._restyle_current():
+            self.highlight_all_matches()
 
     def clear_highlights(self):
         """Clear all search highlights"""
+        self._highlight_range = None
+        self._selections = []
+        self._styled_current = None
         if self.text_browser:
             self.text_browser.setExtraSelections([])
 
@@ -619,9 +718,13 @@ class FindDialog(QDialog):
             self.search_input.selectAll()
         # Trigger initial search if there's text
         self.on_search_text_changed()
+        if self.search_text:
+            self.perform_search()
 
     def closeEvent(self, event):
         """Handle dialog close event"""
+        self._search_timer.stop()
+        self.cancel_search()
         self.clear_highlights()
         super().closeEvent(event)
 
@@ -737,29 +840,61 @@ class UpdatePerformWorker(QThread):
             self.update_error.emit(str(e))
 
 
+def _file_signature(file_path):
+    """Return (mtime, size) of a file, or None if it cannot be read."""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
 class MainWindow(QMainWindow):
     def __init__(self, initial_file=None):
         super().__init__()
         self.current_file = None
         self.renderer = MarkdownRenderer()
+        self.render_cache = RenderCache()
+        # Rendered documents kept across sessions (under $XDG_CACHE_HOME/mdviewer)
+        self.disk_render_cache = DiskRenderCache()
+        self.block_renderer = BlockRenderer(self.renderer)
+        self._current_body_html = None
+        # (anchor name, html) of each top-level block currently displayed
+        self._displayed_blocks = None
+        # Sliding-window view used instead for very large documents
+        self._chunked_view = None
+        # Background rendering: id of the newest request and workers still running
+        self._render_request_id = 0
+        self._render_workers = set()
+        # Open documents, in tab order; the fields above hold the active one's state
+        self.tabs = []
+        self._active_tab = None
+        # Estimated memory the laid-out documents of all tabs may use
+        self.tab_layout_budget = DEFAULT_LAYOUT_BUDGET_BYTES
         self.settings = QSettings("MDviewer", "MDviewer")
         self.recent_files = []
         self.recent_directories = []
         self.initial_file = initial_file
         self.find_dialog = None
+        self.find_in_files_dialog = None
+        # Find in Files index of each searched directory, kept across dialogs
+        self.file_indexes = {}
         self.current_theme = (
             "dark"  # Default theme (will be overwritten by load_theme_settings)
         )
         self.hide_paragraph_marks = False  # Default: marks shown (unchecked = visible)
-
-        # Initialize update components
-        self.version_checker = GitHubVersionChecker("juren53/MDviewer", get_semver())
-        self.git_updater = GitUpdater(
-            "https://github.com/juren53/MDviewer.git", "version.py"
-        )
-        self.release_downloader = ReleaseDownloader(
-            "juren53/MDviewer", "version.py"
-        )
+        self.auto_reload = False  # Default: reload only on request (F5)
+        self.file_watcher = DocumentWatcher(parent=self)
+        self.file_watcher.file_changed.connect(self._on_watched_file_changed)
+        # Render profiling: off unless MDVIEWER_PROFILE is set or enabled from the View menu
+        self.profiler = RenderProfiler.from_environment(parent=self)
+        self.profiler.cycle_finished.connect(self._on_profile_cycle_finished)
+
+        # Update components and the PDF viewer are created on first use
+        self._version_checker = None
+        self._git_updater = None
+        self._release_downloader = None
+        self.pdf_viewer = None
 
         self.setWindowTitle(f"MDviewer v{__version__}")
 
@@ -776,6 +911,9 @@ class MainWindow(QMainWindow):
         # Load paragraph marks preference from settings
         self.load_paragraph_marks_settings()
 
+        # Load auto-reload preference from settings
+        self.auto_reload = self.settings.value("auto_reload", False, type=bool)
+
         # Load custom color overrides for both themes
         self.custom_colors = {"dark": {}, "light": {}}
         self.load_custom_colors()
@@ -791,7 +929,7 @@ class MainWindow(QMainWindow):
         self.setup_status_bar()
 
         # Set up markdown browser with dark theme
-        self.text_browser.setFont(QFont("Consolas", 11))
+        self.text_browser.setFont(zoom_font(DEFAULT_POINT_SIZE))
         self.text_browser.setReadOnly(True)
 
         # Apply theme-aware stylesheet to text browser
@@ -801,12 +939,43 @@ class MainWindow(QMainWindow):
         self.renderer.current_theme = self.current_theme
         self.renderer.hide_paragraph_marks = self.hide_paragraph_marks
 
+        # The first tab starts out on the welcome page
+        self._new_tab()
+
         # Load file based on priority: command-line arg > last opened file > welcome message
         if self.initial_file:
             self.load_file_from_path(self.initial_file)
         else:
             self.load_last_opened_file()
 
+    @property
+    def version_checker(self):
+        if self._version_checker is None:
+            from github_version_checker import GitHubVersionChecker
+
+            self._version_checker = GitHubVersionChecker("juren53/MDviewer", get_semver())
+        return self._version_checker
+
+    @property
+    def git_updater(self):
+        if self._git_updater is None:
+            from git_updater import GitUpdater
+
+            self._git_updater = GitUpdater(
+                "https://github.com/juren53/MDviewer.git", "version.py"
+            )
+        return self._git_updater
+
+    @property
+    def release_downloader(self):
+        if self._release_downloader is None:
+            from release_downloader import ReleaseDownloader
+
+            self._release_downloader = ReleaseDownloader(
+                "juren53/MDviewer", "version.py"
+            )
+        return self._release_downloader
+
     def setup_ui(self):
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -814,23 +983,54 @@ class MainWindow(QMainWindow):
         layout = QVBoxLayout()
         layout.setContentsMargins(5, 5, 5, 5)
 
+        # One tab per open document; all tabs share the text browser below
+        self.tab_bar = QTabBar()
+        self.tab_bar.setTabsClosable(True)
+        self.tab_bar.setMovable(True)
+        self.tab_bar.setDocumentMode(True)
+        self.tab_bar.setExpanding(False)
+        self.tab_bar.setAutoHide(True)
+        self.tab_bar.setElideMode(Qt.TextElideMode.ElideMiddle)
+        self.tab_bar.currentChanged.connect(self._on_tab_changed)
+        self.tab_bar.tabCloseRequested.connect(self.close_tab)
+        self.tab_bar.tabMoved.connect(self._on_tab_moved)
+        layout.addWidget(self.tab_bar)
+
         self.content_stack = QStackedWidget()
 
-        self.text_browser = QTextBrowser()
+        # Decodes images on a thread pool into a cache shared by all tabs;
+        # images fitted to the page and downloaded images are also kept on disk
+        self.text_browser = ImageTextBrowser(
+            ImageLoader(disk_cache=DiskImageCache(), fetcher=RemoteImageFetcher(), parent=self)
+        )
+        self.text_browser.full_size_images = self.settings.value(
+            "full_size_images", False, type=bool
+        )
         self.text_browser.setOpenLinks(False)
         self.text_browser.anchorClicked.connect(self._on_anchor_clicked)
-
-        self.pdf_viewer = PdfViewerWidget(self)
+        # Coalesces zoom key presses and Ctrl+wheel; remembers each document's zoom
+        self.zoom = ZoomController(self.text_browser, self.settings, parent=self)
+        self.zoom.zoom_changed.connect(
+            lambda size: self.status_bar.showMessage(f"Font size: {size} pt", 2000)
+        )
 
         self.content_stack.addWidget(self.text_browser)   # index 0
-        self.content_stack.addWidget(self.pdf_viewer)     # index 1
         self.content_stack.setCurrentIndex(0)
 
         layout.addWidget(self.content_stack)
 
         central_widget.setLayout(layout)
 
-        self.pdf_viewer.page_changed.connect(self._on_pdf_page_changed)
+    def _ensure_pdf_viewer(self):
+        """Create the PDF viewer (index 1 of the content stack) on first use."""
+        if self.pdf_viewer is None:
+            from .pdf_viewer import PdfViewerWidget
+
+            self.pdf_viewer = PdfViewerWidget(self)
+            self.content_stack.addWidget(self.pdf_viewer)     # index 1
+            self.pdf_viewer.page_changed.connect(self._on_pdf_page_changed)
+            self.pdf_viewer.apply_theme(self.current_theme, self.renderer)
+        return self.pdf_viewer
 
     def setup_menu(self):
         menubar = self.menuBar()
@@ -853,6 +1053,12 @@ class MainWindow(QMainWindow):
         self.recent_dirs_menu = file_menu.addMenu("Open Recent &Directories")
         self.update_recent_dirs_menu()
 
+        close_tab_action = QAction("&Close Tab", self)
+        close_tab_action.setShortcut("Ctrl+W")
+        close_tab_action.setStatusTip("Close the current document")
+        close_tab_action.triggered.connect(lambda: self.close_tab(self.tab_bar.currentIndex()))
+        file_menu.addAction(close_tab_action)
+
         file_menu.addSeparator()
 
         info_action = QAction("&Info", self)
@@ -884,6 +1090,12 @@ class MainWindow(QMainWindow):
         edit_menu.addAction(find_action)
         self._md_only_actions.append(find_action)
 
+        find_in_files_action = QAction("Find in Fi&les...", self)
+        find_in_files_action.setShortcut("Ctrl+Shift+F")
+        find_in_files_action.setStatusTip("Search the markdown files in the recent directories")
+        find_in_files_action.triggered.connect(self.show_find_in_files_dialog)
+        edit_menu.addAction(find_in_files_action)
+
         edit_menu.addSeparator()
 
         copy_action = QAction("&Copy", self)
@@ -924,6 +1136,40 @@ class MainWindow(QMainWindow):
         view_menu.addAction(refresh_action)
         self._md_only_actions.append(refresh_action)
 
+        auto_reload_action = QAction("&Auto-Reload on Change", self)
+        auto_reload_action.setStatusTip("Reload the document whenever it is saved on disk")
+        auto_reload_action.setCheckable(True)
+        auto_reload_action.setChecked(self.auto_reload)
+        auto_reload_action.triggered.connect(self.toggle_auto_reload)
+        view_menu.addAction(auto_reload_action)
+        self._md_only_actions.append(auto_reload_action)
+
+        profile_action = QAction("&Profile Rendering", self)
+        profile_action.setStatusTip("Time each render stage and show the breakdown in the status bar")
+        profile_action.setCheckable(True)
+        profile_action.setChecked(self.profiler.enabled)
+        profile_action.triggered.connect(self.toggle_profiling)
+        view_menu.addAction(profile_action)
+
+        export_profile_action = QAction("E&xport Render Profile...", self)
+        export_profile_action.setStatusTip("Save recent render timings as JSON or a Chrome trace")
+        export_profile_action.triggered.connect(self.export_render_profile)
+        view_menu.addAction(export_profile_action)
+
+        view_menu.addSeparator()
+
+        next_tab_action = QAction("&Next Tab", self)
+        next_tab_action.setShortcuts(["Ctrl+Tab", "Ctrl+PgDown"])
+        next_tab_action.setStatusTip("Show the next open document")
+        next_tab_action.triggered.connect(lambda: self._cycle_tabs(1))
+        view_menu.addAction(next_tab_action)
+
+        previous_tab_action = QAction("Pre&vious Tab", self)
+        previous_tab_action.setShortcuts(["Ctrl+Shift+Tab", "Ctrl+PgUp"])
+        previous_tab_action.setStatusTip("Show the previous open document")
+        previous_tab_action.triggered.connect(lambda: self._cycle_tabs(-1))
+        view_menu.addAction(previous_tab_action)
+
         view_menu.addSeparator()
 
         zoom_in_action = QAction("Zoom &In", self)
@@ -947,6 +1193,16 @@ class MainWindow(QMainWindow):
         view_menu.addAction(reset_zoom_action)
         self._md_only_actions.append(reset_zoom_action)
 
+        full_size_images_action = QAction("&Full-Size Images", self)
+        full_size_images_action.setStatusTip(
+            "Show images at full resolution instead of fitted to the window"
+        )
+        full_size_images_action.setCheckable(True)
+        full_size_images_action.setChecked(self.text_browser.full_size_images)
+        full_size_images_action.triggered.connect(self.toggle_full_size_images)
+        view_menu.addAction(full_size_images_action)
+        self._md_only_actions.append(full_size_images_action)
+
         view_menu.addSeparator()
 
         # Theme submenu
@@ -1054,12 +1310,25 @@ class MainWindow(QMainWindow):
         # Add version label to the right side of status bar
         from version import get_version_string
 
+        # Busy indicator shown while a document renders in the background
+        self.render_progress = QProgressBar()
+        self.render_progress.setRange(0, 0)
+        self.render_progress.setMaximumWidth(120)
+        self.render_progress.setMaximumHeight(14)
+        self.render_progress.setTextVisible(False)
+        self.render_progress.hide()
+        self.status_bar.addPermanentWidget(self.render_progress)
+
         version_label = QLabel(get_version_string())
         version_label.setStyleSheet("color: #666; font-size: 11px;")
         self.status_bar.addPermanentWidget(version_label)
 
-    def load_file_from_path(self, file_path):
-        """Load a file (markdown or PDF) from the given path."""
+    def load_file_from_path(self, file_path, scroll_pos=None, status_prefix="Opened"):
+        """Load a file (markdown or PDF) from the given path.
+
+        Markdown files render in the background; ``scroll_pos`` and
+        ``status_prefix`` are applied once the rendered document is shown.
+        """
         if not (os.path.exists(file_path) and os.path.isfile(file_path)):
             self.status_bar.showMessage(f"File not found: {file_path}")
             QMessageBox.warning(
@@ -1071,57 +1340,308 @@ class MainWindow(QMainWindow):
         if ext == ".pdf":
             return self._load_pdf_file(file_path)
         else:
-            return self._load_markdown_file(file_path)
-
-    def _resolve_image_paths(self, html, file_path):
-        """Convert relative img src paths to absolute file:// URLs."""
-        from PyQt6.QtCore import QUrl
-        base_dir = os.path.dirname(os.path.abspath(file_path))
+            return self._load_markdown_file(file_path, scroll_pos, status_prefix)
 
-        def replace_src(match):
-            src = match.group(1)
-            if src.startswith(('http://', 'https://', 'ftp://', 'file://', 'data:', '/')):
-                return match.group(0)
-            abs_path = os.path.normpath(os.path.join(base_dir, src))
-            return f'src="{QUrl.fromLocalFile(abs_path).toString()}"'
+    def _load_markdown_file(self, file_path, scroll_pos=None, status_prefix="Opened"):
+        """Start rendering a markdown file into the active tab on a background worker.
 
-        return re.sub(r'src="([^"]*)"', replace_src, html)
+        Any render still in flight for the tab is superseded: it is asked to
+        stop and its result, should it still arrive, is ignored.
+        """
+        tab = self._active_tab
+        self._cancel_pending_render(tab)
+        self._render_request_id += 1
+        request_id = self._render_request_id
+        tab.request_id = request_id
+
+        worker = RenderWorker(
+            request_id,
+            file_path,
+            self.renderer,
+            self.render_cache,
+            self.hide_paragraph_marks,
+            scroll_pos=scroll_pos,
+            status_prefix=status_prefix,
+            block_renderer=self.block_renderer,
+            profile=self.profiler.new_cycle(os.path.basename(file_path)),
+            disk_cache=self.disk_render_cache,
+            parent=self,
+        )
+        worker.progress.connect(self._on_render_progress)
+        worker.render_finished.connect(self._on_render_finished)
+        worker.render_failed.connect(self._on_render_failed)
+        worker.finished.connect(lambda w=worker: self._on_render_worker_done(w))
+        self._render_workers.add(worker)
+
+        self.render_progress.show()
+        self.status_bar.showMessage(f"Loading: {os.path.basename(file_path)}...")
+        worker.start()
+        return True
+
+    def _cancel_pending_render(self, tab=None):
+        """Supersede background renders not displayed yet (for tab, or for all tabs)."""
+        tabs = self.tabs if tab is None else [tab]
+        pending = {t.request_id for t in tabs if t.request_id is not None}
+        for t in tabs:
+            t.request_id = None
+        for worker in self._render_workers:
+            if worker.request_id in pending:
+                worker.requestInterruption()
+        if tab is None or tab is self._active_tab:
+            self.render_progress.hide()
+
+    def _tab_for_request(self, request_id):
+        """Return the tab a render request is still wanted for, or None."""
+        for tab in self.tabs:
+            if tab.request_id == request_id:
+                return tab
+        return None
+
+    def _on_render_progress(self, request_id, stage):
+        """Show the background render stage of the active tab in the status bar."""
+        if self._active_tab is not None and request_id == self._active_tab.request_id:
+            self.status_bar.showMessage(f"{stage}: {os.path.basename(self.sender().file_path)}...")
+
+    def _on_render_finished(self, request_id, document):
+        """Display a document rendered by a RenderWorker (runs on main thread).
+
+        A render for a tab that is no longer active is only stored in the
+        tab; it is laid out when the tab is shown again.
+        """
+        tab = self._tab_for_request(request_id)
+        if tab is None:
+            return
+        tab.request_id = None
+        tab.hide_paragraph_marks = document.hide_paragraph_marks
+        tab.signature = _file_signature(document.file_path)
+        tab.needs_render = False
+        tab.is_pdf = False
+        tab.file_path = document.file_path
+        self._update_tab_title(tab)
+        if tab is not self._active_tab:
+            tab.drop_document()
+            tab.body_html = document.body_html
+            tab.blocks = document.blocks
+            tab.chunked = document.chunked
+            tab.chunk_section = 0
+            tab.copy_buffer = document.copy_buffer
+            if document.scroll_pos is not None:
+                tab.scroll_pos = document.scroll_pos
+            self.add_to_recent_files(document.file_path)
+            return
+        self.render_progress.hide()
 
-    def _load_markdown_file(self, file_path):
-        """Load and render a markdown file."""
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
+        self.renderer._copy_buffer = document.copy_buffer
+        same_document = (
+            document.file_path == self.current_file and not self._is_pdf_mode()
+        )
+        # A file opened in this tab gets its own zoom level
+        self.zoom.prepare_document(self.text_browser.document(), document.file_path)
+        with activate_profile(document.profile):
+            if document.chunked is not None:
+                # Reopen a reloaded large document at the section being read
+                start = 0
+                if same_document and self._chunked_view is not None:
+                    start = self._chunked_view.top_section()
+                self._display_chunked(document.chunked, start)
+            else:
+                if not (same_document and self._patch_document(document)):
+                    self._display_body(document.body_html, document.blocks)
+                if document.scroll_pos is not None:
+                    self.text_browser.verticalScrollBar().setValue(document.scroll_pos)
+        self._scroll_to_pending_anchor(tab)
 
-            html_content = self.renderer.render(content)
-            html_content = self._resolve_image_paths(html_content, file_path)
-            self.text_browser.setHtml(html_content)
+        file_path = document.file_path
+        self.content_stack.setCurrentIndex(0)
+        self.current_file = file_path
+        self.setWindowTitle(f"MDviewer v{__version__}  |  {os.path.basename(file_path)}")
+        message = f"{document.status_prefix}: {file_path}"
+        if document.chunked is not None:
+            message += "  (large document: sections load as you scroll)"
+        self.status_bar.showMessage(message)
+        self.add_to_recent_files(file_path)
+        self._update_pdf_menu_states()
+        self._update_file_watch()
+        self._enforce_layout_budget()
+        # Replaces the status message with the breakdown when profiling
+        self.profiler.finish(document.profile)
+
+    def _on_render_failed(self, request_id, error_message):
+        """Report a background render failure (runs on main thread)."""
+        tab = self._tab_for_request(request_id)
+        if tab is None:
+            return
+        tab.request_id = None
+        file_path = self.sender().file_path
+        if tab is self._active_tab:
+            self.render_progress.hide()
+        self.status_bar.showMessage(f"Error loading {file_path}: {error_message}")
+        if tab.file_path is not None and not tab.has_render():
+            # The tab was opened for this file and has nothing to show
+            tab.needs_render = False
+            if len(self.tabs) > 1:
+                self.close_tab(self.tabs.index(tab))
+        QMessageBox.critical(self, "Error", f"Could not open file: {error_message}")
+
+    def _on_render_worker_done(self, worker):
+        """Release a finished worker thread."""
+        self._render_workers.discard(worker)
+        worker.deleteLater()
+
+    def _display_body(self, body_html, blocks=None):
+        """Show rendered body HTML styled with the current theme CSS.
+
+        The theme CSS goes in as the document's default stylesheet rather than
+        inline, so a theme or color change only needs _restyle_current_document().
+        """
+        self._clear_chunked_view()
+        self._current_body_html = body_html
+        self._displayed_blocks = blocks
+        self.text_browser.document().setDefaultStyleSheet(
+            self.renderer.get_document_css()
+        )
+        with profile_stage("layout"):
+            self.text_browser.setHtml(body_html)
+
+    def _display_chunked(self, chunked, start_section=0):
+        """Show a very large document through a sliding window of its sections."""
+        self._clear_chunked_view()
+        self._current_body_html = None
+        self._displayed_blocks = None
+        self.text_browser.document().setDefaultStyleSheet(
+            self.renderer.get_document_css()
+        )
+        self._chunked_view = ChunkedView(
+            self.text_browser,
+            chunked,
+            self.renderer.wrap_body,
+            self.renderer._copy_buffer,
+            profiler=self.profiler,
+            parent=self,
+        )
+        self._chunked_view.show_section(start_section)
+
+    def _clear_chunked_view(self):
+        """Drop the sliding-window view of a large document, if one is active."""
+        if self._chunked_view is not None:
+            self._chunked_view.detach()
+            self._chunked_view.deleteLater()
+            self._chunked_view = None
+
+    def _patch_document(self, document):
+        """Replace only the changed blocks of the displayed document.
+
+        Blocks are matched by their anchor names; the unchanged leading and
+        trailing runs stay in the QTextDocument untouched, which keeps layout
+        work proportional to the edit. Returns False when the caller should
+        fall back to a full setHtml().
+        """
+        old_blocks = self._displayed_blocks
+        new_blocks = document.blocks
+        if not old_blocks or not new_blocks:
+            return False
 
-            self.content_stack.setCurrentIndex(0)
-            self.current_file = file_path
-            self.setWindowTitle(f"MDviewer v{__version__}  |  {os.path.basename(file_path)}")
-            self.status_bar.showMessage(f"Opened: {file_path}")
-            self.add_to_recent_files(file_path)
-            self._update_pdf_menu_states()
+        old_names = [name for name, _ in old_blocks]
+        new_names = [name for name, _ in new_blocks]
+        if old_names == new_names:
+            self._current_body_html = document.body_html
+            self._displayed_blocks = new_blocks
             return True
-        except Exception as e:
-            self.status_bar.showMessage(f"Error loading {file_path}: {str(e)}")
-            QMessageBox.critical(self, "Error", f"Could not open file: {str(e)}")
+
+        limit = min(len(old_names), len(new_names))
+        prefix = 0
+        while prefix < limit and old_names[prefix] == new_names[prefix]:
+            prefix += 1
+        suffix = 0
+        while (suffix < limit - prefix
+               and old_names[-1 - suffix] == new_names[-1 - suffix]):
+            suffix += 1
+
+        # The patch is spliced in after the last unchanged leading block, so
+        # there must be one; and rewriting most of the document is no cheaper
+        # than replacing it outright
+        changed = len(new_names) - prefix - suffix
+        if prefix == 0 or changed * 2 > len(new_names):
             return False
 
+        doc = self.text_browser.document()
+        positions = anchor_positions(doc)
+        start = positions.get(old_names[prefix]) if prefix < len(old_names) else None
+        if suffix:
+            end = positions.get(old_names[len(old_names) - suffix])
+        else:
+            end = doc.characterCount()
+        if start is None and prefix == len(old_names) - suffix:
+            start = end
+        if start is None or end is None or start > end:
+            return False
+
+        with profile_stage("layout"):
+            cursor = QTextCursor(doc)
+            cursor.beginEditBlock()
+            # Select from the end of the last kept block up to the end of the last
+            # replaced one, so the paragraph separator before the kept trailing
+            # block survives and no block formats get merged
+            cursor.setPosition(start - 1)
+            cursor.setPosition(end - 1, QTextCursor.MoveMode.KeepAnchor)
+            cursor.removeSelectedText()
+            if changed:
+                new_html = "".join(html for _, html in new_blocks[prefix:len(new_blocks) - suffix])
+                wrapped = self.renderer.wrap_body(new_html, document.hide_paragraph_marks)
+                # A leading placeholder paragraph absorbs the merge with the
+                # preceding block; it is removed once the new blocks are in place
+                cursor.insertFragment(
+                    QTextDocumentFragment.fromHtml("<p>\u200b</p>" + wrapped, doc)
+                )
+                cursor.setPosition(start - 1)
+                cursor.setPosition(start, QTextCursor.MoveMode.KeepAnchor)
+                cursor.removeSelectedText()
+            cursor.endEditBlock()
+
+        self._current_body_html = document.body_html
+        self._displayed_blocks = new_blocks
+        return True
+
+    def _restyle_current_document(self):
+        """Re-apply theme CSS to the current document without re-parsing markdown."""
+        if self._is_pdf_mode():
+            return
+        cycle = self.profiler.new_cycle("restyle")
+        with activate_profile(cycle):
+            if self.current_file and self._chunked_view is not None:
+                self.text_browser.document().setDefaultStyleSheet(
+                    self.renderer.get_document_css()
+                )
+                self._chunked_view.reload()
+            elif self.current_file and self._current_body_html is not None:
+                scroll_pos = self.text_browser.verticalScrollBar().value()
+                self._display_body(self._current_body_html, self._displayed_blocks)
+                self.text_browser.verticalScrollBar().setValue(scroll_pos)
+            else:
+                self.show_welcome_message()
+        self.profiler.finish(cycle)
+
     def _load_pdf_file(self, file_path):
         """Load a PDF file into the PDF viewer."""
-        success = self.pdf_viewer.load_pdf(file_path)
+        self._cancel_pending_render(self._active_tab)
+        success = self._ensure_pdf_viewer().load_pdf(file_path)
         if success:
+            self._clear_chunked_view()
             page_count = self.pdf_viewer._document.pageCount()
             self.content_stack.setCurrentIndex(1)
             self.current_file = file_path
+            tab = self._active_tab
+            tab.file_path = file_path
+            tab.is_pdf = True
+            tab.needs_render = False
+            self._update_tab_title(tab)
             self.setWindowTitle(f"MDviewer v{__version__}  |  {os.path.basename(file_path)}")
             self.status_bar.showMessage(
                 f"Page 1 of {page_count}  —  {os.path.basename(file_path)}"
             )
             self.add_to_recent_files(file_path)
             self._update_pdf_menu_states()
+            self._update_file_watch()
             return True
         else:
             QMessageBox.critical(
@@ -1142,13 +1662,183 @@ class MainWindow(QMainWindow):
             f"Page {current_page} of {page_count}  —  {os.path.basename(self.current_file)}"
         )
 
+    def open_file_in_tab(self, file_path, anchor=None):
+        """Show a file in a tab: its existing tab, the welcome tab, or a new one.
+
+        With ``anchor`` the document is scrolled to that heading id ("" for
+        the top) once it is displayed.
+        """
+        file_path = os.path.abspath(file_path)
+        for index, tab in enumerate(self.tabs):
+            if tab.file_path and os.path.abspath(tab.file_path) == file_path:
+                tab.anchor = anchor
+                if tab is self._active_tab:
+                    if tab.request_id is None:
+                        self._scroll_to_pending_anchor(tab)
+                else:
+                    self.tab_bar.setCurrentIndex(index)
+                return True
+        if self._active_tab is None or self._active_tab.file_path is None:
+            if self._active_tab is not None:
+                self._active_tab.anchor = anchor
+            return self.load_file_from_path(file_path)
+        if not os.path.isfile(file_path):
+            return self.load_file_from_path(file_path)  # reports the missing file
+        tab = self._new_tab(file_path, activate=False)
+        tab.anchor = anchor
+        self.tab_bar.setCurrentIndex(self.tabs.index(tab))
+        return True
+
+    def _new_tab(self, file_path=None, activate=True, index=None):
+        """Add a tab for file_path (welcome page if None); it renders when shown."""
+        tab = DocumentTab(file_path)
+        if index is None:
+            index = len(self.tabs)
+        self.tabs.insert(index, tab)
+        self.tab_bar.insertTab(index, tab.title)
+        self.tab_bar.setTabToolTip(index, file_path or "")
+        if activate:
+            self.tab_bar.setCurrentIndex(index)
+        return tab
+
+    def close_tab(self, index):
+        """Close the tab at index; closing the last tab returns to the welcome page."""
+        if not 0 <= index < len(self.tabs):
+            return
+        tab = self.tabs[index]
+        self._cancel_pending_render(tab)
+        if tab is self._active_tab:
+            self._clear_chunked_view()
+            self._active_tab = None
+        if len(self.tabs) == 1:
+            self.tabs[0] = DocumentTab()
+            self._update_tab_title(self.tabs[0])
+            self._show_tab(self.tabs[0])
+        else:
+            self.tabs.pop(index)
+            # Shows the neighbouring tab before this one's document goes away
+            self.tab_bar.removeTab(index)
+        tab.drop_document()
+
+    def _cycle_tabs(self, step):
+        if len(self.tabs) > 1:
+            self.tab_bar.setCurrentIndex((self.tab_bar.currentIndex() + step) % len(self.tabs))
+
+    def _on_tab_moved(self, from_index, to_index):
+        self.tabs.insert(to_index, self.tabs.pop(from_index))
+
+    def _on_tab_changed(self, index):
+        if not 0 <= index < len(self.tabs):
+            return
+        tab = self.tabs[index]
+        if tab is self._active_tab:
+            return
+        self._stash_active_tab()
+        self._show_tab(tab)
+
+    def _update_tab_title(self, tab):
+        index = self.tabs.index(tab)
+        self.tab_bar.setTabText(index, tab.title)
+        self.tab_bar.setTabToolTip(index, tab.file_path or "")
+
+    def _stash_active_tab(self):
+        """Keep the active document's view state in its tab before switching away."""
+        tab = self._active_tab
+        if tab is None:
+            return
+        tab.scroll_pos = self.text_browser.verticalScrollBar().value()
+        tab.copy_buffer = self.renderer._copy_buffer
+        if tab.is_pdf:
+            return
+        tab.body_html = self._current_body_html
+        tab.blocks = self._displayed_blocks
+        if self._chunked_view is not None:
+            tab.chunked = self._chunked_view.document
+            tab.chunk_section = self._chunked_view.top_section()
+            self._clear_chunked_view()
+        else:
+            tab.chunked = None
+
+    def _show_tab(self, tab):
+        """Make tab the active document, laying it out or rendering it as needed."""
+        self._active_tab = tab
+        tab.touch()
+        self.text_browser.setExtraSelections([])
+        self.current_file = tab.file_path
+        self.renderer._copy_buffer = tab.copy_buffer
+        self._current_body_html = tab.body_html
+        self._displayed_blocks = tab.blocks
+        self.render_progress.setVisible(tab.request_id is not None)
+
+        if tab.is_pdf:
+            # PDF tabs share the one PDF viewer, which reopens the file
+            self._load_pdf_file(tab.file_path)
+            return
+
+        self.content_stack.setCurrentIndex(0)
+        if tab.document is None:
+            # Parented to the browser so its images load through it
+            tab.document = QTextDocument(self.text_browser)
+            laid_out = False
+        else:
+            # Laid out before; only valid if the theme has not changed since
+            laid_out = (
+                tab.document.defaultStyleSheet() == self.renderer.get_document_css()
+                or not tab.has_render()
+            )
+        # Zooming only reaches the active document
+        self.zoom.prepare_document(tab.document, tab.file_path)
+        self.text_browser.setDocument(tab.document)
+        self._update_pdf_menu_states()
+
+        if tab.file_path is None:
+            self.setWindowTitle(f"MDviewer v{__version__}")
+            self.show_welcome_message()
+            self._update_file_watch()
+            return
+
+        self.setWindowTitle(f"MDviewer v{__version__}  |  {tab.title}")
+        stale = tab.needs_render or tab.hide_paragraph_marks != self.hide_paragraph_marks
+        if not stale and self.auto_reload:
+            stale = _file_signature(tab.file_path) != tab.signature
+        if stale:
+            if tab.request_id is None:
+                self._load_markdown_file(tab.file_path, scroll_pos=tab.scroll_pos)
+        elif tab.chunked is not None:
+            self._display_chunked(tab.chunked, tab.chunk_section)
+        elif not laid_out:
+            cycle = self.profiler.new_cycle(f"tab {tab.title}")
+            with activate_profile(cycle):
+                self._display_body(tab.body_html, tab.blocks)
+            self.text_browser.verticalScrollBar().setValue(tab.scroll_pos)
+            self.profiler.finish(cycle)
+        else:
+            self.text_browser.verticalScrollBar().setValue(tab.scroll_pos)
+        if not stale:
+            self._scroll_to_pending_anchor(tab)
+            self.status_bar.showMessage(tab.file_path)
+        self._update_file_watch()
+        self._enforce_layout_budget()
+
+    def _scroll_to_pending_anchor(self, tab):
+        """Scroll to the heading tab was opened at, if any, now that it is displayed."""
+        anchor, tab.anchor = tab.anchor, None
+        if anchor is not None:
+            self._show_anchor(anchor)
+
+    def _enforce_layout_budget(self):
+        """Drop laid-out documents of least recently viewed tabs beyond the budget."""
+        enforce_layout_budget(self.tabs, self._active_tab, self.tab_layout_budget)
+
     def load_last_opened_file(self):
         """Load the last opened file from settings."""
         last_file = self.settings.value("last_opened_file")
         if last_file and os.path.exists(last_file):
             try:
-                if self.load_file_from_path(last_file):
-                    self.status_bar.showMessage(f"Restored: {last_file}")
+                if self.load_file_from_path(last_file, status_prefix="Restored"):
+                    if self._is_pdf_mode():
+                        self.status_bar.showMessage(f"Restored: {last_file}")
+                    self._restore_other_tabs(last_file)
                     return
             except Exception:
                 pass
@@ -1156,6 +1846,21 @@ class MainWindow(QMainWindow):
         # Show welcome message if no last file or loading failed
         self.show_welcome_message()
 
+    def _restore_other_tabs(self, last_file):
+        """Reopen the other tabs of the last session around last_file.
+
+        They are only rendered once they are shown.
+        """
+        open_tabs = self.settings.value("open_tabs", [])
+        if not isinstance(open_tabs, list) or last_file not in open_tabs:
+            return
+        position = open_tabs.index(last_file)
+        for offset, file_path in enumerate(open_tabs):
+            if file_path == last_file or not os.path.isfile(file_path):
+                continue
+            index = self.tabs.index(self._active_tab) if offset < position else len(self.tabs)
+            self._new_tab(file_path, activate=False, index=index)
+
     def show_welcome_message(self):
         colors = self.renderer.get_effective_colors(self.current_theme)
         welcome_html = f"""
@@ -1172,6 +1877,10 @@ class MainWindow(QMainWindow):
             </ul>
         </div>
         """
+        self._clear_chunked_view()
+        self._current_body_html = None
+        self._displayed_blocks = None
+        self.text_browser.document().setDefaultStyleSheet("")
         self.text_browser.setHtml(welcome_html)
 
     def open_file(self):
@@ -1183,10 +1892,12 @@ class MainWindow(QMainWindow):
         )
 
         if file_path:
-            self.load_file_from_path(file_path)
+            self.open_file_in_tab(file_path)
 
     def show_file_info(self):
         """Show file information dialog for the current document"""
+        from .file_info_dialog import FileInfoDialog
+
         if not self.current_file:
             QMessageBox.information(
                 self, "No File",
@@ -1229,6 +1940,8 @@ class MainWindow(QMainWindow):
 
     def open_in_editor(self):
         """Open current document in an external text editor"""
+        from .external_editor import open_in_external_editor
+
         if not self.current_file:
             QMessageBox.information(
                 self, "No File",
@@ -1248,6 +1961,8 @@ class MainWindow(QMainWindow):
 
     def change_editor(self):
         """Let user select a different preferred editor"""
+        from .external_editor import change_preferred_editor, _launch_editor as launch_editor
+
         # Clear saved preference so the picker always appears
         self.settings.remove("external_editor")
         editor = change_preferred_editor(self, self.settings)
@@ -1264,28 +1979,19 @@ class MainWindow(QMainWindow):
         if self._is_pdf_mode():
             self.pdf_viewer.zoom_in()
             return
-        current_font = self.text_browser.font()
-        current_size = current_font.pointSize()
-        if current_size < 24:
-            current_font.setPointSize(current_size + 1)
-            self.text_browser.setFont(current_font)
+        self.zoom.zoom_by(1)
 
     def zoom_out(self):
         if self._is_pdf_mode():
             self.pdf_viewer.zoom_out()
             return
-        current_font = self.text_browser.font()
-        current_size = current_font.pointSize()
-        if current_size > 6:
-            current_font.setPointSize(current_size - 1)
-            self.text_browser.setFont(current_font)
+        self.zoom.zoom_by(-1)
 
     def reset_zoom(self):
         if self._is_pdf_mode():
             self.pdf_viewer.reset_zoom()
             return
-        font = QFont("Consolas", 11)
-        self.text_browser.setFont(font)
+        self.zoom.zoom_to(DEFAULT_POINT_SIZE)
 
     def load_recent_files(self):
         """Load recent files from QSettings."""
@@ -1368,7 +2074,7 @@ class MainWindow(QMainWindow):
     def open_recent_file(self, file_path):
         """Open a recent file."""
         if os.path.exists(file_path):
-            self.load_file_from_path(file_path)
+            self.open_file_in_tab(file_path)
         else:
             QMessageBox.warning(
                 self, "File Not Found", f"The file {file_path} no longer exists."
@@ -1452,7 +2158,7 @@ class MainWindow(QMainWindow):
         )
 
         if file_path:
-            self.load_file_from_path(file_path)
+            self.open_file_in_tab(file_path)
 
     def clear_recent_directories(self):
         """Clear the recent directories list."""
@@ -1475,6 +2181,17 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         """Handle window close event."""
+        # Let background renders stop before their QThread objects go away
+        self.file_watcher.unwatch()
+        self._cancel_pending_render()
+        for worker in list(self._render_workers):
+            worker.wait()
+        self.text_browser.image_loader.shutdown()
+        if self.find_dialog is not None:
+            self.find_dialog.cancel_search(wait=True)
+        if self.find_in_files_dialog is not None:
+            self.find_in_files_dialog.cancel_search(wait=True)
+
         # Save window settings when closing
         self.save_window_settings()
         self.save_recent_files()
@@ -1488,9 +2205,12 @@ class MainWindow(QMainWindow):
         # Save custom color overrides
         self.save_custom_colors()
 
-        # Save current file for restore on startup
+        # Save current file and the other open tabs for restore on startup
         if self.current_file:
             self.settings.setValue("last_opened_file", self.current_file)
+        self.settings.setValue(
+            "open_tabs", [tab.file_path for tab in self.tabs if tab.file_path]
+        )
         super().closeEvent(event)
 
     def show_quick_reference(self):
@@ -1505,7 +2225,7 @@ class MainWindow(QMainWindow):
             os.path.dirname(os.path.dirname(__file__)), "CHANGELOG.md"
         )
         if os.path.exists(changelog_path):
-            self.load_file_from_path(changelog_path)
+            self.open_file_in_tab(changelog_path)
         else:
             QMessageBox.warning(
                 self, "File Not Found", f"Changelog file not found: {changelog_path}"
@@ -1525,7 +2245,7 @@ class MainWindow(QMainWindow):
         if hasattr(self, "text_browser"):
             self._apply_text_browser_stylesheet()
 
-        if hasattr(self, "pdf_viewer"):
+        if self.pdf_viewer is not None:
             self.pdf_viewer.apply_theme(theme_name, self.renderer)
 
     def switch_theme(self, theme_name):
@@ -1543,8 +2263,8 @@ class MainWindow(QMainWindow):
         self.renderer.current_theme = theme_name
         self._apply_custom_colors_to_renderer()
 
-        # Reload current document
-        self._refresh_current_document()
+        # Re-style current document; the rendered body does not depend on theme
+        self._restyle_current_document()
 
         # Save theme preference
         self.settings.setValue("current_theme", theme_name)
@@ -1644,7 +2364,7 @@ class MainWindow(QMainWindow):
         self._apply_custom_colors_to_renderer()
         
         # Refresh display
-        self._refresh_current_document()
+        self._restyle_current_document()
         self._apply_text_browser_stylesheet()
 
     def _apply_custom_colors_to_renderer(self):
@@ -1693,34 +2413,118 @@ class MainWindow(QMainWindow):
         scheme = url.scheme()
         if scheme == 'copy':
             # Copy the code block text stored in the renderer buffer
-            # URL is "copy:N" so path() returns the numeric ID directly
-            try:
-                copy_id = int(url.path())
-                text = self.renderer._copy_buffer.get(copy_id, '')
-                if text:
-                    QApplication.clipboard().setText(text)
-                    self.status_bar.showMessage("Code copied to clipboard", 2000)
-            except (ValueError, AttributeError):
-                pass
+            # URL is "copy:ID" so path() returns the ID directly
+            text = self.renderer._copy_buffer.get(url.path(), '')
+            if text:
+                QApplication.clipboard().setText(text)
+                self.status_bar.showMessage("Code copied to clipboard", 2000)
         elif not scheme and url.fragment():
             # Internal anchor navigation (e.g. TOC links)
-            self.text_browser.scrollToAnchor(url.fragment())
+            self._show_anchor(url.fragment())
         elif scheme in ('http', 'https', 'ftp', 'mailto'):
             QDesktopServices.openUrl(url)
 
+    def _show_anchor(self, anchor):
+        """Scroll to a heading id ("" for the top of the document).
+
+        In a large document the target section may have to be loaded first.
+        """
+        if not anchor:
+            if self._chunked_view is not None:
+                self._chunked_view.show_section(0)
+            self.text_browser.verticalScrollBar().setValue(0)
+        elif not (self._chunked_view is not None and self._chunked_view.show_anchor(anchor)):
+            self.text_browser.scrollToAnchor(anchor)
+
     def _refresh_current_document(self):
         """Re-render and display the current document or welcome message."""
         if self._is_pdf_mode():
             return
         if self.current_file:
-            scroll_pos = self.text_browser.verticalScrollBar().value()
-            self.load_file_from_path(self.current_file)
-            self.text_browser.verticalScrollBar().setValue(scroll_pos)
+            self._reload_current_file()
         else:
             self.show_welcome_message()
 
+    def _reload_current_file(self, status_prefix="Opened"):
+        """Re-render the current file in the background, keeping the scroll position."""
+        scroll_pos = self.text_browser.verticalScrollBar().value()
+        self.load_file_from_path(
+            self.current_file, scroll_pos=scroll_pos, status_prefix=status_prefix
+        )
+
+    def toggle_auto_reload(self):
+        """Toggle reloading the current document when it changes on disk."""
+        self.auto_reload = not self.auto_reload
+        self.settings.setValue("auto_reload", self.auto_reload)
+        self._update_file_watch()
+        state = "on" if self.auto_reload else "off"
+        self.status_bar.showMessage(f"Auto-reload {state}", 2000)
+
+    def toggle_full_size_images(self):
+        """Toggle decoding images at full resolution instead of fitting them to the page."""
+        enabled = not self.text_browser.full_size_images
+        self.text_browser.set_full_size_images(enabled)
+        self.settings.setValue("full_size_images", enabled)
+        state = "at full size" if enabled else "fitted to the window"
+        self.status_bar.showMessage(f"Images shown {state}", 2000)
+
+    def _update_file_watch(self):
+        """Point the file watcher at the current markdown file, if auto-reload is on."""
+        if self.auto_reload and self.current_file and not self._is_pdf_mode():
+            self.file_watcher.watch(self.current_file)
+        else:
+            self.file_watcher.unwatch()
+
+    def _on_watched_file_changed(self, file_path):
+        """Reload the current document after it was saved on disk."""
+        if self._is_pdf_mode() or not self.current_file:
+            return
+        if os.path.abspath(self.current_file) != file_path:
+            return
+        # Renders run on a worker and a newer reload supersedes an older one,
+        # so a burst of saves never queues up renders
+        self._reload_current_file(status_prefix="Reloaded")
+
+    def toggle_profiling(self):
+        """Toggle recording per-stage timings of every render."""
+        self.profiler.set_enabled(not self.profiler.enabled)
+        state = "on" if self.profiler.enabled else "off"
+        self.status_bar.showMessage(f"Render profiling {state}", 2000)
+
+    def _on_profile_cycle_finished(self, cycle):
+        """Show the latest render breakdown in the status bar."""
+        self.status_bar.showMessage(cycle.summary())
+
+    def export_render_profile(self):
+        """Save the recorded render history as JSON or a Chrome trace."""
+        if not self.profiler.history:
+            QMessageBox.information(
+                self, "Export Render Profile",
+                "No renders have been profiled yet. Turn on View → Profile Rendering "
+                "and open or refresh a document first."
+            )
+            return
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Export Render Profile",
+            "mdviewer-profile.trace.json",
+            "Chrome Trace (*.trace.json);;JSON (*.json)",
+        )
+        if not file_path:
+            return
+        if selected_filter.startswith("Chrome") and not file_path.endswith(".trace.json"):
+            file_path = os.path.splitext(file_path)[0] + ".trace.json"
+        try:
+            self.profiler.export(file_path)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Could not save profile: {e}")
+            return
+        self.status_bar.showMessage(f"Render profile saved: {file_path}", 5000)
+
     def show_color_settings(self):
         """Open the color customization dialog."""
+        from .color_settings_dialog import ColorSettingsDialog
+
         # Get effective colors (theme defaults + custom overrides)
         registry = get_theme_registry()
         theme_obj = registry.get_theme(self.current_theme)
@@ -1767,7 +2571,7 @@ class MainWindow(QMainWindow):
         else:
             self._apply_custom_colors_to_renderer()
             self.save_custom_colors()
-            self._refresh_current_document()
+            self._restyle_current_document()
             self._apply_text_browser_stylesheet()
 
     def _on_colors_changed(self, colors_dict):
@@ -1789,7 +2593,7 @@ class MainWindow(QMainWindow):
                 overrides[key] = val
 
         self.renderer.custom_colors = overrides
-        self._refresh_current_document()
+        self._restyle_current_document()
         self._apply_text_browser_stylesheet()
 
     def setup_find_dialog(self):
@@ -1810,8 +2614,33 @@ class MainWindow(QMainWindow):
         self.find_dialog.raise_()
         self.find_dialog.activateWindow()
 
+    def show_find_in_files_dialog(self):
+        """Show the Find in Files dialog for the recent directories"""
+        from .find_in_files_dialog import FindInFilesDialog
+
+        dialog = self.find_in_files_dialog
+        if dialog is None or dialog.theme != self.current_theme:
+            query = ""
+            if dialog is not None:
+                query = dialog.search_input.text()
+                # Its index worker must stop before another one may start
+                dialog.cancel_search(wait=True)
+                dialog.deleteLater()
+            dialog = self.find_in_files_dialog = FindInFilesDialog(
+                lambda: self.recent_directories, self.file_indexes, self,
+                theme=self.current_theme,
+            )
+            dialog.search_input.setText(query)
+            dialog.open_requested.connect(self.open_file_in_tab)
+
+        dialog.show()
+        dialog.raise_()
+        dialog.activateWindow()
+
     def _on_get_latest_updates(self):
         """Handler for 'Get Latest Version' menu action"""
+        from .update_dialogs import UpdateProgressDialog
+
         # Show progress dialog
         progress_dialog = UpdateProgressDialog(self)
         progress_dialog.update_status("Checking for updates...")
@@ -1851,6 +2680,8 @@ class MainWindow(QMainWindow):
 
     def _check_timeout(self, progress_dialog):
         """Handle timeout if check takes too long"""
+        from .update_dialogs import ErrorDialog
+
         if progress_dialog.isVisible():
             print("[DEBUG] Update check timed out")
             progress_dialog.close()
@@ -1915,12 +2746,16 @@ class MainWindow(QMainWindow):
 
     def _show_up_to_date_dialog(self, progress_dialog, current_version):
         """Show up-to-date dialog (runs on main thread)"""
+        from .update_dialogs import UpToDateDialog
+
         progress_dialog.close()
         up_to_date_dialog = UpToDateDialog(current_version, self)
         up_to_date_dialog.exec()
 
     def _show_comparison_dialog(self, progress_dialog, check_result):
         """Show version comparison dialog (runs on main thread)"""
+        from .update_dialogs import VersionCompareDialog
+
         progress_dialog.close()
         update_method = "git" if self.is_git_install else "download"
         comparison_dialog = VersionCompareDialog(check_result, self, update_method)
@@ -1936,12 +2771,16 @@ class MainWindow(QMainWindow):
 
     def _show_check_error(self, progress_dialog, error_message):
         """Show error dialog for update check failures (runs on main thread)"""
+        from .update_dialogs import ErrorDialog
+
         progress_dialog.close()
         error_dialog = ErrorDialog(f"Error checking for updates: {error_message}", self)
         error_dialog.exec()
 
     def _perform_update(self):
         """Perform the actual update process"""
+        from .update_dialogs import UpdateProgressDialog
+
         progress_dialog = UpdateProgressDialog(self)
 
         # Update message based on installation type
@@ -1968,6 +2807,8 @@ class MainWindow(QMainWindow):
 
     def _show_update_result(self, update_result, progress_dialog):
         """Show update result dialog"""
+        from .update_dialogs import UpdateResultDialog
+
         progress_dialog.close()
 
         # Convert ReleaseDownloadResult to GitUpdateResult format for dialog compatibility
@@ -2000,11 +2841,16 @@ class MainWindow(QMainWindow):
 
     def _show_update_error(self, error_message, progress_dialog):
         """Show update error dialog"""
+        from .update_dialogs import ErrorDialog
+
         progress_dialog.close()
         error_dialog = ErrorDialog(f"Update failed: {error_message}", self)
         error_dialog.exec()
 
     def show_about(self):
+        from pyqt_app_info import AppIdentity, gather_info
+        from pyqt_app_info.qt import AboutDialog
+
         identity = AppIdentity(
             name="MDviewer",
             version=__version__,
@@ -1,46 +1,472 @@
+import hashlib
 import markdown
+from markdown.extensions.attr_list import get_attrs_and_remainder
+from markdown.extensions.codehilite import CodeHilite, HiliteTreeprocessor, parse_hl_lines
+from markdown.extensions.fenced_code import FencedBlockPreprocessor
 from pygments import highlight
-from pygments.lexers import get_lexer_by_name, guess_lexer
+from pygments.lexers import get_lexer_by_name
+from pygments.lexers.special import TextLexer
 from pygments.formatters import HtmlFormatter
+from pygments.util import ClassNotFound
 import re
 import os
+import threading
+import xml.etree.ElementTree as etree
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 # Import theme manager for centralized theme handling
 from .theme_manager import get_theme_registry
+from .render_cache import RenderCache, content_hash
+from .profiler import stage as profile_stage
+
+
+@lru_cache(maxsize=256)
+def _lexer_for(lang):
+    """Return a (reusable) Pygments lexer for a language name, or None if unknown."""
+    try:
+        return get_lexer_by_name(lang)
+    except ClassNotFound:
+        return None
+
+
+class CachedCodeHilite(CodeHilite):
+    """CodeHilite that reuses highlighted HTML for code it has seen before.
+
+    Results are kept in a shared RenderCache keyed by language, formatting
+    options and a hash of the source, so re-rendering a document (theme
+    switch, reload, paragraph-mark toggle) skips Pygments for unchanged
+    blocks. Lexers come from a cached name lookup; unlabeled code is shown
+    as plain text instead of running guess_lexer over it.
+    """
+
+    def __init__(self, src, cache=None, **options):
+        super().__init__(src, **options)
+        self.cache = cache
+
+    def hilite(self, shebang=True):
+        self.src = self.src.strip("\n")
+        if self.lang is None and shebang:
+            self._parseHeader()
+
+        lang = (self.lang or "").lower()
+        key = (
+            lang,
+            self.options["cssclass"],
+            self.options["linenos"],
+            tuple(self.options.get("hl_lines") or ()),
+            content_hash(self.src),
+        )
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        lexer = (_lexer_for(lang) if lang else None) or TextLexer()
+        with profile_stage("highlight"):
+            html = highlight(self.src, lexer, HtmlFormatter(**self.options))
+        if self.cache is not None:
+            self.cache.put(key, html, len(html))
+        return html
 
 
 class CodeBlockExtension(markdown.extensions.Extension):
-    """Extension to handle code blocks with syntax highlighting using Pygments."""
+    """Extension to handle code blocks with syntax highlighting using Pygments.
+
+    Handles both fenced and indented code blocks. The source of each block is
+    recorded in ``md.copy_buffer`` (copy id -> plain code) while it is parsed,
+    and the highlighted HTML is stashed already wrapped with its Copy link, so
+    the finished HTML never needs a second pass.
+    """
+
+    def __init__(self, highlight_cache=None, **kwargs):
+        self.config = {
+            "css_class": ["highlight", "CSS class of the highlighted <div>"],
+        }
+        super().__init__(**kwargs)
+        self.highlight_cache = highlight_cache
 
     def extendMarkdown(self, md):
-        pattern = re.compile(r"```(\w+)?\n(.*?)\n```", re.DOTALL)
-        md.treeprocessors.register(CodeBlockProcessor(pattern), "codeblock", 200)
+        md.copy_buffer = {}
+        md.preprocessors.register(FencedCodePreprocessor(md, self), "fenced_code_block", 25)
+        md.treeprocessors.register(IndentedCodeProcessor(md, self), "hilite", 30)
+
+    def stash_code(self, md, code, lang=None, shebang=False, hl_lines=None):
+        """Highlight code, add its Copy link and return the stash placeholder."""
+        hiliter = CachedCodeHilite(
+            code,
+            cache=self.highlight_cache,
+            lang=lang,
+            css_class=self.getConfig("css_class"),
+            tab_length=md.tab_length,
+            hl_lines=hl_lines or [],
+        )
+        highlighted = hiliter.hilite(shebang=shebang)
+
+        # hilite() drops a "#!lang" header line from src, as it does on screen
+        plain = hiliter.src.strip()
+        if plain:
+            with profile_stage("copy_buttons"):
+                # Ids come from the code itself, so they stay unique when
+                # separately rendered blocks are stitched into one document
+                copy_id = hashlib.sha1(plain.encode("utf-8")).hexdigest()[:16]
+                md.copy_buffer[copy_id] = plain
+                highlighted = (
+                    f'<div>'
+                    f'<div style="text-align:right; padding-bottom:2px;">'
+                    f'<a href="copy:{copy_id}" class="copy-btn">Copy</a>'
+                    f'</div>'
+                    f'{highlighted.rstrip()}'
+                    f'</div>\n'
+                )
+        return md.htmlStash.store(highlighted)
+
+
+class FencedCodePreprocessor(FencedBlockPreprocessor):
+    """Replace fenced code blocks with stashed, highlighted HTML."""
+
+    def __init__(self, md, extension):
+        super().__init__(md, {})
+        self.extension = extension
+
+    def run(self, lines):
+        # First processor to see each document, so start its copy buffer here
+        self.md.copy_buffer = {}
+
+        text = "\n".join(lines)
+        # The output is assembled from pieces rather than by splicing each
+        # placeholder into the text, which copied the whole document once
+        # per code block
+        parts = []
+        copied = 0
+        index = 0
+        while True:
+            m = self.FENCED_BLOCK_RE.search(text, index)
+            if not m:
+                break
+            lang = m.group("lang") or None
+            hl_lines = None
+            if m.group("attrs"):
+                attrs, remainder = get_attrs_and_remainder(m.group("attrs"))
+                if remainder:
+                    # Unbalanced braces: not a valid fence, skip past it
+                    index = m.end("attrs")
+                    continue
+                _, classes, config = self.handle_attrs(attrs)
+                lang = classes[0] if classes else None
+                hl_lines = config.get("hl_lines")
+            elif m.group("hl_lines"):
+                hl_lines = parse_hl_lines(m.group("hl_lines"))
+
+            placeholder = self.extension.stash_code(
+                self.md, m.group("code"), lang, hl_lines=hl_lines
+            )
+            parts.append(text[copied:m.start()])
+            parts.append(f"\n{placeholder}\n")
+            copied = index = m.end()
+        parts.append(text[copied:])
+        return "".join(parts).split("\n")
+
+
+class IndentedCodeProcessor(HiliteTreeprocessor):
+    """Replace indented code blocks with stashed, highlighted HTML."""
+
+    def __init__(self, md, extension):
+        super().__init__(md)
+        self.extension = extension
+
+    def run(self, root):
+        for block in root.iter("pre"):
+            if len(block) == 1 and block[0].tag == "code" and block[0].text is not None:
+                code = self.code_unescape(block[0].text)
+                placeholder = self.extension.stash_code(self.md, code, shebang=True)
+                # The placeholder paragraph is replaced by the raw HTML later
+                block.clear()
+                block.tag = "p"
+                block.text = placeholder
+
+
+class ParagraphMarkExtension(markdown.extensions.Extension):
+    """Extension that marks the end of headings, paragraphs, list items and quotes."""
+
+    def extendMarkdown(self, md):
+        # Runs after toc (priority 5) so heading marks follow the permalink
+        md.treeprocessors.register(ParagraphMarkProcessor(md), "paragraph_marks", 4)
+
+
+class ParagraphMarkProcessor(markdown.treeprocessors.Treeprocessor):
+    """Append a paragraph-mark span to text blocks in a single tree walk.
+
+    Elements that contain nested blocks (a loose list item, a blockquote) get
+    the mark before their first nested block, or none if they start with one;
+    the nested blocks are marked themselves. When ``hidden`` is set no marks
+    are added and heading permalinks are dropped instead, since CSS hiding
+    doesn't work reliably in QTextBrowser.
+    """
+
+    MARKED_TAGS = frozenset(("h1", "h2", "h3", "h4", "h5", "h6", "p", "li", "blockquote"))
+    BLOCK_TAGS = frozenset((
+        "h1", "h2", "h3", "h4", "h5", "h6", "p", "ul", "ol", "li", "blockquote",
+        "pre", "div", "table", "hr", "dl",
+    ))
+    CONTAINER_TAGS = frozenset(("ul", "ol", "li", "blockquote", "div"))
+    PLACEHOLDER_RE = re.compile(
+        "^" + markdown.util.HTML_PLACEHOLDER % r"[0-9]+" + "$"
+    )
+
+    def __init__(self, md):
+        super().__init__(md)
+        self.hidden = False
+
+    def run(self, root):
+        with profile_stage("paragraph_marks"):
+            if self.hidden:
+                self._remove_headerlinks(root)
+            else:
+                self._mark_blocks(root)
+
+    def _mark_blocks(self, parent):
+        # Only block containers are descended into; inline markup is skipped
+        for el in parent:
+            tag = el.tag
+            if tag in self.CONTAINER_TAGS:
+                self._mark_blocks(el)
+            if tag in self.MARKED_TAGS:
+                self._mark_element(el)
+
+    def _mark_element(self, el):
+        text = (el.text or "").strip()
+        if len(el) == 0:
+            # Stashed code blocks and raw HTML are swapped back in only when
+            # their placeholder is the paragraph's sole content
+            if text and not self.PLACEHOLDER_RE.match(text):
+                el.append(self._mark())
+            return
+
+        for index, child in enumerate(el):
+            if child.tag in self.BLOCK_TAGS:
+                if index > 0 or text:
+                    el.insert(index, self._mark())
+                return
+        el.append(self._mark())
+
+    @staticmethod
+    def _mark():
+        mark = etree.Element("span", {"class": "paragraph-mark"})
+        mark.text = "."
+        return mark
+
+    def _remove_headerlinks(self, root):
+        for heading in root.iter():
+            if heading.tag not in ("h1", "h2", "h3", "h4", "h5", "h6"):
+                continue
+            children = list(heading)
+            for index, child in enumerate(children):
+                if child.tag == "a" and child.get("class") == "headerlink":
+                    if child.tail:
+                        if index > 0:
+                            previous = children[index - 1]
+                            previous.tail = (previous.tail or "") + child.tail
+                        else:
+                            heading.text = (heading.text or "") + child.tail
+                    heading.remove(child)
+
 
+# Image sources left as they are: remote, already absolute or inline
+_UNRESOLVED_SRC_PREFIXES = ('http://', 'https://', 'ftp://', 'file://', 'data:', '/')
+# Relative paths with nothing to normalise or percent-encode: no "." or ".."
+# segments and only characters URLs keep as they are
+_PLAIN_SRC_RE = re.compile(r"(?:[\w-][\w.-]*/)*[\w-][\w.-]*", re.ASCII)
+# src of <img> tags in raw HTML
+_RAW_IMG_SRC_RE = re.compile(r"""(<img\b[^>]*?\bsrc\s*=\s*)(["'])(.*?)\2""", re.IGNORECASE)
 
-class CodeBlockProcessor(markdown.treeprocessors.Treeprocessor):
-    """Process code blocks and add syntax highlighting."""
 
-    def __init__(self, pattern):
-        super().__init__(md=None)
-        self.pattern = pattern
+@lru_cache(maxsize=256)
+def _directory_url(base_dir):
+    """Return the file:// URL of a directory, ending in a slash."""
+    from PyQt6.QtCore import QUrl
 
-    def run(self, doc):
-        # This is a simplified approach - we'll handle code blocks in post-processing
-        pass
+    url = QUrl.fromLocalFile(base_dir).toString()
+    return url if url.endswith("/") else url + "/"
+
+
+@lru_cache(maxsize=4096)
+def resolve_image_src(base_dir, src):
+    """Return src as an absolute file:// URL relative to base_dir (memoized).
+
+    Remote, absolute and data: sources are returned unchanged.
+    """
+    if src.startswith(_UNRESOLVED_SRC_PREFIXES):
+        return src
+    if _PLAIN_SRC_RE.fullmatch(src):
+        return _directory_url(base_dir) + src
+    from PyQt6.QtCore import QUrl
+
+    abs_path = os.path.normpath(os.path.join(base_dir, src))
+    return QUrl.fromLocalFile(abs_path).toString()
+
+
+class _CollectImageMixin:
+    """Record the <img> an image inline processor creates in ``md.images``."""
+
+    def handleMatch(self, m, data):
+        el, start, end = super().handleMatch(m, data)
+        if el is not None:
+            self.md.images.append(el)
+        return el, start, end
+
+
+class ImageLinkProcessor(_CollectImageMixin, markdown.inlinepatterns.ImageInlineProcessor):
+    pass
+
+
+class ImageReferenceProcessor(
+    _CollectImageMixin, markdown.inlinepatterns.ImageReferenceInlineProcessor
+):
+    pass
+
+
+class ShortImageReferenceProcessor(
+    _CollectImageMixin, markdown.inlinepatterns.ShortImageReferenceInlineProcessor
+):
+    pass
+
+
+class ImagePathExtension(markdown.extensions.Extension):
+    """Extension that points relative image sources at the document's directory."""
+
+    def extendMarkdown(self, md):
+        # <img> elements created since the last ImagePathProcessor run
+        md.images = []
+        md.image_base_dir = None
+        patterns = markdown.inlinepatterns
+        md.inlinePatterns.register(
+            ImageLinkProcessor(patterns.IMAGE_LINK_RE, md), "image_link", 150
+        )
+        md.inlinePatterns.register(
+            ImageReferenceProcessor(patterns.IMAGE_REFERENCE_RE, md), "image_reference", 140
+        )
+        md.inlinePatterns.register(
+            ShortImageReferenceProcessor(patterns.IMAGE_REFERENCE_RE, md), "short_image_ref", 125
+        )
+        # Runs after the inline patterns (priority 20) have created the <img>s
+        md.treeprocessors.register(ImagePathProcessor(md), "image_paths", 3)
+
+
+class ImagePathProcessor(markdown.treeprocessors.Treeprocessor):
+    """Rewrite relative ``<img>`` sources to absolute file:// URLs.
+
+    Markdown images are collected by the inline processors that create them,
+    so the tree is not searched for them, and ``<img>`` tags in raw HTML are
+    rewritten in the stash; text that merely looks like a ``src="..."`` (in
+    code samples, say) is never touched. Sources are resolved against
+    ``md.image_base_dir``, or left as written when it is None.
+    """
+
+    def run(self, root):
+        images, self.md.images = self.md.images, []
+        base_dir = self.md.image_base_dir
+        if base_dir is None:
+            return
+        with profile_stage("resolve_image_paths"):
+            for img in images:
+                src = img.get("src")
+                if src:
+                    img.set("src", resolve_image_src(base_dir, src))
+
+            def replace_src(match):
+                src = resolve_image_src(base_dir, match.group(3))
+                return f"{match.group(1)}{match.group(2)}{src}{match.group(2)}"
+
+            blocks = self.md.htmlStash.rawHtmlBlocks
+            for index, block in enumerate(blocks):
+                # Highlighted code is stashed too, but escaped: it has no real <img
+                if isinstance(block, str) and ("<img" in block or "<IMG" in block):
+                    blocks[index] = _RAW_IMG_SRC_RE.sub(replace_src, block)
+
+
+class ConverterPool:
+    """Pool of reusable markdown.Markdown converters.
+
+    Building a Markdown instance registers every extension from scratch, which
+    is a fixed cost paid on every render. The pool hands out finished
+    converters and calls reset() when they come back, so that cost is only
+    paid once per converter. More than one converter can exist so renders on
+    different threads never share parser state.
+    """
+
+    def __init__(self, factory, max_idle=4):
+        self._factory = factory
+        self._max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def add(self, md):
+        """Hand an already-built converter to the pool."""
+        with self._lock:
+            if len(self._idle) < self._max_idle:
+                self._idle.append(md)
+
+    @contextmanager
+    def converter(self):
+        """Borrow a converter for the duration of a with-block."""
+        with self._lock:
+            md = self._idle.pop() if self._idle else None
+        if md is None:
+            md = self._factory()
+        try:
+            yield md
+        finally:
+            # Drop per-document state (stash, toc ids, references) before
+            # the converter is reused for the next document
+            md.reset()
+            self.add(md)
+
+
+@dataclass
+class RenderResult:
+    """Output of one render, split so the theme can change without re-parsing.
+
+    ``body_html`` depends only on the markdown source and the paragraph-mark
+    state; ``css`` depends only on the theme and custom colors. ``blocks`` is
+    filled in by block-level rendering with (anchor name, block HTML) pairs.
+    """
+
+    body_html: str
+    css: str
+    copy_buffer: Dict[str, str] = field(default_factory=dict)
+    blocks: Optional[List[Tuple[str, str]]] = None
+
+    def to_html(self):
+        """Return a self-contained HTML fragment with the CSS inlined."""
+        return f"""
+        <style>
+            {self.css}
+        </style>
+        {self.body_html}
+        """
 
 
 class MarkdownRenderer:
     """Handles markdown to HTML conversion with GitHub-style formatting."""
 
     def __init__(self, theme="dark"):
+        # Highlighted code blocks, shared by all converters and kept across renders
+        self.highlight_cache = RenderCache(max_bytes=16 * 1024 * 1024)
+
         # Set up markdown extensions
         self.extensions = [
             "markdown.extensions.tables",
-            "markdown.extensions.fenced_code",
-            "markdown.extensions.codehilite",
+            CodeBlockExtension(
+                highlight_cache=self.highlight_cache, css_class="highlight"
+            ),
             "markdown.extensions.toc",
             "markdown.extensions.nl2br",
             "markdown.extensions.attr_list",
+            ParagraphMarkExtension(),
+            ImagePathExtension(),
         ]
 
         # Current theme
@@ -54,17 +480,19 @@ class MarkdownRenderer:
 
         # Configure code highlighting
         self.extension_configs = {
-            "markdown.extensions.codehilite": {
-                "css_class": "highlight",
-                "use_pygments": True,
-            },
             "markdown.extensions.toc": {
                 "permalink": True,
                 "permalink_class": "headerlink",
             },
         }
 
-        self.md = markdown.Markdown(
+        self.md = self._create_converter()
+        self._converters = ConverterPool(self._create_converter)
+        self._converters.add(self.md)
+
+    def _create_converter(self):
+        """Build a markdown.Markdown instance with the renderer's extensions."""
+        return markdown.Markdown(
             extensions=self.extensions, extension_configs=self.extension_configs
         )
 
@@ -162,412 +590,49 @@ class MarkdownRenderer:
                 }}
             """
 
+    def get_document_css(self):
+        """Return the CSS for the renderer's current theme and custom colors."""
+        with profile_stage("theme_css"):
+            return self.get_theme_css(self.current_theme, self.hide_paragraph_marks)
+
     def render(self, text):
         """Convert markdown text to HTML with theme-aware formatting."""
-        md = markdown.Markdown(
-            extensions=self.extensions, extension_configs=self.extension_configs
-        )
+        result = self.render_document(text)
+        self._copy_buffer = result.copy_buffer
+        return result.to_html()
 
-        html = md.convert(text)
+    def render_document(self, text, hide_paragraph_marks=None, file_path=None):
+        """Convert markdown text to a RenderResult with body and CSS kept apart.
 
-        # Handle paragraph marks visibility
-        if self.hide_paragraph_marks:
-            # Remove headerlink (pilcrow) elements from HTML since CSS hiding
-            # doesn't work reliably in QTextBrowser
-            html = re.sub(r'<a[^>]*class="headerlink"[^>]*>.*?</a>', "", html)
-        else:
-            # Add paragraph marks (periods) when visible
-            html = self._add_paragraph_marks(html)
-
-        # Add copy buttons to code blocks
-        html = self._add_copy_buttons(html)
-
-        # Wrap in theme-specific CSS
-        theme_css = self.get_theme_css(self.current_theme, self.hide_paragraph_marks)
-        hide_marks_class = "paragraph-marks-hidden" if self.hide_paragraph_marks else ""
-        return f"""
-        <style>
-            {theme_css}
-        </style>
-        <div class="markdown-body {hide_marks_class}">
-            {html}
-        </div>
+        Does not modify renderer state, so it may run on a worker thread while
+        the GUI thread keeps using the renderer. ``hide_paragraph_marks``
+        defaults to the renderer's current setting; relative image paths are
+        resolved against the directory of ``file_path`` when one is given.
         """
-
-    def _add_paragraph_marks(self, html):
-        """Add paragraph marks (periods) to appropriate lines in HTML."""
-        import re
-
-        # Split HTML into lines
-        lines = html.split("\n")
-        processed_lines = []
-
-        # Track if we're inside code blocks
-        in_code_block = False
-        in_inline_code = False
-
-        for line in lines:
-            # Check for code block boundaries
-            if line.strip().startswith("<pre>") or "<pre" in line:
-                in_code_block = True
-            elif line.strip().startswith("</pre>") or "</pre>" in line:
-                in_code_block = False
-
-            # Skip processing if inside code blocks
-            if in_code_block:
-                processed_lines.append(line)
-                continue
-
-            # Check for inline code
-            if "<code>" in line and "</code>" in line:
-                # Count code tags to handle multiple inline codes
-                code_count = line.count("<code>")
-                if code_count % 2 == 1:
-                    in_inline_code = not in_inline_code
-
-            # Add paragraph marks to appropriate lines
-            if (
-                not in_inline_code
-                and not in_code_block
-                and self._should_have_paragraph_mark(line)
-            ):
-                line = self._add_period_to_line(line)
-
-            processed_lines.append(line)
-
-        return "\n".join(processed_lines)
-
-    def _should_have_paragraph_mark(self, line):
-        """Determine if a line should have a paragraph mark."""
-        # Skip empty lines
-        if not line.strip():
-            return False
-
-        # Skip lines that are just HTML tags without content
-        stripped = line.strip()
-        if (
-            stripped.startswith("<")
-            and stripped.endswith(">")
-            and not any(
-                tag in stripped for tag in ["<h", "<p>", "<div", "<ul", "<ol", "<li"]
-            )
-        ):
-            return False
-
-        # Headers (titles and sections)
-        if re.search(r"<h[1-6][^>]*>", line):
-            return True
-
-        # Paragraph tags
-        if re.search(r"<p[^>]*>", line):
-            return True
-
-        # List items
-        if re.search(r"<li[^>]*>", line):
-            return True
-
-        # Blockquotes
-        if re.search(r"<blockquote[^>]*>", line):
-            return True
-
-        return False
-
-    def _add_period_to_line(self, line):
-        """Add a period to the end of content in HTML line."""
-        # Find the closing of the last tag before the content ends
-        # We want to add the period after the text content but before the closing tag
-        # IMPORTANT: The period must be INSIDE the span so CSS can hide it
-
-        # For headers: add period after header text
-        header_match = re.search(r"(<h[1-6][^>]*>)(.*?)(</h[1-6]>)", line)
-        if header_match:
-            return f"{header_match.group(1)}{header_match.group(2)}<span class='paragraph-mark'>.</span>{header_match.group(3)}"
-
-        # For paragraphs: add period before closing p tag
-        paragraph_match = re.search(r"(<p[^>]*>)(.*?)(</p>)", line)
-        if paragraph_match:
-            return f"{paragraph_match.group(1)}{paragraph_match.group(2)}<span class='paragraph-mark'>.</span>{paragraph_match.group(3)}"
-
-        # For list items: add period before closing li tag
-        list_match = re.search(r"(<li[^>]*>)(.*?)(</li>)", line)
-        if list_match:
-            return f"{list_match.group(1)}{list_match.group(2)}<span class='paragraph-mark'>.</span>{list_match.group(3)}"
-
-        # For blockquotes: add period before closing blockquote tag
-        blockquote_match = re.search(r"(<blockquote[^>]*>)(.*?)(</blockquote>)", line)
-        if blockquote_match:
-            return f"{blockquote_match.group(1)}{blockquote_match.group(2)}<span class='paragraph-mark'>.</span>{blockquote_match.group(3)}"
-
-        # For other content, try to add period before the last closing tag
-        # This is a fallback for edge cases
-        if not line.strip().endswith("</"):
-            return line
-
-        # Find the last closing tag position
-        last_tag_pos = line.rfind("</")
-        if last_tag_pos > 0:
-            # Insert period before the last closing tag
-            before_tag = line[:last_tag_pos]
-            after_tag = line[last_tag_pos:]
-            return f"{before_tag}<span class='paragraph-mark'>.</span>{after_tag}"
-
-        return line
-
-    def _add_copy_buttons(self, html):
-        """Wrap each syntax-highlighted code block with a Copy link."""
-        import html as html_module
-
-        self._copy_buffer = {}
-        counter = [0]
-
-        def extract_plain_text(snippet):
-            text = re.sub(r'<[^>]+>', '', snippet)
-            return html_module.unescape(text)
-
-        def replace_highlight_block(match):
-            block = match.group(0)
-            plain = extract_plain_text(block).strip()
-            if not plain:
-                return block
-            copy_id = counter[0]
-            counter[0] += 1
-            self._copy_buffer[copy_id] = plain
-            return (
-                f'<div>'
-                f'<div style="text-align:right; padding-bottom:2px;">'
-                f'<a href="copy:{copy_id}" class="copy-btn">Copy</a>'
-                f'</div>'
-                f'{block}'
-                f'</div>'
-            )
-
-        return re.sub(
-            r'<div class="highlight">.*?</div>',
-            replace_highlight_block,
-            html,
-            flags=re.DOTALL,
+        if hide_paragraph_marks is None:
+            hide_paragraph_marks = self.hide_paragraph_marks
+
+        html, copy_buffer = self.convert_body(text, hide_paragraph_marks, file_path)
+        return RenderResult(
+            body_html=self.wrap_body(html, hide_paragraph_marks),
+            css=self.get_theme_css(self.current_theme, hide_paragraph_marks),
+            copy_buffer=copy_buffer,
         )
 
-    def _get_github_css(self):
-        """Get GitHub-style CSS for markdown rendering."""
-        colors = self.get_effective_colors(self.current_theme)
-
-        return f"""
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Helvetica, Arial, sans-serif;
-            font-size: 16px;
-            line-height: 1.5;
-            word-wrap: break-word;
-            color: {colors["body_text_color"]};
-            background-color: {colors["background_color"]};
-            margin: 0;
-            padding: 20px;
-        }}
-
-        .markdown-body {{
-            max-width: 980px;
-            margin: 0 auto;
-        }}
-
-        .markdown-body h1, .markdown-body h2, .markdown-body h3,
-        .markdown-body h4, .markdown-body h5, .markdown-body h6 {{
-            margin-top: 24px;
-            margin-bottom: 16px;
-            font-weight: 600;
-            line-height: 1.25;
-            position: relative;
-        }}
-
-        .markdown-body h1 {{
-            font-size: 2em;
-            border-bottom: 1px solid {colors["border_color"]};
-            padding-bottom: 0.3em;
-        }}
-
-        .markdown-body h2 {{
-            font-size: 1.5em;
-            border-bottom: 1px solid {colors["border_color"]};
-            padding-bottom: 0.3em;
-        }}
-
-        .markdown-body h3 {{
-            font-size: 1.25em;
-        }}
-
-        .markdown-body h4 {{
-            font-size: 1em;
-        }}
-
-        .markdown-body h5 {{
-            font-size: 0.875em;
-        }}
-
-        .markdown-body h6 {{
-            font-size: 0.85em;
-            color: {colors["blockquote_color"]};
-        }}
-
-        .markdown-body p {{
-            margin-bottom: 16px;
-        }}
-
-        .markdown-body a {{
-            color: {colors["link_color"]};
-            text-decoration: none;
-        }}
-
-        .markdown-body a:hover {{
-            text-decoration: underline;
-        }}
-
-        .markdown-body ul, .markdown-body ol {{
-            padding-left: 2em;
-            margin-bottom: 16px;
-        }}
-
-        .markdown-body li {{
-            margin-bottom: 0.25em;
-        }}
-
-        .markdown-body blockquote {{
-            padding: 0 1em;
-            color: {colors["blockquote_color"]};
-            border-left: 0.25em solid {colors["border_color"]};
-            margin-bottom: 16px;
-        }}
-
-        .markdown-body code {{
-            padding: 0.2em 0.4em;
-            margin: 0;
-            font-size: 85%;
-            background-color: rgba(110, 118, 129, 0.4);
-            border-radius: 3px;
-            font-family: "SFMono-Regular", Consolas, "Liberation Mono", Menlo, monospace;
-        }}
-
-        .markdown-body pre {{
-            padding: 16px;
-            overflow: auto;
-            font-size: 85%;
-            line-height: 1.45;
-            background-color: {colors["code_bg_color"]};
-            border-radius: 6px;
-            margin-bottom: 16px;
-        }}
-
-        .markdown-body pre code {{
-            display: inline;
-            max-width: auto;
-            padding: 0;
-            margin: 0;
-            overflow: visible;
-            line-height: inherit;
-            word-wrap: normal;
-            background-color: transparent;
-            border: 0;
-        }}
-
-        .markdown-body table {{
-            border-spacing: 0;
-            border-collapse: collapse;
-            margin-bottom: 16px;
-        }}
-
-        .markdown-body table th, .markdown-body table td {{
-            padding: 6px 13px;
-            border: 1px solid {colors["border_color"]};
-        }}
-
-        .markdown-body table th {{
-            font-weight: 600;
-            background-color: {colors["code_bg_color"]};
-        }}
-
-        .markdown-body table tr:nth-child(2n) {{
-            background-color: {colors["background_color"]};
-        }}
-
-        .markdown-body hr {{
-            height: 0.25em;
-            padding: 0;
-            margin: 24px 0;
-            background-color: {colors["border_color"]};
-            border: 0;
-        }}
-
-        .highlight {{
-            background-color: {colors["code_bg_color"]};
-            border-radius: 6px;
-            padding: 16px;
-            margin-bottom: 16px;
-            overflow-x: auto;
-        }}
-
-        .highlight pre {{
-            background-color: transparent;
-            padding: 0;
-            margin: 0;
-            overflow: visible;
-        }}
-
-        /* Syntax highlighting */
-        .hll {background - color: #404040 }
-        .c {color: #6a9955; font-style: italic }
-        .err {color: #f44747 }
-        .k {color: #569cd6 }
-        .o {color: #d4d4d4 }
-        .cm {color: #6a9955; font-style: italic }
-        .cp {color: #9cdcfe }
-        .c1 {color: #6a9955; font-style: italic }
-        .cs {color: #6a9955; font-style: italic }
-        .gd {color: #f44747 }
-        .ge {color: #d4d4d4; font-style: italic }
-        .gr {color: #f44747 }
-        .gh {color: #569cd6 }
-        .gi {color: #4ec9b0 }
-        .go {color: #d4d4d4 }
-        .gp {color: #6a9955 }
-        .gs {font - weight: bold }
-        .gu {color: #ce9178 }
-        .gt {color: #f44747 }
-        .kc {color: #569cd6 }
-        .kd {color: #569cd6 }
-        .kn {color: #569cd6 }
-        .kp {color: #569cd6 }
-        .kr {color: #569cd6 }
-        .kt {color: #4ec9b0 }
-        .m {color: #b5cea8 }
-        .s {color: #ce9178 }
-        .na {color: #9cdcfe }
-        .nb {color: #dcdcaa }
-        .nc {color: #4ec9b0 }
-        .no {color: #4fc1ff }
-        .ni {color: #dcdcaa }
-        .ne {color: #f44747 }
-        .nf {color: #dcdcaa }
-        .nn {color: #4ec9b0 }
-        .nt {color: #569cd6 }
-        .nv {color: #9cdcfe }
-        .ow {color: #569cd6 }
-        .w {color: #d4d4d4 }
-        .mf {color: #b5cea8 }
-        .mh {color: #b5cea8 }
-        .mi {color: #b5cea8 }
-        .mo {color: #b5cea8 }
-        .sb {color: #ce9178 }
-        .sc {color: #ce9178 }
-        .sd {color: #6a9955; font-style: italic }
-        .s2 {color: #ce9178 }
-        .se {color: #d7ba7d }
-        .sh {color: #ce9178 }
-        .si {color: #9cdcfe }
-        .sx {color: #4ec9b0 }
-        .sr {color: #d16969 }
-        .s1 {color: #ce9178 }
-        .ss {color: #9cdcfe }
-        .bp {color: #569cd6 }
-        .vc {color: #9cdcfe }
-        .vg {color: #9cdcfe }
-        .vi {color: #9cdcfe }
-        .il {color: #b5cea8 }
-        """
+    def convert_body(self, text, hide_paragraph_marks, file_path=None):
+        """Convert markdown to inner body HTML; returns (html, copy_buffer)."""
+        with self._converters.converter() as md, profile_stage("convert"):
+            # Paragraph marks are added (or permalinks removed) and image
+            # paths resolved during conversion
+            md.treeprocessors["paragraph_marks"].hidden = bool(hide_paragraph_marks)
+            md.image_base_dir = (
+                os.path.dirname(os.path.abspath(file_path)) if file_path else None
+            )
+            html = md.convert(text)
+            copy_buffer = dict(md.copy_buffer)
+        return html, copy_buffer
+
+    def wrap_body(self, html, hide_paragraph_marks):
+        """Wrap inner body HTML in the markdown-body container the CSS targets."""
+        hide_marks_class = "paragraph-marks-hidden" if hide_paragraph_marks else ""
+        return f'<div class="markdown-body {hide_marks_class}">{html}</div>'
@@ -0,0 +1,231 @@
+"""
+Render profiling for MDviewer.
+
+When profiling is on (View → Profile Rendering, or ``MDVIEWER_PROFILE=1``),
+every render cycle -- reading a file, converting it, and laying it out in the
+QTextBrowser -- is recorded as a ProfileCycle: a list of named stages with
+their durations and the change in traced Python memory over each stage.
+
+Code on the hot path marks its stages with the module-level ``stage()``
+context manager. Stages are attributed to the cycle activated on the current
+thread with ``activate()``; with no active cycle ``stage()`` returns a shared
+null context, so the markers cost next to nothing when profiling is off.
+
+The profiler keeps a rolling history of finished cycles, which can be written
+out as plain JSON or as a Chrome trace (chrome://tracing, Perfetto).
+"""
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+PROFILE_ENV = "MDVIEWER_PROFILE"
+PROFILE_FILE_ENV = "MDVIEWER_PROFILE_FILE"
+# Number of finished cycles kept for export
+HISTORY_SIZE = 200
+
+_NULL_STAGE = nullcontext()
+_local = threading.local()
+
+
+def stage(name):
+    """Time a stage of the cycle active on this thread, if there is one."""
+    cycle = getattr(_local, "cycle", None)
+    if cycle is None:
+        return _NULL_STAGE
+    return cycle.stage(name)
+
+
+@contextmanager
+def activate(cycle):
+    """Attribute stages on this thread to cycle (a no-op for None)."""
+    previous = getattr(_local, "cycle", None)
+    _local.cycle = cycle
+    try:
+        yield cycle
+    finally:
+        _local.cycle = previous
+
+
+def _traced_bytes():
+    return tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+
+class ProfileCycle:
+    """Stages recorded for one render/setHtml cycle.
+
+    Each stage is a dict with its name, start offset and duration (in
+    microseconds from the start of the cycle), the thread it ran on, its
+    nesting depth, its self time (excluding nested stages) and the change in
+    traced memory across it. Allocation deltas are process-wide, so a stage
+    on the render worker can include allocations made by the GUI thread.
+    """
+
+    def __init__(self, label):
+        self.label = label
+        self.started_at = time.time()
+        self._origin = time.perf_counter_ns()
+        self.stages = []
+        self._open = threading.local()
+
+    @contextmanager
+    def stage(self, name):
+        stack = self._open.__dict__.setdefault("stack", [])
+        record = {
+            "name": name,
+            "thread": threading.current_thread().name,
+            "depth": len(stack),
+            "children_us": 0.0,
+        }
+        stack.append(record)
+        alloc_before = _traced_bytes()
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            stack.pop()
+            record["start_us"] = (start - self._origin) / 1000
+            record["duration_us"] = (end - start) / 1000
+            record["self_us"] = record["duration_us"] - record.pop("children_us")
+            record["alloc_bytes"] = _traced_bytes() - alloc_before
+            if stack:
+                stack[-1]["children_us"] += record["duration_us"]
+            self.stages.append(record)
+
+    @property
+    def duration_ms(self):
+        """Wall time from the start of the cycle to the end of its last stage."""
+        if not self.stages:
+            return 0.0
+        return max(s["start_us"] + s["duration_us"] for s in self.stages) / 1000
+
+    def breakdown(self):
+        """Return [(stage name, self ms, alloc bytes)] summed per name, in start order."""
+        totals = {}
+        for record in self.stages:
+            self_ms, alloc = totals.get(record["name"], (0.0, 0))
+            totals[record["name"]] = (
+                self_ms + record["self_us"] / 1000, alloc + record["alloc_bytes"]
+            )
+        order = sorted(self.stages, key=lambda s: s["start_us"])
+        names = list(dict.fromkeys(s["name"] for s in order))
+        return [(name, *totals[name]) for name in names]
+
+    def summary(self):
+        """One-line breakdown for the status bar."""
+        parts = [f"{name.replace('_', ' ')} {ms:.1f} ms" for name, ms, _ in self.breakdown()]
+        alloc = sum(s["alloc_bytes"] for s in self.stages if s["depth"] == 0)
+        return (f"Profile {self.label}: " + " | ".join(parts)
+                + f" | total {self.duration_ms:.1f} ms | alloc {alloc / (1024 * 1024):+.1f} MB")
+
+    def to_dict(self):
+        return {
+            "label": self.label,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms, 3),
+            "stages": sorted(self.stages, key=lambda s: s["start_us"]),
+        }
+
+
+class RenderProfiler(QObject):
+    """Creates profile cycles while enabled and keeps a history of finished ones.
+
+    Enabling starts tracemalloc (unless something else already did) so
+    allocation deltas can be recorded; it noticeably slows Python code, which
+    is why profiling is off by default.
+    """
+
+    cycle_finished = pyqtSignal(object)  # ProfileCycle
+
+    def __init__(self, history_size=HISTORY_SIZE, output_path=None, parent=None):
+        super().__init__(parent)
+        self.history = deque(maxlen=history_size)
+        # Rewritten with the history after every finished cycle, if set
+        self.output_path = output_path
+        self._enabled = False
+        self._started_tracing = False
+
+    @classmethod
+    def from_environment(cls, parent=None):
+        """Build a profiler configured from MDVIEWER_PROFILE / MDVIEWER_PROFILE_FILE."""
+        output_path = os.environ.get(PROFILE_FILE_ENV) or None
+        profiler = cls(output_path=output_path, parent=parent)
+        if os.environ.get(PROFILE_ENV, "").lower() not in ("", "0", "false", "no") or output_path:
+            profiler.set_enabled(True)
+        return profiler
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    def set_enabled(self, enabled):
+        if enabled == self._enabled:
+            return
+        self._enabled = enabled
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        elif not enabled and self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def new_cycle(self, label):
+        """Return a new ProfileCycle, or None when profiling is off."""
+        return ProfileCycle(label) if self._enabled else None
+
+    def finish(self, cycle):
+        """Add a completed cycle to the history (and the output file, if set)."""
+        if cycle is None or not cycle.stages:
+            return
+        self.history.append(cycle)
+        if self.output_path:
+            try:
+                self.export(self.output_path)
+            except OSError:
+                pass
+        self.cycle_finished.emit(cycle)
+
+    def export(self, path):
+        """Write the history to path: a Chrome trace for *.trace.json, else JSON."""
+        if path.endswith(".trace.json"):
+            data = self.chrome_trace()
+        else:
+            data = {"cycles": [cycle.to_dict() for cycle in self.history]}
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp_path, path)
+
+    def chrome_trace(self):
+        """Return the history in Chrome's Trace Event format."""
+        events = []
+        threads = {}
+        if not self.history:
+            return {"traceEvents": events, "displayTimeUnit": "ms"}
+        origin = self.history[0].started_at
+        for cycle in self.history:
+            cycle_start_us = (cycle.started_at - origin) * 1e6
+            for record in cycle.stages:
+                tid = threads.setdefault(record["thread"], len(threads) + 1)
+                events.append({
+                    "name": record["name"],
+                    "cat": cycle.label,
+                    "ph": "X",
+                    "ts": cycle_start_us + record["start_us"],
+                    "dur": record["duration_us"],
+                    "pid": 1,
+                    "tid": tid,
+                    "args": {"alloc_bytes": record["alloc_bytes"]},
+                })
+        for name, tid in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid,
+                           "args": {"name": name}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
@@ -0,0 +1,159 @@
+"""
+Remote image fetching for MDviewer's document view.
+
+QTextBrowser only loads local images, so ``http(s)://`` images (badges,
+diagrams) in a README show as broken. RemoteImageFetcher downloads them on
+a small thread pool of its own -- at most FETCH_CONNECTIONS requests at a
+time, so a page full of badges does not open dozens of connections, and a
+slow server never holds up local image decoding.
+
+Responses are kept on disk in a RemoteImageCache together with their ETag
+and Last-Modified headers. The first time an image is needed in a session
+the cached copy is revalidated with a conditional request (a 304 answer
+costs no download); afterwards the cached copy is used as is. A request
+that fails or times out falls back to the cached copy, so images stay
+visible offline.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+from PyQt6.QtCore import QThreadPool
+
+from version import get_semver
+
+from .render_cache import DiskRenderCache, default_cache_dir
+
+
+# Requests running at the same time
+FETCH_CONNECTIONS = 4
+# Seconds a request may wait for the server before it is given up
+FETCH_TIMEOUT = 10
+# Largest image downloaded
+MAX_IMAGE_BYTES = 32 * 1024 * 1024
+# Milliseconds shutdown() waits for requests still running
+SHUTDOWN_WAIT_MS = 2000
+
+
+def is_remote_image_url(url):
+    """Return True for the image URLs the fetcher downloads."""
+    return url.scheme() in ("http", "https")
+
+
+def default_remote_cache_dir():
+    """Return the directory for downloaded images ($XDG_CACHE_HOME)."""
+    return os.path.join(os.path.dirname(default_cache_dir()), "remote")
+
+
+class RemoteImageCache(DiskRenderCache):
+    """Downloaded images with their validators, with the same LRU size budget.
+
+    Each ``<sha1 of url>.img`` file holds a JSON line with the ETag and
+    Last-Modified headers, followed by the response body.
+    """
+
+    SUFFIX = ".img"
+
+    def __init__(self, directory=None, max_bytes=128 * 1024 * 1024):
+        super().__init__(directory or default_remote_cache_dir(), max_bytes)
+
+    def _path(self, key):
+        return super()._path(hashlib.sha1(key.encode("utf-8")).hexdigest())
+
+    def get(self, url):
+        """Return (validators, body) stored for url, or None."""
+        payload = self._read(url)
+        if payload is None:
+            return None
+        header, _, body = payload.partition(b"\n")
+        try:
+            validators = json.loads(header.decode("utf-8"))
+        except ValueError:
+            self._discard(self._path(url))
+            return None
+        return validators, body
+
+    def put(self, url, validators, body):
+        """Store a response body and its validators, evicting old entries."""
+        self._write(url, json.dumps(validators).encode("utf-8") + b"\n" + body)
+
+
+def fetch_image_data(url, cache=None, timeout=FETCH_TIMEOUT, revalidate=True):
+    """Download an image URL (any thread) and return its bytes, or None.
+
+    With a cache, a cached copy is returned without a request unless
+    revalidate is set, in which case it is revalidated with If-None-Match /
+    If-Modified-Since and also returned when the request fails.
+    """
+    # Imported here: urllib.request (with ssl) adds ~25 ms to startup
+    import urllib.error
+    import urllib.request
+
+    cached = cache.get(url) if cache is not None else None
+    if cached is not None and not revalidate:
+        return cached[1]
+
+    request = urllib.request.Request(url, headers={"User-Agent": f"MDviewer/{get_semver()}"})
+    if cached is not None:
+        validators = cached[0]
+        if validators.get("etag"):
+            request.add_header("If-None-Match", validators["etag"])
+        if validators.get("last_modified"):
+            request.add_header("If-Modified-Since", validators["last_modified"])
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = response.read(MAX_IMAGE_BYTES + 1)
+            if len(body) > MAX_IMAGE_BYTES:
+                return None
+            validators = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+    except urllib.error.HTTPError as error:
+        # Not modified: the cached copy is still good (the read refreshed its mtime)
+        if error.code == 304 and cached is not None:
+            return cached[1]
+        return cached[1] if cached is not None and error.code >= 500 else None
+    except (OSError, ValueError):
+        # Offline, timed out or a malformed URL
+        return cached[1] if cached is not None else None
+
+    if cache is not None:
+        cache.put(url, validators, body)
+    return body
+
+
+class RemoteImageFetcher:
+    """Downloads images on a bounded thread pool through a RemoteImageCache.
+
+    Each URL is revalidated with the server at most once per session.
+    """
+
+    def __init__(self, cache=None, timeout=FETCH_TIMEOUT, connections=FETCH_CONNECTIONS):
+        self.cache = cache if cache is not None else RemoteImageCache()
+        self.timeout = timeout
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(connections)
+        self._validated = set()
+        self._lock = threading.Lock()
+
+    def fetch(self, url):
+        """Return the bytes of an image URL, or None (blocking; run it on the pool)."""
+        with self._lock:
+            revalidate = url not in self._validated
+        data = fetch_image_data(url, self.cache, self.timeout, revalidate)
+        if data is not None:
+            with self._lock:
+                self._validated.add(url)
+        return data
+
+    def start(self, job):
+        """Run job on the pool once a connection is free."""
+        self.pool.start(job)
+
+    def shutdown(self):
+        """Drop queued requests and give running ones a moment to finish."""
+        self.pool.clear()
+        self.pool.waitForDone(SHUTDOWN_WAIT_MS)
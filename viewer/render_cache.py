@@ -0,0 +1,285 @@
+"""
+Render cache for MDviewer.
+
+Keeps recently rendered documents in memory so re-displaying a state the
+user has already seen (paragraph-mark toggle, refresh of an unchanged file)
+skips the markdown pipeline entirely. DiskRenderCache keeps rendered
+documents across sessions, so reopening the last file at startup does not
+have to convert it again.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+
+from version import get_semver
+
+
+class RenderCache:
+    """Bounded LRU cache with size-based eviction.
+
+    Every entry is stored with a caller-supplied size; once the total exceeds
+    ``max_bytes`` the least recently used entries are dropped. Access is
+    guarded by a lock so the cache can be shared with worker threads.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key (marking it recently used), or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, size):
+        """Store value under key, evicting old entries to stay within budget."""
+        if size > self.max_bytes:
+            # Larger than the whole budget; caching it would only flush
+            # everything else out
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+
+def content_hash(text):
+    """Return a stable hash of document text for use in cache keys."""
+    return hashlib.sha1(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def render_cache_key(text, hide_paragraph_marks, file_path):
+    """Build the cache key for the rendered body of a document.
+
+    Theme and custom colors are not part of the key: they only affect the
+    stylesheet, which is applied separately from the cached body. The file
+    path is included because relative image paths are resolved against the
+    document's directory.
+    """
+    return (content_hash(text), bool(hide_paragraph_marks), file_path)
+
+
+def default_cache_dir():
+    """Return the directory for MDviewer's on-disk render cache ($XDG_CACHE_HOME)."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "mdviewer", "render")
+
+
+@lru_cache(maxsize=None)
+def renderer_fingerprint():
+    """Identify the code that produces rendered HTML.
+
+    Covers the MDviewer version and the markdown and Pygments versions, so
+    upgrading any of them invalidates documents rendered by the old code.
+    """
+    from importlib.metadata import PackageNotFoundError, version as package_version
+
+    parts = [get_semver()]
+    for package in ("markdown", "pygments"):
+        try:
+            parts.append(f"{package}-{package_version(package)}")
+        except PackageNotFoundError:
+            parts.append(f"{package}-unknown")
+    return ":".join(parts)
+
+
+def disk_cache_key(file_path, stat_result, text_hash, hide_paragraph_marks, fingerprint):
+    """Build the on-disk cache key for a rendered document.
+
+    Path, mtime and size are part of the key alongside the content hash so an
+    entry is only reused for the very file it was rendered from; as with
+    render_cache_key, theme and colors are left out because they only change
+    the stylesheet, not the cached body.
+    """
+    parts = [
+        os.path.abspath(file_path),
+        stat_result.st_mtime_ns,
+        stat_result.st_size,
+        text_hash,
+        int(bool(hide_paragraph_marks)),
+        fingerprint,
+    ]
+    return hashlib.sha1(json.dumps(parts).encode("utf-8")).hexdigest()
+
+
+class DiskRenderCache:
+    """Rendered documents stored as compressed files, with an LRU size budget.
+
+    Each entry is one ``<key>.mdvc`` file holding the body HTML, the copy
+    buffer and the rendered blocks. A hit refreshes the file's mtime, and
+    when the files exceed ``max_bytes`` the ones with the oldest mtime are
+    deleted, so the budget holds across sessions and processes. Any error
+    reading or writing the cache is treated as a miss: the cache never stops
+    a document from being rendered.
+    """
+
+    SUFFIX = ".mdvc"
+
+    def __init__(self, directory=None, max_bytes=256 * 1024 * 1024):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        # Bytes on disk; measured on the first put
+        self._total_bytes = None
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def get(self, key):
+        """Return (body_html, copy_buffer, blocks) stored under key, or None."""
+        payload = self._read(key)
+        if payload is None:
+            return None
+        try:
+            data = json.loads(zlib.decompress(payload).decode("utf-8"))
+            blocks = data["blocks"]
+            if blocks is not None:
+                blocks = [tuple(block) for block in blocks]
+            return data["body_html"], data["copy_buffer"], blocks
+        except (ValueError, zlib.error, KeyError, TypeError):
+            # Corrupt, or written by other code: a miss, and not kept around
+            self._discard(self._path(key))
+            return None
+
+    def put(self, key, value):
+        """Store a (body_html, copy_buffer, blocks) value, evicting old entries."""
+        body_html, copy_buffer, blocks = value
+        self._write(key, zlib.compress(json.dumps({
+            "body_html": body_html,
+            "copy_buffer": copy_buffer,
+            "blocks": blocks,
+        }).encode("utf-8", "surrogatepass"), 1))
+
+    def _read(self, key):
+        """Return the bytes stored under key and mark them used, or None."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                payload = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except OSError:
+            self._discard(path)
+            return None
+        return payload
+
+    def _write(self, key, payload):
+        """Store payload under key atomically, evicting old entries."""
+        if len(payload) > self.max_bytes:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                # The entry being replaced no longer counts towards the total
+                try:
+                    replaced = os.stat(path).st_size
+                except FileNotFoundError:
+                    replaced = 0
+                os.replace(tmp_path, path)
+            except BaseException:
+                self._discard(tmp_path)
+                raise
+        except OSError:
+            return
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._measure()
+            else:
+                self._total_bytes += len(payload) - replaced
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def clear(self):
+        """Delete every cached document."""
+        with self._lock:
+            for path, _, _ in self._entries():
+                self._discard(path)
+            self._total_bytes = 0
+
+    @property
+    def total_bytes(self):
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._measure()
+            return self._total_bytes
+
+    def _entries(self):
+        """Return [(path, mtime, size)] of the cache files on disk."""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(self.SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, st.st_mtime, st.st_size))
+        return entries
+
+    def _measure(self):
+        return sum(size for _, _, size in self._entries())
+
+    def _evict(self):
+        """Delete least recently used files until the cache is within budget."""
+        # Rescan: other MDviewer processes share the directory
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            self._discard(path)
+            total -= size
+        self._total_bytes = total
+
+    @staticmethod
+    def _discard(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
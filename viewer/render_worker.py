@@ -0,0 +1,171 @@
+"""
+Background markdown rendering for MDviewer.
+
+Reading, converting and post-processing a document happens on a QThread so
+large files never block the GUI thread; only the final setHtml() runs on the
+main thread when the worker reports back.
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from .chunked_document import ChunkedDocument, should_chunk
+from .document_loader import load_document
+from .profiler import activate as activate_profile, stage as profile_stage
+from .render_cache import disk_cache_key, render_cache_key, renderer_fingerprint
+
+
+def _cached_size(cached):
+    """Approximate memory size of a (body_html, copy_buffer, blocks) cache value."""
+    body_html, copy_buffer, blocks = cached
+    size = len(body_html) + sum(len(t) for t in copy_buffer.values())
+    if blocks:
+        size += sum(len(html) for _, html in blocks)
+    return size
+
+
+@dataclass
+class RenderedDocument:
+    """A document rendered by RenderWorker, ready to be displayed."""
+
+    file_path: str
+    body_html: str
+    copy_buffer: Dict[str, str] = field(default_factory=dict)
+    blocks: Optional[List[Tuple[str, str]]] = None
+    # Set instead of body_html for documents too large to render as a whole
+    chunked: Optional[ChunkedDocument] = None
+    scroll_pos: Optional[int] = None
+    status_prefix: str = "Opened"
+    # Paragraph-mark setting the document was rendered with
+    hide_paragraph_marks: bool = False
+    # ProfileCycle the worker's stages were recorded in, when profiling
+    profile: Optional[object] = None
+
+
+class RenderWorker(QThread):
+    """Worker thread that reads and renders one markdown file.
+
+    Every worker carries the request id it was started for; the main window
+    ignores results whose id is no longer current, and calls
+    requestInterruption() on superseded workers so they stop between stages.
+    """
+
+    progress = pyqtSignal(int, str)  # request_id, stage description
+    render_finished = pyqtSignal(int, object)  # request_id, RenderedDocument
+    render_failed = pyqtSignal(int, str)  # request_id, error_message
+
+    def __init__(self, request_id, file_path, renderer, render_cache,
+                 hide_paragraph_marks, scroll_pos=None, status_prefix="Opened",
+                 block_renderer=None, profile=None, disk_cache=None, parent=None):
+        super().__init__(parent)
+        self.request_id = request_id
+        self.file_path = file_path
+        self.renderer = renderer
+        self.render_cache = render_cache
+        self.hide_paragraph_marks = hide_paragraph_marks
+        self.scroll_pos = scroll_pos
+        self.status_prefix = status_prefix
+        self.block_renderer = block_renderer
+        # ProfileCycle to record stages in, or None when profiling is off
+        self.profile = profile
+        # DiskRenderCache shared across sessions, or None
+        self.disk_cache = disk_cache
+
+    def run(self):
+        with activate_profile(self.profile):
+            self._render()
+
+    def _render(self):
+        try:
+            self.progress.emit(self.request_id, "Reading")
+            with profile_stage("read"):
+                stat_result = os.stat(self.file_path)
+                content = load_document(self.file_path).text
+            if self.isInterruptionRequested():
+                return
+
+            if self.block_renderer is not None and should_chunk(content):
+                self._emit_chunked(content)
+                return
+
+            key = render_cache_key(content, self.hide_paragraph_marks, self.file_path)
+            cached = self.render_cache.get(key)
+            disk_key = None
+            if cached is None and self.disk_cache is not None:
+                disk_key = disk_cache_key(
+                    self.file_path, stat_result, key[0],
+                    self.hide_paragraph_marks, renderer_fingerprint(),
+                )
+                with profile_stage("disk_cache"):
+                    cached = self.disk_cache.get(disk_key)
+                if cached is not None:
+                    self.render_cache.put(key, cached, _cached_size(cached))
+            if cached is None:
+                self.progress.emit(self.request_id, "Rendering")
+                result = None
+                if self.block_renderer is not None:
+                    result = self.block_renderer.render_document(
+                        content, self.hide_paragraph_marks, self.file_path
+                    )
+                if result is None:
+                    result = self.renderer.render_document(
+                        content, hide_paragraph_marks=self.hide_paragraph_marks,
+                        file_path=self.file_path,
+                    )
+                if self.isInterruptionRequested():
+                    return
+                cached = (result.body_html, result.copy_buffer, result.blocks)
+                self.render_cache.put(key, cached, _cached_size(cached))
+                if disk_key is not None:
+                    with profile_stage("disk_cache"):
+                        self.disk_cache.put(disk_key, cached)
+
+            if self.isInterruptionRequested():
+                return
+            body_html, copy_buffer, blocks = cached
+            self.render_finished.emit(
+                self.request_id,
+                RenderedDocument(
+                    file_path=self.file_path,
+                    body_html=body_html,
+                    copy_buffer=dict(copy_buffer),
+                    blocks=blocks,
+                    scroll_pos=self.scroll_pos,
+                    status_prefix=self.status_prefix,
+                    hide_paragraph_marks=self.hide_paragraph_marks,
+                    profile=self.profile,
+                ),
+            )
+
+        except Exception as e:
+            self.render_failed.emit(self.request_id, str(e))
+
+    def _emit_chunked(self, content):
+        """Index a very large document for chunked viewing instead of rendering it."""
+        self.progress.emit(self.request_id, "Indexing")
+        with profile_stage("index"):
+            chunked = ChunkedDocument(
+                content, self.block_renderer, self.hide_paragraph_marks, self.file_path
+            )
+        if self.isInterruptionRequested():
+            return
+        # Warm the block cache for the sections shown first
+        for index in range(min(2, chunked.section_count)):
+            chunked.render_section(index)
+        if self.isInterruptionRequested():
+            return
+        self.render_finished.emit(
+            self.request_id,
+            RenderedDocument(
+                file_path=self.file_path,
+                body_html="",
+                chunked=chunked,
+                scroll_pos=self.scroll_pos,
+                status_prefix=self.status_prefix,
+                hide_paragraph_marks=self.hide_paragraph_marks,
+                profile=self.profile,
+            ),
+        )
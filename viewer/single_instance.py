@@ -0,0 +1,127 @@
+"""
+Single-instance support for MDviewer.
+
+The first viewer started by a user listens on a per-user QLocalServer. Later
+launches connect to it, hand over the file they were asked to open and exit
+without creating a QApplication or importing the GUI, markdown or Pygments
+modules; the running viewer opens the file in a new tab.
+
+The protocol is one JSON line per connection, ``{"files": [absolute paths]}``
+(an empty list just brings the running viewer to the front), answered by
+``ok``. A launch that gets no answer -- no viewer running, or a stale socket
+left behind by a crash -- starts a viewer of its own.
+"""
+
+import getpass
+import hashlib
+import json
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+
+
+# How long a launch waits for a running viewer before starting its own
+CONNECT_TIMEOUT_MS = 200
+REPLY_TIMEOUT_MS = 5000
+# Upper bound on a request line; anything longer is not from MDviewer
+MAX_REQUEST_BYTES = 1024 * 1024
+
+
+def server_name():
+    """Return the local server name, unique per user."""
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = "default"
+    return "mdviewer-" + hashlib.sha1(user.encode("utf-8")).hexdigest()[:12]
+
+
+def send_to_running_instance(files, name=None):
+    """Ask a running viewer to open files; return True if it accepted them."""
+    socket = QLocalSocket()
+    socket.connectToServer(name or server_name())
+    if not socket.waitForConnected(CONNECT_TIMEOUT_MS):
+        return False
+    request = json.dumps({"files": list(files)}).encode("utf-8") + b"\n"
+    socket.write(request)
+    if not socket.waitForBytesWritten(REPLY_TIMEOUT_MS):
+        return False
+    reply = b""
+    while not reply.endswith(b"\n"):
+        if not socket.waitForReadyRead(REPLY_TIMEOUT_MS):
+            return False
+        reply += bytes(socket.readAll())
+    socket.disconnectFromServer()
+    return reply.strip() == b"ok"
+
+
+class SingleInstanceServer(QObject):
+    """Accepts open requests from later launches of the viewer.
+
+    ``files_requested`` is emitted once per request with the list of paths
+    to open; an empty list asks the viewer to raise its window.
+    """
+
+    files_requested = pyqtSignal(list)  # absolute file paths
+
+    def __init__(self, name=None, parent=None):
+        super().__init__(parent)
+        self.name = name or server_name()
+        self._server = QLocalServer(self)
+        # Only processes of the same user may connect
+        self._server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self._server.newConnection.connect(self._on_new_connection)
+        self._buffers = {}
+
+    def listen(self):
+        """Start listening; returns False if another viewer already is."""
+        # With socket options set, QLocalServer replaces an existing socket
+        # instead of failing, so check for a live viewer (one that started
+        # at the same time as this one) first. A socket nobody answers on
+        # was left behind by a crash and can go.
+        probe = QLocalSocket()
+        probe.connectToServer(self.name)
+        if probe.waitForConnected(CONNECT_TIMEOUT_MS):
+            probe.abort()
+            return False
+        QLocalServer.removeServer(self.name)
+        return self._server.listen(self.name)
+
+    def close(self):
+        self._server.close()
+
+    def _on_new_connection(self):
+        while self._server.hasPendingConnections():
+            socket = self._server.nextPendingConnection()
+            self._buffers[socket] = b""
+            socket.readyRead.connect(lambda s=socket: self._on_ready_read(s))
+            socket.disconnected.connect(lambda s=socket: self._on_disconnected(s))
+
+    def _on_ready_read(self, socket):
+        data = self._buffers.get(socket, b"") + bytes(socket.readAll())
+        if b"\n" not in data:
+            if len(data) > MAX_REQUEST_BYTES:
+                socket.abort()
+            else:
+                self._buffers[socket] = data
+            return
+        self._buffers[socket] = b""
+        line = data.split(b"\n", 1)[0]
+        try:
+            files = json.loads(line.decode("utf-8"))["files"]
+            if not all(isinstance(path, str) for path in files):
+                raise ValueError("file paths must be strings")
+        except (ValueError, KeyError, TypeError):
+            socket.write(b"error\n")
+            socket.flush()
+            socket.disconnectFromServer()
+            return
+        # Answer first so the launching process can exit right away
+        socket.write(b"ok\n")
+        socket.flush()
+        socket.disconnectFromServer()
+        self.files_requested.emit(files)
+
+    def _on_disconnected(self, socket):
+        self._buffers.pop(socket, None)
+        socket.deleteLater()
@@ -0,0 +1,139 @@
+"""
+In-document text search for MDviewer's Find dialog.
+
+The displayed document's plain text is snapshotted once per render into a
+TextIndex (with a case-folded copy for case-insensitive searches), and
+searches run against it on a SearchWorker thread, so typing in the Find
+dialog never scans the QTextDocument on the GUI thread. Matches are
+reported as document positions, which count UTF-16 code units: a character
+outside the BMP (such as most emoji) is one character of the Python string
+from QTextDocument.toPlainText() but two document positions.
+"""
+
+import re
+from bisect import bisect_left
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+# Matches are collected in batches of this size between interruption checks
+_BATCH = 4096
+
+_ASTRAL_RE = re.compile("[\U00010000-\U0010FFFF]")
+
+
+def utf16_length(text):
+    """Return the number of QTextDocument positions text takes up."""
+    return len(text) + len(_ASTRAL_RE.findall(text))
+
+
+def _fold(text):
+    """Lower-case text without changing its length, so offsets stay valid."""
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    # A few characters (e.g. U+0130) lower-case to more than one character
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+class TextIndex:
+    """Plain text of one rendered document, ready to be searched.
+
+    ``document`` and ``revision`` identify the QTextDocument state the
+    snapshot was taken from; ``is_current_for()`` tells whether it still
+    matches. The case-folded copy is made on first use, on the search thread.
+    """
+
+    def __init__(self, text, document=None, revision=None):
+        self.text = text
+        self.document = document
+        self.revision = revision
+        self._folded = None
+        self._astral_offsets = None
+
+    @classmethod
+    def from_document(cls, document):
+        """Snapshot a QTextDocument (must be called on the GUI thread)."""
+        return cls(document.toPlainText(), document, document.revision())
+
+    def is_current_for(self, document):
+        return self.document is document and self.revision == document.revision()
+
+    @property
+    def folded(self):
+        if self._folded is None:
+            self._folded = _fold(self.text)
+        return self._folded
+
+    def find_all(self, query, case_sensitive=False, whole_word=False, interrupted=None):
+        """Return the sorted document positions where the matches of query start.
+
+        ``interrupted`` is polled between batches of matches; when it returns
+        True the search stops and None is returned.
+        """
+        if not query:
+            return []
+        haystack = self.text if case_sensitive else self.folded
+        needle = query if case_sensitive else _fold(query)
+        if whole_word:
+            pattern = re.compile(r"(?<!\w)" + re.escape(needle) + r"(?!\w)")
+            found = (match.start() for match in pattern.finditer(haystack))
+        else:
+            found = self._iter_find(haystack, needle)
+        offsets = []
+        for offset in found:
+            offsets.append(offset)
+            if len(offsets) % _BATCH == 0 and interrupted is not None and interrupted():
+                return None
+        return self._document_positions(offsets)
+
+    def _document_positions(self, offsets):
+        """Convert sorted string offsets to document (UTF-16) positions."""
+        if self._astral_offsets is None:
+            self._astral_offsets = [m.start() for m in _ASTRAL_RE.finditer(self.text)]
+        astral = self._astral_offsets
+        if not astral:
+            return offsets
+        # Each character outside the BMP before an offset adds a position
+        return [offset + bisect_left(astral, offset) for offset in offsets]
+
+    @staticmethod
+    def _iter_find(haystack, needle):
+        # Non-overlapping, like QTextDocument.find() stepping past each match
+        position = haystack.find(needle)
+        while position != -1:
+            yield position
+            position = haystack.find(needle, position + len(needle))
+
+
+def matches_in_range(offsets, start, end):
+    """Return (first index, end index) of the offsets that fall in [start, end)."""
+    return bisect_left(offsets, start), bisect_left(offsets, end)
+
+
+class SearchWorker(QThread):
+    """Runs one TextIndex search off the GUI thread.
+
+    Like RenderWorker, each worker carries a request id; the dialog ignores
+    results for requests it has since superseded and interrupts their workers.
+    """
+
+    search_finished = pyqtSignal(int, object)  # request_id, list of offsets
+
+    def __init__(self, request_id, index, query, case_sensitive, whole_word, parent=None):
+        super().__init__(parent)
+        self.request_id = request_id
+        self.index = index
+        self.query = query
+        self.case_sensitive = case_sensitive
+        self.whole_word = whole_word
+
+    def run(self):
+        offsets = self.index.find_all(
+            self.query,
+            case_sensitive=self.case_sensitive,
+            whole_word=self.whole_word,
+            interrupted=self.isInterruptionRequested,
+        )
+        if offsets is not None and not self.isInterruptionRequested():
+            self.search_finished.emit(self.request_id, offsets)
@@ -0,0 +1,171 @@
+"""
+Zooming for MDviewer's document view.
+
+Zooming changes the document's default font, and every change lays out the
+whole QTextDocument again. Stepping the font once per key press meant that
+holding Ctrl+= (or spinning the wheel) on a long document queued a relayout
+for every auto-repeated key. ZoomController coalesces zoom requests: the
+first one is applied at once, and requests arriving within the next
+COALESCE_MS only move the target size, which is then applied in a single
+relayout.
+
+Zooming keeps the heading under the mouse (Ctrl+wheel) or at the top of the
+view (keyboard) at the same place on screen, and the zoom level is
+remembered per document.
+"""
+
+import json
+
+from PyQt6.QtCore import QEvent, QObject, QPoint, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QFont
+
+
+ZOOM_FONT_FAMILY = "Consolas"
+DEFAULT_POINT_SIZE = 11
+MIN_POINT_SIZE = 6
+MAX_POINT_SIZE = 24
+# Milliseconds after a relayout during which further requests are coalesced
+COALESCE_MS = 50
+# Documents whose zoom level is remembered
+REMEMBERED_DOCUMENTS = 200
+# angleDelta() of one wheel notch
+WHEEL_STEP = 120
+
+
+def zoom_font(point_size):
+    """Return the document font at point_size."""
+    return QFont(ZOOM_FONT_FAMILY, point_size)
+
+
+class ZoomController(QObject):
+    """Zooms the document shown in a QTextBrowser, one relayout per burst.
+
+    Also handles Ctrl+wheel over the browser, which QTextBrowser would
+    otherwise turn into a relayout per wheel event. With settings, the level
+    of each document is kept under ``zoom_levels``.
+    """
+
+    zoom_changed = pyqtSignal(int)  # point size just applied
+
+    def __init__(self, browser, settings=None, interval_ms=COALESCE_MS, parent=None):
+        super().__init__(parent)
+        self.browser = browser
+        self.settings = settings
+        self._levels = self._load_levels()
+        self._path = None
+        self._target = DEFAULT_POINT_SIZE
+        # Viewport point whose heading stays in place, None for the top
+        self._anchor_pos = None
+        self._wheel_delta = 0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._on_interval_done)
+        browser.viewport().installEventFilter(self)
+
+    @property
+    def point_size(self):
+        """Point size the current document is zoomed to (or about to be)."""
+        return self._target
+
+    def level_for(self, path):
+        """Return the point size remembered for path."""
+        return self._levels.get(path, DEFAULT_POINT_SIZE)
+
+    def prepare_document(self, document, path):
+        """Give document the zoom level of path, before the browser shows it.
+
+        Setting the font of a document that is not laid out yet is free,
+        and an unchanged font is not set again.
+        """
+        self._timer.stop()
+        self._path = path
+        self._target = self.level_for(path)
+        font = zoom_font(self._target)
+        if document.defaultFont() != font:
+            document.setDefaultFont(font)
+
+    def zoom_by(self, steps, anchor_pos=None):
+        """Zoom by steps points, keeping the heading at anchor_pos in place."""
+        self.zoom_to(self._target + steps, anchor_pos)
+
+    def zoom_to(self, point_size, anchor_pos=None):
+        """Zoom to point_size (clamped), applied now or at the end of the burst."""
+        point_size = max(MIN_POINT_SIZE, min(MAX_POINT_SIZE, point_size))
+        self._anchor_pos = anchor_pos
+        if point_size == self._target:
+            return
+        self._target = point_size
+        self._remember(point_size)
+        if not self._timer.isActive():
+            self._apply()
+
+    def eventFilter(self, watched, event):
+        if (event.type() == QEvent.Type.Wheel
+                and event.modifiers() & Qt.KeyboardModifier.ControlModifier):
+            # Touchpads send fractions of a notch; a step is taken per notch
+            self._wheel_delta += event.angleDelta().y()
+            steps = int(self._wheel_delta / WHEEL_STEP)
+            if steps:
+                self._wheel_delta -= steps * WHEEL_STEP
+                self.zoom_by(steps, event.position().toPoint())
+            return True
+        return super().eventFilter(watched, event)
+
+    def _on_interval_done(self):
+        document = self.browser.document()
+        if document.defaultFont().pointSize() != self._target:
+            self._apply()
+
+    def _apply(self):
+        """Lay the document out at the target size, keeping the anchor in place."""
+        document = self.browser.document()
+        layout = document.documentLayout()
+        scroll_bar = self.browser.verticalScrollBar()
+        block = self._anchor_block()
+        offset = layout.blockBoundingRect(block).top() - scroll_bar.value()
+
+        document.setDefaultFont(zoom_font(self._target))
+
+        # Only the document up to the anchor is laid out again before the
+        # next paint; the scroll bar range catches up as the rest follows
+        value = round(layout.blockBoundingRect(block).top() - offset)
+        scroll_bar.setMaximum(max(scroll_bar.maximum(), value))
+        scroll_bar.setValue(value)
+        self._timer.start()
+        self.zoom_changed.emit(self._target)
+
+    def _anchor_block(self):
+        """Return the heading at or above the anchor point if it is on screen,
+        otherwise the block under the point."""
+        pos = self._anchor_pos if self._anchor_pos is not None else QPoint(0, 0)
+        block = self.browser.cursorForPosition(pos).block()
+        layout = self.browser.document().documentLayout()
+        top = self.browser.verticalScrollBar().value()
+        heading = block
+        while heading.isValid() and layout.blockBoundingRect(heading).bottom() > top:
+            if heading.blockFormat().headingLevel():
+                return heading
+            heading = heading.previous()
+        return block
+
+    def _remember(self, point_size):
+        if self._path is None:
+            return
+        # Most recently zoomed last, so the oldest are dropped first
+        self._levels.pop(self._path, None)
+        if point_size != DEFAULT_POINT_SIZE:
+            self._levels[self._path] = point_size
+        while len(self._levels) > REMEMBERED_DOCUMENTS:
+            del self._levels[next(iter(self._levels))]
+        if self.settings is not None:
+            self.settings.setValue("zoom_levels", json.dumps(list(self._levels.items())))
+
+    def _load_levels(self):
+        if self.settings is None:
+            return {}
+        try:
+            return {path: int(size)
+                    for path, size in json.loads(self.settings.value("zoom_levels", "[]"))}
+        except (TypeError, ValueError):
+            return {}